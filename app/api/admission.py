@@ -0,0 +1,252 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Iterable, NamedTuple
+
+import orjson
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.monitoring.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class Priority(str, Enum):
+    read = "read"
+    write = "write"
+
+
+class Rejected(Exception):
+    """
+    Запрос не допущен: очередь заполнена или время ожидания истекло.
+    """
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Waiter(NamedTuple):
+    route: str
+    future: asyncio.Future
+
+
+class AdmissionController:
+    """
+    Допуск запросов к обработке по количеству свободных соединений с базой данных.
+    Запрос занимает слот на все время обработки. Изменяющие запросы могут занять все слоты, чтение - все,
+    кроме write_reserved, поэтому поток чтения не блокирует запись. Освободившийся слот отдается сначала
+    очереди записи, затем очереди чтения, в порядке поступления. Маршруты из route_limits дополнительно
+    ограничены по количеству одновременных запросов.
+    Очереди ограничены: запрос сверх очереди или не дождавшийся слота за queue_timeout отклоняется сразу,
+    а не ждет соединения из пула до pool_timeout.
+
+    Attributes:
+        capacity (int): Количество слотов.
+        write_reserved (int): Слоты, недоступные для чтения.
+        queue_sizes (Dict[Priority, int]): Размеры очередей.
+        queue_timeout (float): Максимальное время ожидания в очереди, в секундах.
+        route_limits (Dict[str, int]): Лимиты одновременных запросов по маршрутам вида "GET /borrows/export".
+        active (Dict[Priority, int]): Занятые слоты.
+        route_active (Dict[str, int]): Запросы в обработке по маршрутам с лимитами.
+        queues (Dict[Priority, Deque[Waiter]]): Очереди ожидания.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        write_reserved: int,
+        read_queue_size: int,
+        write_queue_size: int,
+        queue_timeout: float,
+        route_limits: Dict[str, int] | None = None,
+    ) -> None:
+        self.capacity = capacity
+        self.write_reserved = min(write_reserved, capacity - 1)
+        self.queue_sizes = {Priority.read: read_queue_size, Priority.write: write_queue_size}
+        self.queue_timeout = queue_timeout
+        self.route_limits = route_limits or {}
+        self.active = {Priority.read: 0, Priority.write: 0}
+        self.route_active: Dict[str, int] = {}
+        self.queues: Dict[Priority, Deque[Waiter]] = {Priority.write: deque(), Priority.read: deque()}
+
+    def _can_admit(self, priority: Priority, route: str) -> bool:
+        if self.active[Priority.read] + self.active[Priority.write] >= self.capacity:
+            return False
+        if priority == Priority.read and self.active[Priority.read] >= self.capacity - self.write_reserved:
+            return False
+        route_limit = self.route_limits.get(route)
+        return route_limit is None or self.route_active.get(route, 0) < route_limit
+
+    def _take(self, priority: Priority, route: str) -> None:
+        self.active[priority] += 1
+        if route in self.route_limits:
+            self.route_active[route] = self.route_active.get(route, 0) + 1
+
+    async def acquire(self, priority: Priority, route: str) -> None:
+        """
+        Занимает слот, при необходимости ожидая в очереди.
+
+        Args:
+            priority (Priority): Очередь запроса.
+            route (str): Маршрут вида "GET /books/{book_id}".
+
+        Raises:
+            Rejected: Если очередь заполнена или слот не освободился за queue_timeout.
+        """
+        queue = self.queues[priority]
+        if not queue and self._can_admit(priority, route):
+            self._take(priority, route)
+            return
+        if len(queue) >= self.queue_sizes[priority]:
+            ADMISSION_REJECTED.inc(priority=priority.value, reason="queue_full")
+            raise Rejected("queue_full")
+
+        waiter = Waiter(route, asyncio.get_running_loop().create_future())
+        queue.append(waiter)
+        ADMISSION_QUEUE_DEPTH.set(len(queue), priority=priority.value)
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter.future
+        except TimeoutError:
+            if not self._granted(waiter):
+                self._leave(priority, waiter)
+                ADMISSION_REJECTED.inc(priority=priority.value, reason="timeout")
+                raise Rejected("timeout")
+        except BaseException:
+            if self._granted(waiter):
+                self.release(priority, route)
+            else:
+                self._leave(priority, waiter)
+            raise
+        finally:
+            ADMISSION_WAIT.observe(time.perf_counter() - start, priority=priority.value)
+
+    @staticmethod
+    def _granted(waiter: Waiter) -> bool:
+        return waiter.future.done() and not waiter.future.cancelled()
+
+    def _leave(self, priority: Priority, waiter: Waiter) -> None:
+        queue = self.queues[priority]
+        if waiter in queue:
+            queue.remove(waiter)
+        ADMISSION_QUEUE_DEPTH.set(len(queue), priority=priority.value)
+
+    def release(self, priority: Priority, route: str) -> None:
+        """
+        Освобождает слот и передает свободные слоты ожидающим запросам, сначала очереди записи.
+
+        Args:
+            priority (Priority): Очередь запроса.
+            route (str): Маршрут запроса.
+        """
+        self.active[priority] -= 1
+        if route in self.route_active:
+            self.route_active[route] -= 1
+        for queued_priority, queue in self.queues.items():
+            for waiter in list(queue):
+                if waiter.future.done():
+                    queue.remove(waiter)
+                elif self._can_admit(queued_priority, waiter.route):
+                    queue.remove(waiter)
+                    self._take(queued_priority, waiter.route)
+                    waiter.future.set_result(None)
+            ADMISSION_QUEUE_DEPTH.set(len(queue), priority=queued_priority.value)
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "active": {priority.value: count for priority, count in self.active.items()},
+            "queued": {priority.value: len(queue) for priority, queue in self.queues.items()},
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware допуска запросов: до обработки маршрута занимает слот AdmissionController,
+    при отказе отвечает 503 Service Unavailable с заголовком Retry-After.
+    Запросы без маршрута и маршруты с префиксами из exempt_prefixes (метрики, диагностика,
+    документация) не ограничиваются.
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, retry_after: int, exempt_prefixes: Iterable[str] = ()
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+        self.exempt_prefixes = tuple(exempt_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._match_route(scope)
+        path = getattr(route, "path", None)
+        if path is None or path.startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route_key = f"{method} {path}"
+        priority = Priority.read if method in READ_METHODS else Priority.write
+        try:
+            await self.controller.acquire(priority, route_key)
+        except Rejected:
+            scope["route"] = route
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority, route_key)
+
+    @staticmethod
+    def _match_route(scope: Scope):
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
+
+    async def _reject(self, send: Send) -> None:
+        body = orjson.dumps({"detail": "The server is overloaded, please retry later"})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_admission_controller() -> AdmissionController:
+    """
+    Создание контроллера допуска по настройкам. По умолчанию количество слотов равно
+    размеру пула соединений с переполнением.
+
+    Returns:
+        AdmissionController: Контроллер допуска.
+    """
+    capacity = settings.admission.max_concurrency or settings.db.pool_size + settings.db.max_overflow
+    return AdmissionController(
+        capacity=capacity,
+        write_reserved=settings.admission.write_reserved,
+        read_queue_size=settings.admission.read_queue_size,
+        write_queue_size=settings.admission.write_queue_size,
+        queue_timeout=settings.admission.queue_timeout,
+        route_limits=settings.admission.route_limits,
+    )
+
+
+admission_controller = create_admission_controller()
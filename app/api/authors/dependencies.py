@@ -20,6 +20,20 @@ async def get_author_service(session: AsyncSession = Depends(db.session_getter))
     return AuthorService(async_session=session)
 
 
+async def get_author_read_service(session: AsyncSession = Depends(db.read_session_getter)) -> AuthorService:
+    """
+    Depends зависимость для создания экземпляра сервиса работы с авторами только для чтения.
+    Сессия открывается на реплике, если она доступна.
+
+    Args:
+        session (AsyncSession): Сессия базы данных только для чтения.
+
+    Returns:
+        AuthorService: Экземпляр сервиса для работы с авторами.
+    """
+    return AuthorService(async_session=session)
+
+
 async def get_author_service_with_obj_by_id(
     author_id: Annotated[int, Path], author_service: AuthorService = Depends(get_author_service)
 ) -> AuthorService:
@@ -36,3 +50,22 @@ async def get_author_service_with_obj_by_id(
     """
     await author_service.store_obj_db_by_id_or_404(author_id)
     return author_service
+
+
+async def get_author_service_with_cached_obj_by_id(
+    author_id: Annotated[int, Path], author_service: AuthorService = Depends(get_author_read_service)
+) -> AuthorService:
+    """
+    Depends зависимость для получания экземпляра сервиса работы с авторами,
+    Экземпляр сервиса сохраняет в атрибуте класса объект базы данных полученный по входящему ID из кэша,
+    если объект есть в кэше. Только для чтения объекта.
+
+    Args:
+        author_id (int): ID автора.
+        author_service (AuthorService): Экземпляр сервиса для работы с авторами.
+
+    Returns:
+        AuthorService: Экземпляр сервиса для работы с авторами с объектом автора.
+    """
+    await author_service.store_obj_db_by_id_or_404(author_id, use_cache=True)
+    return author_service
@@ -1,9 +1,20 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, Response, status
 
-from app.api.authors.dependencies import get_author_service, get_author_service_with_obj_by_id
+from app.api.authors.dependencies import (
+    get_author_read_service,
+    get_author_service,
+    get_author_service_with_cached_obj_by_id,
+    get_author_service_with_obj_by_id,
+)
+from app.api.conditional import etag_matches, not_modified_response
+from app.api.dependencies import get_ids_param, get_page_params, get_search_params
+from app.config import settings
 from app.schemas.author_schema import AuthorCreate, AuthorFull, AuthorUpdate
+from app.schemas.bulk_schema import BulkItemResult
+from app.schemas.page_schema import Page, PageParams
+from app.schemas.search_schema import SearchParams
 from app.services.author_service import AuthorService
 
 router = APIRouter(tags=["API для управления авторами."])
@@ -32,25 +43,95 @@ async def create_author_endpoint(
     return await author_service.create_author(author_in=author_in)
 
 
+@router.post(
+    "/bulk",
+    summary="Пакетное добавление авторов",
+    response_model=List[BulkItemResult],
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_create_authors_endpoint(
+    authors_in: Annotated[List[AuthorCreate], Body(max_length=settings.api.max_bulk_size)],
+    author_service: AuthorService = Depends(get_author_service),
+):
+    """
+    ### Пакетное добавление авторов
+    ----------------
+
+    * **POST /authors/bulk**
+    + **Description**: Добавляет список авторов пакетными INSERT в одной транзакции.
+      Для каждой строки возвращает статус `created` с ID или `duplicate`.
+    + **Request**: `List[AuthorCreate]`
+    + **Response**: `List[BulkItemResult]`
+    + **Status Code**: 200 OK
+    """
+    return await author_service.bulk_create_authors(authors_in=authors_in)
+
+
 @router.get(
     "/",
     summary="Получение всех авторов",
-    response_model=List[AuthorFull],
+    response_model=Page[AuthorFull],
     status_code=status.HTTP_200_OK,
 )
 async def get_authors_endpoint(
-    author_service: AuthorService = Depends(get_author_service),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    ids: List[int] | None = Depends(get_ids_param),
+    author_service: AuthorService = Depends(get_author_read_service),
 ):
     """
     ### Получение всех авторов
     ----------------------
 
     * **GET /authors/**
-    + **Description**: Возвращает список всех авторов из базы данных.
+    + **Description**: Возвращает страницу авторов из базы данных, упорядоченных по ID.
+      Поле `next` содержит значение `after` для запроса следующей страницы.
+      С параметром `ids` возвращает авторов с указанными ID в порядке их перечисления, без пагинации.
+    + **Parameters**: `after`, `limit`, `ids`
+    + **Headers**: `If-None-Match` - при совпадении с ETag страницы возвращается 304 Not Modified
+    + **Response**: `Page[AuthorFull]`
+    + **Status Code**: 200 OK
+    """
+    if ids is not None:
+        authors = await author_service.get_many(ids=ids)
+    else:
+        if "if-none-match" in request.headers:
+            etag = await author_service.get_page_etag(page=page)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+        authors = await author_service.get_all(page=page)
+
+    etag = author_service.page_etag(authors)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return authors
+
+
+@router.get(
+    "/search",
+    summary="Поиск авторов",
+    response_model=List[AuthorFull],
+    status_code=status.HTTP_200_OK,
+)
+async def search_authors_endpoint(
+    search: SearchParams = Depends(get_search_params),
+    author_service: AuthorService = Depends(get_author_read_service),
+):
+    """
+    ### Поиск авторов
+    ----------------------
+
+    * **GET /authors/search**
+    + **Description**: Полнотекстовый поиск авторов по имени и фамилии.
+      Результаты упорядочены по релевантности.
+    + **Parameters**: `q`, `limit`
     + **Response**: `List[AuthorFull]`
     + **Status Code**: 200 OK
     """
-    return await author_service.get_all()
+    return await author_service.search(query=search.q, limit=search.limit)
 
 
 @router.get(
@@ -60,7 +141,9 @@ async def get_authors_endpoint(
     status_code=status.HTTP_200_OK,
 )
 async def get_author_endpoint(
-    author_service: AuthorService = Depends(get_author_service_with_obj_by_id),
+    request: Request,
+    response: Response,
+    author_service: AuthorService = Depends(get_author_service_with_cached_obj_by_id),
 ):
     """
     ### Получение информации об авторе
@@ -69,9 +152,15 @@ async def get_author_endpoint(
     * **GET /authors/{author_id}**
     + **Description**: Возвращает информацию об авторе по входящему ID.
     + **Parameters**: `author_id`
+    + **Headers**: `If-None-Match` - при совпадении с ETag записи возвращается 304 Not Modified
     + **Response**: `AuthorFull`
     + **Status Code**: 200 OK
     """
+    etag = author_service.obj_etag(author_service.obj_db_by_id)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
     return author_service.obj_db_by_id
 
 
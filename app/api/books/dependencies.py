@@ -20,6 +20,20 @@ async def get_book_service(session: AsyncSession = Depends(db.session_getter)) -
     return BookService(async_session=session)
 
 
+async def get_book_read_service(session: AsyncSession = Depends(db.read_session_getter)) -> BookService:
+    """
+    Depends зависимость для создания экземпляра сервиса работы с книгами только для чтения.
+    Сессия открывается на реплике, если она доступна.
+
+    Args:
+        session (AsyncSession): Сессия базы данных только для чтения.
+
+    Returns:
+        BookService: Экземпляр сервиса для работы с книгами.
+    """
+    return BookService(async_session=session)
+
+
 async def get_book_service_with_obj_by_id(
     book_id: Annotated[int, Path], book_service: BookService = Depends(get_book_service)
 ) -> BookService:
@@ -36,3 +50,22 @@ async def get_book_service_with_obj_by_id(
     """
     await book_service.store_obj_db_by_id_or_404(book_id)
     return book_service
+
+
+async def get_book_service_with_cached_obj_by_id(
+    book_id: Annotated[int, Path], book_service: BookService = Depends(get_book_read_service)
+) -> BookService:
+    """
+    Depends зависимость для получания экземпляра сервиса работы с книги,
+    Экземпляр сервиса сохраняет в атрибуте класса объект базы данных полученный по входящему ID из кэша,
+    если объект есть в кэше. Только для чтения объекта.
+
+    Args:
+        book_id (int): ID книги.
+        book_service (BookService): Экземпляр сервиса для работы с книгами.
+
+    Returns:
+        BookService: Экземпляр сервиса для работы с книгами.
+    """
+    await book_service.store_obj_db_by_id_or_404(book_id, use_cache=True)
+    return book_service
@@ -1,13 +1,34 @@
-from typing import List
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response, status
 
-from app.api.books.dependencies import get_book_service, get_book_service_with_obj_by_id
-from app.schemas.book_schema import BookCreate, BookFull, BookUpdate
+from app.api.books.dependencies import (
+    get_book_read_service,
+    get_book_service,
+    get_book_service_with_cached_obj_by_id,
+    get_book_service_with_obj_by_id,
+)
+from app.api.conditional import etag_matches, not_modified_response
+from app.api.dependencies import (
+    expand_params,
+    get_idempotency_service,
+    get_ids_param,
+    get_page_params,
+    get_search_params,
+)
+from app.api.serialization import PageEncoder
+from app.config import settings
+from app.schemas.book_schema import BookCreate, BookExpand, BookExpanded, BookFilter, BookFull, BookSort, BookUpdate
+from app.schemas.bulk_schema import BulkItemResult
+from app.schemas.page_schema import Page, PageParams
+from app.schemas.search_schema import SearchParams
 from app.services.book_service import BookService
+from app.services.idempotency_service import IdempotencyService
 
 router = APIRouter(tags=["API для управления книгами."])
 
+BOOK_PAGE_ENCODER = PageEncoder(BookFull)
+
 
 @router.post(
     "/",
@@ -17,7 +38,9 @@ router = APIRouter(tags=["API для управления книгами."])
 )
 async def create_book_endpoint(
     book_in: BookCreate,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=255)] = None,
     book_service: BookService = Depends(get_book_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service),
 ):
     """
     ### Добавление книги
@@ -26,41 +49,139 @@ async def create_book_endpoint(
     * **POST /books/**
     + **Description**: Добавляет новую книгу в базу данных.
     + **Request**: `BookCreate`
+    + **Headers**: `Idempotency-Key` - повтор запроса с тем же ключом возвращает сохраненный ответ
+      с заголовком `Idempotent-Replayed: true` и не добавляет книгу заново. Ключ с другими данными запроса - 422
     + **Response**: `BookFull`
     + **Status Code**: 201 Created
     """
-    return await book_service.create_book(book_in=book_in)
+    if idempotency_key is None:
+        return await book_service.create_book(book_in=book_in)
+    return await idempotency_service.create_once(
+        scope="books",
+        key=idempotency_key,
+        request_in=book_in,
+        create=lambda: book_service.create_book(book_in=book_in, commit=False),
+        response_model=BookFull,
+    )
+
+
+@router.post(
+    "/bulk",
+    summary="Пакетное добавление книг",
+    response_model=List[BulkItemResult],
+    status_code=status.HTTP_200_OK,
+)
+async def bulk_create_books_endpoint(
+    books_in: Annotated[List[BookCreate], Body(max_length=settings.api.max_bulk_size)],
+    book_service: BookService = Depends(get_book_service),
+):
+    """
+    ### Пакетное добавление книг
+    ----------------
+
+    * **POST /books/bulk**
+    + **Description**: Добавляет список книг пакетными INSERT в одной транзакции.
+      Для каждой строки возвращает статус `created` с ID или `duplicate`, либо `author_not_found`.
+    + **Request**: `List[BookCreate]`
+    + **Response**: `List[BulkItemResult]`
+    + **Status Code**: 200 OK
+    """
+    return await book_service.bulk_create_books(books_in=books_in)
 
 
 @router.get(
     "/",
     summary="Получение списка книг",
-    response_model=List[BookFull],
+    response_model=Page[BookExpanded],
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_books_endpoint(
-    book_service: BookService = Depends(get_book_service),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    filters: BookFilter = Depends(),
+    ids: List[int] | None = Depends(get_ids_param),
+    expand: List[str] = Depends(expand_params(BookExpand)),
+    sort: Annotated[BookSort, Query()] = BookSort.id,
+    book_service: BookService = Depends(get_book_read_service),
 ):
     """
     ### Получение всех книг
     ----------------------
 
     * **GET /books/**
-    + **Description**: Возвращает список всех книг.
+    + **Description**: Возвращает страницу книг, упорядоченных по полю `sort` (по умолчанию по ID).
+      Поле `next` содержит значение `after` для запроса следующей страницы.
+      С параметром `ids` возвращает книги с указанными ID в порядке их перечисления, без пагинации и фильтров.
+    + **Parameters**: `after`, `limit`, `sort`, `ids`, фильтры `author_id`, `available__gt`,
+      `expand` - связи для вложения в ответ: `author`
+    + **Headers**: `If-None-Match` - при совпадении с ETag страницы возвращается 304 Not Modified
+    + **Performance**: при `API_FAST_LIST_SERIALIZATION=true` страница без `expand` читается кортежами колонок
+      и сериализуется сразу в JSON, без объектов ORM и Pydantic. Форма ответа не меняется.
+    + **Response**: `Page[BookExpanded]`
+    + **Status Code**: 200 OK
+    """
+    if ids is not None:
+        books = await book_service.get_many(ids=ids, expand=expand)
+    else:
+        list_params = {"page": page, "filters": filters.model_dump(exclude_none=True), "sort": sort.value}
+        if "if-none-match" in request.headers and not expand:
+            etag = await book_service.get_page_etag(**list_params)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+        if settings.api.fast_list_serialization and not expand:
+            books_rows = await book_service.get_all_rows(**list_params, columns=BOOK_PAGE_ENCODER.columns)
+            etag = book_service.page_etag(books_rows)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+            return BOOK_PAGE_ENCODER.response(books_rows, etag=etag)
+        books = await book_service.get_all(**list_params, expand=expand)
+
+    etag = book_service.page_etag(books, expand=expand)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return books
+
+
+@router.get(
+    "/search",
+    summary="Поиск книг",
+    response_model=List[BookFull],
+    status_code=status.HTTP_200_OK,
+)
+async def search_books_endpoint(
+    search: SearchParams = Depends(get_search_params),
+    book_service: BookService = Depends(get_book_read_service),
+):
+    """
+    ### Поиск книг
+    ----------------------
+
+    * **GET /books/search**
+    + **Description**: Полнотекстовый поиск книг по названию, имени автора и описанию.
+      Результаты упорядочены по релевантности.
+    + **Parameters**: `q`, `limit`
     + **Response**: `List[BookFull]`
     + **Status Code**: 200 OK
     """
-    return await book_service.get_all()
+    return await book_service.search(query=search.q, limit=search.limit)
 
 
 @router.get(
     "/{book_id}",
     summary="Получение информации о книге",
-    response_model=BookFull,
+    response_model=BookExpanded,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_book_endpoint(
-    book_service: BookService = Depends(get_book_service_with_obj_by_id),
+    request: Request,
+    response: Response,
+    expand: List[str] = Depends(expand_params(BookExpand)),
+    book_service: BookService = Depends(get_book_service_with_cached_obj_by_id),
 ):
     """
     ### Получение информации о книге
@@ -68,11 +189,18 @@ async def get_book_endpoint(
 
     * **GET /books/{book_id}**
     + **Description**: Возвращает информацию о книге по входящему ID.
-    + **Parameters**: `book_id`
-    + **Response**: `BookFull`
+    + **Parameters**: `book_id`, `expand` - связи для вложения в ответ: `author`
+    + **Headers**: `If-None-Match` - при совпадении с ETag записи возвращается 304 Not Modified
+    + **Response**: `BookExpanded`
     + **Status Code**: 200 OK
     """
-    return book_service.obj_db_by_id
+    book = await book_service.load_expansions(expand=expand)
+    etag = book_service.obj_etag(book, expand=expand)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return book
 
 
 @router.put(
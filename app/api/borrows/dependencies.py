@@ -1,9 +1,10 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
-from fastapi import Depends, Path
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.database.db import db
+from app.schemas.borrow_schema import ExportFormat
 from app.services.borrow_service import BorrowService
 
 
@@ -20,6 +21,20 @@ async def get_borrow_service(session: AsyncSession = Depends(db.session_getter))
     return BorrowService(async_session=session)
 
 
+async def get_borrow_read_service(session: AsyncSession = Depends(db.read_session_getter)) -> BorrowService:
+    """
+    Depends зависимость для создания экземпляра сервиса работы с выдачами только для чтения.
+    Сессия открывается на реплике, если она доступна.
+
+    Args:
+        session (AsyncSession): Сессия базы данных только для чтения.
+
+    Returns:
+        BorrowService: Экземпляр сервиса для работы с выдачами.
+    """
+    return BorrowService(async_session=session)
+
+
 async def get_borrow_service_with_obj_by_id(
     borrow_id: Annotated[int, Path], borrow_service: BorrowService = Depends(get_borrow_service)
 ) -> BorrowService:
@@ -36,3 +51,46 @@ async def get_borrow_service_with_obj_by_id(
     """
     await borrow_service.store_obj_db_by_id_or_404(borrow_id)
     return borrow_service
+
+
+async def get_borrow_service_with_cached_obj_by_id(
+    borrow_id: Annotated[int, Path], borrow_service: BorrowService = Depends(get_borrow_read_service)
+) -> BorrowService:
+    """
+    Depends зависимость для получания экземпляра сервиса работы с выдачами,
+    Экземпляр сервиса сохраняет в атрибуте класса объект базы данных полученный по входящему ID из кэша,
+    если объект есть в кэше. Только для чтения объекта.
+
+    Args:
+        borrow_id (int): ID выдачи.
+        borrow_service (BorrowService): Экземпляр сервиса для работы с выдачами.
+
+    Returns:
+        BorrowService: Экземпляр сервиса для работы с выдачами.
+    """
+    await borrow_service.store_obj_db_by_id_or_404(borrow_id, use_cache=True)
+    return borrow_service
+
+
+async def get_borrow_export_stream(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.ndjson,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(db.read_session_factory_getter),
+) -> AsyncIterator[bytes]:
+    """
+    Depends зависимость для получения потока выгрузки выдач.
+    Поток открывает собственную сессию, так как читается уже после завершения обработчика запроса.
+
+    Args:
+        export_format (ExportFormat): Формат выгрузки.
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных только для чтения.
+
+    Returns:
+        AsyncIterator[bytes]: Поток выгрузки.
+    """
+
+    async def stream() -> AsyncIterator[bytes]:
+        async with session_factory() as session:
+            async for chunk in BorrowService(async_session=session).export(export_format=export_format):
+                yield chunk
+
+    return stream()
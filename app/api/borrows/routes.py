@@ -1,13 +1,38 @@
-from typing import List
+from typing import Annotated, AsyncIterator, List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from app.api.borrows.dependencies import get_borrow_service, get_borrow_service_with_obj_by_id
-from app.schemas.borrow_schema import BorrowCreate, BorrowFull, BorrowResponse
+from app.api.borrows.dependencies import (
+    get_borrow_export_stream,
+    get_borrow_read_service,
+    get_borrow_service,
+    get_borrow_service_with_cached_obj_by_id,
+)
+from app.api.conditional import etag_matches, not_modified_response
+from app.api.dependencies import expand_params, get_idempotency_service, get_page_params
+from app.api.serialization import PageEncoder
+from app.config import settings
+from app.schemas.borrow_schema import (
+    BorrowCreate,
+    BorrowExpand,
+    BorrowExpanded,
+    BorrowFilter,
+    BorrowFull,
+    BorrowResponse,
+    BorrowSort,
+    ExportFormat,
+)
+from app.schemas.page_schema import Page, PageParams
 from app.services.borrow_service import BorrowService
+from app.services.idempotency_service import IdempotencyService
 
 router = APIRouter(tags=["API для управления выдачами книг."])
 
+BORROW_PAGE_ENCODER = PageEncoder(BorrowResponse, exclude_none=True)
+
+EXPORT_MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv"}
+
 
 @router.post(
     "/",
@@ -18,7 +43,9 @@ router = APIRouter(tags=["API для управления выдачами кн
 )
 async def create_borrow_endpoint(
     borrow_in: BorrowCreate,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=255)] = None,
     borrow_service: BorrowService = Depends(get_borrow_service),
+    idempotency_service: IdempotencyService = Depends(get_idempotency_service),
 ):
     """
     ### Создание записи о выдаче книги
@@ -27,43 +54,139 @@ async def create_borrow_endpoint(
     * **POST /borrows/**
     + **Description**: Создает новую запись о выдаче книги.
     + **Request**: `BorrowCreate`
+    + **Headers**: `Idempotency-Key` - повтор запроса с тем же ключом возвращает сохраненный ответ
+      с заголовком `Idempotent-Replayed: true` и не создает новую выдачу. Ключ с другими данными запроса - 422
     + **Response**: `BorrowResponse`
     + **Status Code**: 201 Created
     """
-    return await borrow_service.create_borrow(borrow_in=borrow_in)
+    if idempotency_key is None:
+        return await borrow_service.create_borrow(borrow_in=borrow_in)
+    return await idempotency_service.create_once(
+        scope="borrows",
+        key=idempotency_key,
+        request_in=borrow_in,
+        create=lambda: borrow_service.create_borrow(borrow_in=borrow_in, commit=False),
+        response_model=BorrowResponse,
+        exclude_none=True,
+    )
 
 
 @router.get(
     "/",
     summary="Получение списка всех выдач книг",
-    response_model=List[BorrowResponse],
+    response_model=Page[BorrowExpanded],
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_borrows_endpoint(
-    borrow_service: BorrowService = Depends(get_borrow_service),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    filters: BorrowFilter = Depends(),
+    expand: List[str] = Depends(expand_params(BorrowExpand)),
+    sort: Annotated[BorrowSort, Query()] = BorrowSort.id,
+    borrow_service: BorrowService = Depends(get_borrow_read_service),
 ):
     """
     ### Получение всех выдач книг
     ----------------------
 
     * **GET /borrows/**
-    + **Description**: Возвращает список всех выдач книг.
-    + **Response**: `List[BorrowResponse]`
+    + **Description**: Возвращает страницу выдач книг, упорядоченных по полю `sort` (по умолчанию по ID).
+      Поле `next` содержит значение `after` для запроса следующей страницы, на последней странице отсутствует.
+    + **Parameters**: `after`, `limit`, `sort`, `expand` - связи для вложения в ответ: `book`, `book.author`,
+      фильтры `book_id`, `reader_name`, `return_date__isnull`, `borrow_date__gte`, `borrow_date__lt`
+    + **Headers**: `If-None-Match` - при совпадении с ETag страницы возвращается 304 Not Modified
+    + **Performance**: при `API_FAST_LIST_SERIALIZATION=true` страница без `expand` читается кортежами колонок
+      и сериализуется сразу в JSON, без объектов ORM и Pydantic. Форма ответа не меняется.
+    + **Response**: `Page[BorrowExpanded]`
     + **Status Code**: 200 OK
     """
-    return await borrow_service.get_all()
+    list_params = {"page": page, "filters": filters.model_dump(exclude_none=True), "sort": sort.value}
+    if "if-none-match" in request.headers and not expand:
+        etag = await borrow_service.get_page_etag(**list_params)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
+    if settings.api.fast_list_serialization and not expand:
+        borrows_rows = await borrow_service.get_all_rows(**list_params, columns=BORROW_PAGE_ENCODER.columns)
+        etag = borrow_service.page_etag(borrows_rows)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        return BORROW_PAGE_ENCODER.response(borrows_rows, etag=etag)
+
+    borrows = await borrow_service.get_all(**list_params, expand=expand)
+    etag = borrow_service.page_etag(borrows, expand=expand)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return borrows
+
+
+@router.get(
+    "/overdue",
+    summary="Получение просроченных выдач книг",
+    response_model=Page[BorrowResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_overdue_borrows_endpoint(
+    page: PageParams = Depends(get_page_params),
+    borrow_service: BorrowService = Depends(get_borrow_read_service),
+):
+    """
+    ### Получение просроченных выдач книг
+    ----------------------
+
+    * **GET /borrows/overdue**
+    + **Description**: Возвращает страницу невозвращенных книг с истекшим сроком возврата,
+      упорядоченных по сроку возврата. Поле `next` содержит значение `after` для запроса следующей страницы.
+    + **Parameters**: `after`, `limit`
+    + **Response**: `Page[BorrowResponse]`
+    + **Status Code**: 200 OK
+    """
+    return await borrow_service.get_overdue(page=page)
+
+
+@router.get(
+    "/export",
+    summary="Выгрузка всех выдач книг",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_borrows_endpoint(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.ndjson,
+    stream: AsyncIterator[bytes] = Depends(get_borrow_export_stream),
+):
+    """
+    ### Выгрузка всех выдач книг
+    ----------------------
+
+    * **GET /borrows/export**
+    + **Description**: Потоково выгружает все выдачи книг, упорядоченные по ID, в формате NDJSON или CSV.
+    + **Parameters**: `format`
+    + **Response**: `application/x-ndjson` | `text/csv`
+    + **Status Code**: 200 OK
+    """
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="borrows.{export_format.value}"'},
+    )
 
 
 @router.get(
     "/{borrow_id}",
     summary="Получение информации о выдаче книги",
-    response_model=BorrowResponse,
+    response_model=BorrowExpanded,
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_borrow_endpoint(
-    borrow_service: BorrowService = Depends(get_borrow_service_with_obj_by_id),
+    request: Request,
+    response: Response,
+    expand: List[str] = Depends(expand_params(BorrowExpand)),
+    borrow_service: BorrowService = Depends(get_borrow_service_with_cached_obj_by_id),
 ):
     """
     ### Получение информации о выдаче книги
@@ -71,11 +194,18 @@ async def get_borrow_endpoint(
 
     * **GET /borrows/{borrow_id}**
     + **Description**: Возвращает информацию о выдаче книги по входящему ID.
-    + **Parameters**: `borrow_id`
-    + **Response**: `BorrowResponse`
+    + **Parameters**: `borrow_id`, `expand` - связи для вложения в ответ: `book`, `book.author`
+    + **Headers**: `If-None-Match` - при совпадении с ETag записи возвращается 304 Not Modified
+    + **Response**: `BorrowExpanded`
     + **Status Code**: 200 OK
     """
-    return borrow_service.obj_db_by_id
+    borrow = await borrow_service.load_expansions(expand=expand)
+    etag = borrow_service.obj_etag(borrow, expand=expand)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+    return borrow
 
 
 @router.patch(
@@ -85,7 +215,8 @@ async def get_borrow_endpoint(
     status_code=status.HTTP_200_OK,
 )
 async def borrow_completion_endpoint(
-    borrow_service: BorrowService = Depends(get_borrow_service_with_obj_by_id),
+    borrow_id: Annotated[int, Path],
+    borrow_service: BorrowService = Depends(get_borrow_service),
 ):
     """
     ### Завершение выдачи книги
@@ -97,4 +228,4 @@ async def borrow_completion_endpoint(
     + **Response**: `BorrowFull`
     + **Status Code**: 200 OK
     """
-    return await borrow_service.close_borrow()
+    return await borrow_service.close_borrow(borrow_id=borrow_id)
@@ -0,0 +1,33 @@
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match запроса на совпадение с текущим ETag ресурса.
+
+    Args:
+        request (Request): Входящий запрос.
+        etag (str): Текущий ETag ресурса.
+
+    Returns:
+        bool: True, если у клиента актуальная версия ресурса.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    Ответ 304 Not Modified без тела.
+
+    Args:
+        etag (str): Текущий ETag ресурса.
+
+    Returns:
+        Response: Ответ 304.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,116 @@
+from enum import Enum
+from typing import Annotated, Awaitable, Callable, List, Type
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.db import db
+from app.schemas.page_schema import PageParams
+from app.schemas.search_schema import SearchParams
+from app.services.idempotency_service import IdempotencyService
+
+
+async def get_page_params(
+    after: Annotated[int | None, Query(ge=0, description="ID последней записи предыдущей страницы")] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.api.max_page_limit)] = settings.api.default_page_limit,
+) -> PageParams:
+    """
+    Depends зависимость для получения параметров keyset пагинации.
+
+    Args:
+        after (int | None): Курсор, ID последней записи предыдущей страницы.
+        limit (int): Максимальное количество записей на странице.
+
+    Returns:
+        PageParams: Параметры пагинации.
+    """
+    return PageParams(after=after, limit=limit)
+
+
+async def get_search_params(
+    q: Annotated[
+        str,
+        Query(min_length=1, max_length=settings.api.max_search_query_length, description="Поисковый запрос"),
+    ],
+    limit: Annotated[int, Query(ge=1, le=settings.api.max_search_limit)] = settings.api.default_search_limit,
+) -> SearchParams:
+    """
+    Depends зависимость для получения параметров полнотекстового поиска.
+
+    Args:
+        q (str): Поисковый запрос: слова, фразы в кавычках, OR и исключение через минус.
+        limit (int): Максимальное количество результатов.
+
+    Returns:
+        SearchParams: Параметры поиска.
+    """
+    return SearchParams(q=q, limit=limit)
+
+
+async def get_ids_param(
+    ids: Annotated[str | None, Query(pattern=r"^\d+(,\d+)*$", description="ID записей через запятую")] = None,
+) -> List[int] | None:
+    """
+    Depends зависимость для получения списка ID для пакетного получения записей.
+
+    Args:
+        ids (str | None): ID записей через запятую.
+
+    Returns:
+        List[int] | None: Список ID или None, если параметр не передан.
+
+    Raises:
+        HTTPException: Если передано больше ID, чем максимальный размер страницы.
+    """
+    if ids is None:
+        return None
+
+    ids_list = [int(obj_id) for obj_id in ids.split(",")]
+    if len(ids_list) > settings.api.max_page_limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No more than {settings.api.max_page_limit} ids per request",
+        )
+    return ids_list
+
+
+def expand_params(expand_enum: Type[Enum]) -> Callable[..., Awaitable[List[str]]]:
+    """
+    Фабрика Depends зависимостей для параметра expand.
+
+    Args:
+        expand_enum (Type[Enum]): Допустимые пути связей.
+
+    Returns:
+        Callable[..., Awaitable[List[str]]]: Depends зависимость, возвращающая список путей связей.
+    """
+    allowed = [item.value for item in expand_enum]
+
+    async def get_expand_params(
+        expand: Annotated[str | None, Query(description=f"Связи через запятую: {', '.join(allowed)}")] = None,
+    ) -> List[str]:
+        names = list(dict.fromkeys(name.strip() for name in (expand or "").split(",") if name.strip()))
+        unsupported = [name for name in names if name not in allowed]
+        if unsupported:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unsupported expand {', '.join(unsupported)}, allowed: {', '.join(allowed)}",
+            )
+        return names
+
+    return get_expand_params
+
+
+async def get_idempotency_service(session: AsyncSession = Depends(db.session_getter)) -> IdempotencyService:
+    """
+    Depends зависимость для создания экземпляра сервиса ключей идемпотентности.
+    Сессия запроса общая с сервисом, который создает запись, поэтому ключ и запись фиксируются вместе.
+
+    Args:
+        session (AsyncSession): Сессия базы данных.
+
+    Returns:
+        IdempotencyService: Экземпляр сервиса ключей идемпотентности.
+    """
+    return IdempotencyService(async_session=session)
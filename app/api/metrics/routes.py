@@ -0,0 +1,28 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.monitoring.collectors import registry
+
+router = APIRouter(tags=["Служебные API."])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    summary="Метрики в формате Prometheus",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_metrics_endpoint():
+    """
+    ### Метрики в формате Prometheus
+    ----------------------
+
+    * **GET /metrics**
+    + **Description**: Возвращает метрики текущего процесса: время обработки и статусы запросов по маршрутам,
+    запросы в обработке, количество и время SQL-выражений за запрос, состояние пула соединений.
+    + **Response**: `text/plain; version=0.0.4`
+    + **Status Code**: 200 OK
+    """
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,19 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import db
+from app.services.stats_service import StatsService
+
+
+async def get_stats_read_service(session: AsyncSession = Depends(db.read_session_getter)) -> StatsService:
+    """
+    Depends зависимость для создания экземпляра сервиса статистики.
+    Сессия открывается на реплике, если она доступна.
+
+    Args:
+        session (AsyncSession): Сессия базы данных только для чтения.
+
+    Returns:
+        StatsService: Экземпляр сервиса статистики.
+    """
+    return StatsService(async_session=session)
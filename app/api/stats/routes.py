@@ -0,0 +1,102 @@
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.stats.dependencies import get_stats_read_service
+from app.config import settings
+from app.schemas.stats_schema import AuthorUtilisation, DailyBorrows, ReaderActivity, TopBook
+from app.services.stats_service import StatsService
+
+router = APIRouter(tags=["API статистики выдач."])
+
+StatsLimit = Annotated[int, Query(ge=1, le=settings.stats.max_limit)]
+
+
+@router.get(
+    "/books/top",
+    summary="Самые востребованные книги",
+    response_model=List[TopBook],
+    status_code=status.HTTP_200_OK,
+)
+async def get_top_books_endpoint(
+    limit: StatsLimit = settings.stats.default_limit,
+    stats_service: StatsService = Depends(get_stats_read_service),
+):
+    """
+    ### Самые востребованные книги
+    ----------------------
+
+    * **GET /stats/books/top**
+    + **Description**: Возвращает книги с наибольшим количеством выдач за все время.
+    + **Response**: `List[TopBook]`
+    + **Status Code**: 200 OK
+    """
+    return await stats_service.top_books(limit=limit)
+
+
+@router.get(
+    "/readers/active",
+    summary="Читатели с открытыми выдачами",
+    response_model=List[ReaderActivity],
+    status_code=status.HTTP_200_OK,
+)
+async def get_active_readers_endpoint(
+    limit: StatsLimit = settings.stats.default_limit,
+    stats_service: StatsService = Depends(get_stats_read_service),
+):
+    """
+    ### Читатели с открытыми выдачами
+    ----------------------
+
+    * **GET /stats/readers/active**
+    + **Description**: Возвращает читателей с наибольшим количеством невозвращенных книг.
+    + **Response**: `List[ReaderActivity]`
+    + **Status Code**: 200 OK
+    """
+    return await stats_service.active_readers(limit=limit)
+
+
+@router.get(
+    "/authors/utilisation",
+    summary="Загруженность фонда авторов",
+    response_model=List[AuthorUtilisation],
+    status_code=status.HTTP_200_OK,
+)
+async def get_author_utilisation_endpoint(
+    limit: StatsLimit = settings.stats.default_limit,
+    stats_service: StatsService = Depends(get_stats_read_service),
+):
+    """
+    ### Загруженность фонда авторов
+    ----------------------
+
+    * **GET /stats/authors/utilisation**
+    + **Description**: Возвращает авторов с наибольшей долей выданных экземпляров книг.
+    Данные обновляются периодически, с интервалом STATS_REFRESH_INTERVAL секунд.
+    + **Response**: `List[AuthorUtilisation]`
+    + **Status Code**: 200 OK
+    """
+    return await stats_service.author_utilisation(limit=limit)
+
+
+@router.get(
+    "/borrows/daily",
+    summary="Выдачи и возвраты по дням",
+    response_model=List[DailyBorrows],
+    status_code=status.HTTP_200_OK,
+)
+async def get_daily_borrows_endpoint(
+    days: Annotated[int, Query(ge=1, le=settings.stats.max_days)] = 30,
+    stats_service: StatsService = Depends(get_stats_read_service),
+):
+    """
+    ### Выдачи и возвраты по дням
+    ----------------------
+
+    * **GET /stats/borrows/daily**
+    + **Description**: Возвращает количество выдач и возвратов за последние days дней. Дни без выдач
+    и возвратов пропускаются.
+    + **Response**: `List[DailyBorrows]`
+    + **Status Code**: 200 OK
+    """
+    return await stats_service.daily_counts(days=days)
@@ -0,0 +1,88 @@
+from typing import List
+
+from fastapi import APIRouter, status
+
+from app.api.admission import admission_controller
+from app.cache.entity_cache import entity_cache
+from app.database.db import db
+from app.schemas.system_schema import AdmissionStats, CacheStats, PoolStats, ReplicaStats
+
+router = APIRouter(tags=["Служебные API."])
+
+
+@router.get(
+    "/cache",
+    summary="Статистика кэша записей",
+    response_model=CacheStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_stats_endpoint():
+    """
+    ### Статистика кэша записей
+    ----------------------
+
+    * **GET /system/cache**
+    + **Description**: Возвращает количество попаданий и промахов кэша записей в текущем процессе.
+    + **Response**: `CacheStats`
+    + **Status Code**: 200 OK
+    """
+    return entity_cache.stats()
+
+
+@router.get(
+    "/pool",
+    summary="Статистика пула соединений",
+    response_model=PoolStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_pool_stats_endpoint():
+    """
+    ### Статистика пула соединений
+    ----------------------
+
+    * **GET /system/pool**
+    + **Description**: Возвращает занятые соединения, переполнение пула и гистограмму времени ожидания
+    соединения в текущем процессе. Корзины гистограммы накопительные, границы в секундах.
+    + **Response**: `PoolStats`
+    + **Status Code**: 200 OK
+    """
+    return db.pool_stats()
+
+
+@router.get(
+    "/replicas",
+    summary="Состояние реплик",
+    response_model=List[ReplicaStats],
+    status_code=status.HTTP_200_OK,
+)
+async def get_replica_stats_endpoint():
+    """
+    ### Состояние реплик
+    ----------------------
+
+    * **GET /system/replicas**
+    + **Description**: Возвращает реплики для чтения, их отставание в секундах и участие в ротации.
+    + **Response**: `List[ReplicaStats]`
+    + **Status Code**: 200 OK
+    """
+    return db.replicas.stats()
+
+
+@router.get(
+    "/admission",
+    summary="Состояние допуска запросов",
+    response_model=AdmissionStats,
+    status_code=status.HTTP_200_OK,
+)
+async def get_admission_stats_endpoint():
+    """
+    ### Состояние допуска запросов
+    ----------------------
+
+    * **GET /system/admission**
+    + **Description**: Возвращает количество слотов, занятые слоты и длину очередей чтения и записи
+    в текущем процессе.
+    + **Response**: `AdmissionStats`
+    + **Status Code**: 200 OK
+    """
+    return admission_controller.stats()
@@ -0,0 +1,153 @@
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """
+    Базовый класс хранилища кэша.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """
+        Получение значения по ключу, None если значения нет или истек срок хранения.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Сохранение значения по ключу.
+        """
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Удаление значений по ключам.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Очистка хранилища.
+        """
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Хранилище в памяти процесса с ограничением по количеству записей (LRU) и времени жизни записи.
+
+    Attributes:
+        max_size (int): Максимальное количество записей.
+        ttl (float): Время жизни записи в секундах.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Общее для всех процессов хранилище в Redis. Требует установленного пакета redis.
+
+    Attributes:
+        ttl (float): Время жизни записи в секундах.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl: float, prefix: str = "library:"):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise RuntimeError("Для кэша в Redis установите пакет redis: pip install redis") from exc
+
+        self.client = Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.client.get(self.prefix + key)
+        return pickle.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(self.prefix + key, pickle.dumps(value), px=int(self.ttl * 1000))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            await self.client.delete(key)
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Двухуровневое хранилище: локальный LRU кэш процесса перед общим хранилищем.
+    Запись и удаление выполняются на обоих уровнях. Удаление на других процессах не видно их локальному
+    уровню, поэтому время жизни локальных записей должно быть коротким.
+
+    Attributes:
+        local (CacheBackend): Локальное хранилище.
+        shared (CacheBackend): Общее хранилище.
+    """
+
+    def __init__(self, local: CacheBackend, shared: CacheBackend):
+        self.local = local
+        self.shared = shared
+        self.name = f"{local.name}+{shared.name}"
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.local.get(key)
+        if value is None:
+            value = await self.shared.get(key)
+            if value is not None:
+                await self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.local.set(key, value)
+        await self.shared.set(key, value)
+
+    async def delete(self, *keys: str) -> None:
+        await self.local.delete(*keys)
+        await self.shared.delete(*keys)
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        await self.shared.clear()
@@ -0,0 +1,149 @@
+from typing import Any, Iterable, Type
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.backends import CacheBackend, LRUCacheBackend, RedisCacheBackend, TieredCacheBackend
+from app.config import settings
+from app.models.base import Base
+
+STALE_KEYS = "entity_cache_stale_keys"
+
+
+def column_values(obj_db: Base) -> dict[str, Any]:
+    """
+    Загруженные значения колонок объекта, по которым его можно восстановить в другой сессии.
+
+    Args:
+        obj_db (Base): Объект базы данных.
+
+    Returns:
+        dict[str, Any]: Значения колонок.
+    """
+    state = inspect(obj_db)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+class EntityCache:
+    """
+    Кэш записей по идентификатору. Хранит значения колонок записи, а не ORM объект,
+    поэтому запись из кэша может быть присоединена к любой сессии.
+
+    Изменяющие запросы помечают записи устаревшими в сессии, записи удаляются из кэша после commit,
+    чтобы конкурентное чтение не вернуло в кэш данные незавершенной транзакции.
+
+    Attributes:
+        backend (CacheBackend | None): Хранилище кэша, None если кэш отключен.
+        hits (int): Количество попаданий в кэш.
+        misses (int): Количество промахов кэша.
+    """
+
+    def __init__(self, backend: CacheBackend | None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: Type[Base], obj_id: int) -> str:
+        return f"{model.__tablename__}:{obj_id}"
+
+    async def get(self, model: Type[Base], obj_id: int) -> dict[str, Any] | None:
+        """
+        Получение значений колонок записи из кэша.
+
+        Args:
+            model (Type[Base]): Модель записи.
+            obj_id (int): Идентификатор записи.
+
+        Returns:
+            dict[str, Any] | None: Значения колонок или None при промахе.
+        """
+        if self.backend is None:
+            return None
+
+        values = await self.backend.get(self.key(model, obj_id))
+        if values is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return values
+
+    async def set(self, obj_db: Base) -> None:
+        """
+        Сохранение загруженных значений колонок записи в кэш.
+
+        Args:
+            obj_db (Base): Объект базы данных.
+        """
+        if self.backend is None:
+            return
+
+        await self.backend.set(self.key(type(obj_db), obj_db.id), column_values(obj_db))
+
+    def mark_stale(self, session: AsyncSession, model: Type[Base], *obj_ids: int) -> None:
+        """
+        Помечает записи устаревшими, они будут удалены из кэша после commit сессии.
+
+        Args:
+            session (AsyncSession): Сессия, в которой изменяются записи.
+            model (Type[Base]): Модель записей.
+            obj_ids (int): Идентификаторы записей.
+        """
+        session.info.setdefault(STALE_KEYS, set()).update(self.key(model, obj_id) for obj_id in obj_ids)
+
+    def mark_stale_objects(self, session: AsyncSession, objs_db: Iterable[Base]) -> None:
+        """
+        Помечает устаревшими записи переданных объектов.
+
+        Args:
+            session (AsyncSession): Сессия, в которой изменяются записи.
+            objs_db (Iterable[Base]): Объекты базы данных.
+        """
+        for obj_db in objs_db:
+            self.mark_stale(session, type(obj_db), obj_db.id)
+
+    async def commit(self, session: AsyncSession) -> None:
+        """
+        Commit сессии и удаление помеченных устаревшими записей из кэша.
+
+        Args:
+            session (AsyncSession): Сессия базы данных.
+        """
+        await session.commit()
+        stale_keys = session.info.pop(STALE_KEYS, None)
+        if stale_keys and self.backend is not None:
+            await self.backend.delete(*stale_keys)
+
+    async def clear(self) -> None:
+        if self.backend is not None:
+            await self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+        }
+
+
+def create_cache_backend() -> CacheBackend | None:
+    """
+    Создание хранилища кэша по настройкам.
+
+    Returns:
+        CacheBackend | None: Хранилище кэша или None, если кэш отключен.
+    """
+    if not settings.cache.enabled:
+        return None
+
+    local = LRUCacheBackend(max_size=settings.cache.max_size, ttl=settings.cache.ttl)
+    if settings.cache.redis_url is None:
+        return local
+
+    shared = RedisCacheBackend(url=settings.cache.redis_url, ttl=settings.cache.shared_ttl)
+    return TieredCacheBackend(local=local, shared=shared)
+
+
+entity_cache = EntityCache(backend=create_cache_backend())
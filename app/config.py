@@ -1,14 +1,108 @@
-from pydantic import BaseModel
+from typing import Dict, List
+
+from pydantic import AliasChoices, BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class PostgresSettings(BaseSettings):
-    url: str = "postgresql+asyncpg://admin:admin@db/library"
+    model_config = SettingsConfigDict(env_prefix="DB_", populate_by_name=True)
+
+    url: str = Field(
+        default="postgresql+asyncpg://admin:admin@db/library",
+        validation_alias=AliasChoices("DB_URL", "URL"),
+    )
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = False
+    statement_cache_size: int = 100
+    prepared_statement_cache_size: int = 100
+    read_urls: List[str] = []
+    replica_max_lag: float = 5.0
+    replica_check_interval: float = 5.0
+
+
+class ApiSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="API_")
+
+    default_page_limit: int = 50
+    max_page_limit: int = 500
+    export_batch_size: int = 1000
+    max_bulk_size: int = 10000
+    bulk_batch_size: int = 1000
+    default_search_limit: int = 20
+    max_search_limit: int = 100
+    max_search_query_length: int = 200
+    fast_list_serialization: bool = False
+
+
+class CacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="CACHE_")
+
+    enabled: bool = True
+    max_size: int = 10000
+    ttl: float = 30.0
+    redis_url: str | None = None
+    shared_ttl: float = 300.0
+
+
+class BorrowSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="BORROW_")
+
+    loan_days: int = 14
+    overdue_scan_interval: float = 60.0
+    overdue_batch_size: int = 500
+
+
+class AdmissionSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="ADMISSION_")
+
+    enabled: bool = True
+    max_concurrency: int | None = None
+    write_reserved: int = 2
+    read_queue_size: int = 50
+    write_queue_size: int = 50
+    queue_timeout: float = 5.0
+    retry_after: int = 1
+    route_limits: Dict[str, int] = {"GET /borrows/export": 2}
+    exempt_prefixes: List[str] = ["/metrics", "/system", "/docs", "/redoc", "/openapi.json"]
+
+
+class IdempotencySettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="IDEMPOTENCY_")
+
+    ttl: float = 86400.0
+    purge_interval: float = 3600.0
+    purge_batch_size: int = 1000
+
+
+class StatsSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="STATS_")
+
+    default_limit: int = 10
+    max_limit: int = 100
+    max_days: int = 366
+    refresh_interval: float = 60.0
+
+
+class MonitoringSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="MONITORING_")
+
+    slow_query_threshold: float = 0.5
+    repeated_statement_limit: int = 10
 
 
 class Settings(BaseModel):
     model_config = SettingsConfigDict(case_sensitive=False)
     db: PostgresSettings = PostgresSettings()
+    api: ApiSettings = ApiSettings()
+    cache: CacheSettings = CacheSettings()
+    stats: StatsSettings = StatsSettings()
+    borrow: BorrowSettings = BorrowSettings()
+    idempotency: IdempotencySettings = IdempotencySettings()
+    admission: AdmissionSettings = AdmissionSettings()
+    monitoring: MonitoringSettings = MonitoringSettings()
 
 
 settings = Settings()
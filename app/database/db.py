@@ -2,30 +2,94 @@ from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.config import settings
-from app.models.base import Base
+from app.config import PostgresSettings, settings
+from app.database.pool_monitor import MonitoredQueuePool, PoolMonitor
+from app.database.replicas import ReplicaSet
+from app.monitoring.sql import instrument_engine
+
+
+def create_engine(url: str, db_settings: PostgresSettings) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        poolclass=MonitoredQueuePool,
+        pool_size=db_settings.pool_size,
+        max_overflow=db_settings.max_overflow,
+        pool_timeout=db_settings.pool_timeout,
+        pool_recycle=db_settings.pool_recycle,
+        pool_pre_ping=db_settings.pool_pre_ping,
+        connect_args={
+            "statement_cache_size": db_settings.statement_cache_size,
+            "prepared_statement_cache_size": db_settings.prepared_statement_cache_size,
+        },
+    )
+    instrument_engine(engine)
+    return engine
 
 
 class Database:
-    def __init__(self, url: str) -> None:
-        self.engine: AsyncEngine = create_async_engine(url=url)
+    def __init__(self, db_settings: PostgresSettings) -> None:
+        self.engine: AsyncEngine = create_engine(url=db_settings.url, db_settings=db_settings)
+        self.pool_monitor = PoolMonitor()
+        self.pool_monitor.attach(self.engine.pool)
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
+        self.primary_read_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=self.engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            info={"read_only": True},
+        )
+        self.replicas = ReplicaSet(
+            engines=[create_engine(url=url, db_settings=db_settings) for url in db_settings.read_urls],
+            max_lag=db_settings.replica_max_lag,
+            check_interval=db_settings.replica_check_interval,
+        )
+
+    async def start(self) -> None:
+        await self.replicas.start()
 
     async def dispose(self) -> None:
+        await self.replicas.dispose()
         await self.engine.dispose()
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
-    async def create_tables(self) -> None:
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    async def read_session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Сессия только для чтения: открывается на исправной реплике, а если таких нет - на основной базе.
+        Чтение перед изменением записи должно идти через session_getter.
+        """
+        async with self._read_session_factory()() as session:
+            yield session
+
+    async def session_factory_getter(self) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий для потоковых ответов, сессия которых должна жить дольше обработчика запроса.
+        """
+        return self.session_factory
+
+    async def read_session_factory_getter(self) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий только для чтения для потоковых ответов.
+        """
+        return self._read_session_factory()
+
+    def _read_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        replica = self.replicas.choose()
+        return replica.session_factory if replica is not None else self.primary_read_session_factory
+
+    def pool_stats(self) -> dict:
+        """
+        Текущее состояние пула соединений и статистика ожидания соединений.
+        """
+        return self.pool_monitor.stats(self.engine.pool)
 
 
-db = Database(url=settings.db.url)
+db = Database(db_settings=settings.db)
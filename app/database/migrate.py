@@ -0,0 +1,105 @@
+import asyncio
+import pkgutil
+from importlib import import_module
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from app.config import settings
+from app.database import migrations
+
+MIGRATIONS_LOCK_ID = 7213_0001
+
+CREATE_MIGRATIONS_TABLE = text(
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    " version VARCHAR(100) PRIMARY KEY,"
+    " applied_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL"
+    ")"
+)
+
+
+def load_migrations() -> List[ModuleType]:
+    """
+    Загружает модули миграций из пакета app.database.migrations в порядке их имен.
+    Модуль миграции содержит список SQL-выражений statements и необязательный флаг transactional.
+
+    Returns:
+        List[ModuleType]: Модули миграций.
+    """
+    names = sorted(module.name for module in pkgutil.iter_modules(migrations.__path__) if module.name.startswith("m"))
+    return [import_module(f"{migrations.__name__}.{name}") for name in names]
+
+
+def migration_version(migration: ModuleType) -> str:
+    return migration.__name__.rsplit(".", 1)[-1].removeprefix("m")
+
+
+async def apply_migration(engine: AsyncEngine, lock_conn: AsyncConnection, migration: ModuleType) -> None:
+    """
+    Применяет миграцию и записывает ее версию в schema_migrations.
+    Транзакционная миграция применяется вместе с записью версии в одной транзакции.
+    Нетранзакционная (например, CREATE INDEX CONCURRENTLY) выполняется в autocommit,
+    поэтому ее выражения должны быть идемпотентными.
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+        lock_conn (AsyncConnection): Соединение в режиме autocommit, удерживающее блокировку миграций.
+        migration (ModuleType): Модуль миграции.
+    """
+    version = migration_version(migration)
+    record = text("INSERT INTO schema_migrations (version) VALUES (:version)").bindparams(version=version)
+
+    if getattr(migration, "transactional", True):
+        async with engine.begin() as conn:
+            for statement in migration.statements:
+                await conn.execute(text(statement))
+            await conn.execute(record)
+    else:
+        for statement in migration.statements:
+            await lock_conn.execute(text(statement))
+        await lock_conn.execute(record)
+
+
+async def migrate(engine: AsyncEngine) -> List[str]:
+    """
+    Применяет к базе данных все непримененные миграции.
+    Параллельные запуски сериализуются advisory-блокировкой, поэтому миграцию можно запускать
+    из каждого экземпляра приложения перед стартом.
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+
+    Returns:
+        List[str]: Версии примененных миграций.
+    """
+    applied_now = []
+    async with engine.connect() as conn:
+        lock_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:lock_id)").bindparams(lock_id=MIGRATIONS_LOCK_ID))
+        try:
+            await lock_conn.execute(CREATE_MIGRATIONS_TABLE)
+            applied = set((await lock_conn.scalars(text("SELECT version FROM schema_migrations"))).all())
+            for migration in load_migrations():
+                version = migration_version(migration)
+                if version in applied:
+                    continue
+                await apply_migration(engine=engine, lock_conn=lock_conn, migration=migration)
+                applied_now.append(version)
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:lock_id)").bindparams(lock_id=MIGRATIONS_LOCK_ID))
+    return applied_now
+
+
+async def main() -> None:
+    engine = create_async_engine(url=settings.db.url)
+    try:
+        applied = await migrate(engine)
+    finally:
+        await engine.dispose()
+    print(f"Applied migrations: {', '.join(applied) or 'none'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
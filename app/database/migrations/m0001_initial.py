@@ -0,0 +1,40 @@
+"""
+Начальная схема: таблицы авторов, книг и выдач в том виде, в котором их создавал create_all.
+Существующие базы данных, созданные create_all, проходят миграцию без изменений.
+"""
+
+statements = [
+    """
+    CREATE TABLE IF NOT EXISTS authors (
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        birth_date DATE NOT NULL,
+        id SERIAL NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (first_name, last_name, birth_date)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS books (
+        title VARCHAR(50) NOT NULL,
+        description VARCHAR(500) NOT NULL,
+        author_id INTEGER NOT NULL,
+        available INTEGER NOT NULL,
+        id SERIAL NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (title, author_id),
+        FOREIGN KEY (author_id) REFERENCES authors (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS borrows (
+        book_id INTEGER NOT NULL,
+        reader_name VARCHAR(50) NOT NULL,
+        borrow_date TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+        return_date TIMESTAMP WITHOUT TIME ZONE,
+        id SERIAL NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (book_id) REFERENCES books (id)
+    )
+    """,
+]
@@ -0,0 +1,9 @@
+"""
+Колонка версии записи для оптимистичной блокировки и ETag.
+"""
+
+statements = [
+    "ALTER TABLE authors ADD COLUMN IF NOT EXISTS version INTEGER DEFAULT '1' NOT NULL",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS version INTEGER DEFAULT '1' NOT NULL",
+    "ALTER TABLE borrows ADD COLUMN IF NOT EXISTS version INTEGER DEFAULT '1' NOT NULL",
+]
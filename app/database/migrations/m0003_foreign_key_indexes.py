@@ -0,0 +1,17 @@
+"""
+Индексы под запросы репозиториев:
+    ix_books_author_id - книги автора и проверка внешнего ключа при удалении автора;
+    ix_borrows_book_id - выдачи книги и проверка внешнего ключа при удалении книги;
+    ix_borrows_open - частичный индекс открытых выдач (return_date IS NULL).
+
+Индексы строятся CONCURRENTLY, чтобы не блокировать запись в большие таблицы,
+поэтому миграция выполняется вне транзакции.
+"""
+
+transactional = False
+
+statements = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_author_id ON books (author_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_borrows_book_id ON borrows (book_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_borrows_open ON borrows (book_id) WHERE return_date IS NULL",
+]
@@ -0,0 +1,48 @@
+"""
+Поисковые векторы для полнотекстового поиска:
+    authors.search_vector - вычисляемая колонка по имени и фамилии;
+    books.search_vector - колонка по названию, имени автора и описанию, заполняется триггерами,
+    так как вычисляемая колонка не может читать таблицу авторов.
+"""
+
+statements = [
+    """
+    ALTER TABLE authors ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('simple', first_name || ' ' || last_name)) STORED
+    """,
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+    """
+    CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('russian', NEW.title), 'A')
+            || setweight(to_tsvector('russian', coalesce(
+                (SELECT first_name || ' ' || last_name FROM authors WHERE id = NEW.author_id), ''
+            )), 'B')
+            || setweight(to_tsvector('russian', NEW.description), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER books_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, description, author_id ON books
+    FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION authors_books_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE books SET author_id = author_id WHERE author_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER authors_books_search_vector_update
+    AFTER UPDATE OF first_name, last_name ON authors
+    FOR EACH ROW
+    WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+    EXECUTE FUNCTION authors_books_search_vector_update()
+    """,
+    "UPDATE books SET author_id = author_id WHERE search_vector IS NULL",
+]
@@ -0,0 +1,11 @@
+"""
+GIN-индексы поисковых векторов авторов и книг.
+Индексы строятся CONCURRENTLY, поэтому миграция выполняется вне транзакции.
+"""
+
+transactional = False
+
+statements = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_authors_search_vector ON authors USING gin (search_vector)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_search_vector ON books USING gin (search_vector)",
+]
@@ -0,0 +1,12 @@
+"""
+Индексы под фильтры и сортировку списка выдач:
+    ix_borrows_reader_name - выдачи читателя;
+    ix_borrows_borrow_date - диапазон дат выдачи и keyset пагинация по (borrow_date, id).
+"""
+
+transactional = False
+
+statements = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_borrows_reader_name ON borrows (reader_name)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_borrows_borrow_date ON borrows (borrow_date, id)",
+]
@@ -0,0 +1,89 @@
+"""
+Статистика выдач:
+    book_borrow_counters, reader_borrow_counters, daily_borrow_counters - счетчики, которые обновляются
+    в одном запросе с выдачей и возвратом книги, заполняются по существующим выдачам;
+    author_utilisation - материализованное представление загруженности фонда авторов.
+Таблица выдач блокируется от записи на время заполнения, чтобы счетчики не разошлись с выдачами.
+"""
+
+statements = [
+    "LOCK TABLE borrows IN SHARE MODE",
+    """
+    CREATE TABLE IF NOT EXISTS book_borrow_counters (
+        book_id INTEGER NOT NULL REFERENCES books (id) ON DELETE CASCADE,
+        total_borrows INTEGER DEFAULT '0' NOT NULL,
+        active_borrows INTEGER DEFAULT '0' NOT NULL,
+        PRIMARY KEY (book_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_book_borrow_counters_total_borrows
+    ON book_borrow_counters (total_borrows, book_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reader_borrow_counters (
+        reader_name VARCHAR(50) NOT NULL,
+        total_borrows INTEGER DEFAULT '0' NOT NULL,
+        active_borrows INTEGER DEFAULT '0' NOT NULL,
+        PRIMARY KEY (reader_name)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_reader_borrow_counters_active_borrows
+    ON reader_borrow_counters (active_borrows, reader_name)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS daily_borrow_counters (
+        day DATE NOT NULL,
+        stripe SMALLINT NOT NULL,
+        borrows INTEGER DEFAULT '0' NOT NULL,
+        returns INTEGER DEFAULT '0' NOT NULL,
+        PRIMARY KEY (day, stripe)
+    )
+    """,
+    """
+    INSERT INTO book_borrow_counters (book_id, total_borrows, active_borrows)
+    SELECT book_id, count(*), count(*) FILTER (WHERE return_date IS NULL)
+    FROM borrows
+    GROUP BY book_id
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO reader_borrow_counters (reader_name, total_borrows, active_borrows)
+    SELECT reader_name, count(*), count(*) FILTER (WHERE return_date IS NULL)
+    FROM borrows
+    GROUP BY reader_name
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO daily_borrow_counters (day, stripe, borrows, returns)
+    SELECT day, stripe, sum(borrows), sum(returns)
+    FROM (
+        SELECT borrow_date::date AS day, book_id % 16 AS stripe, 1 AS borrows, 0 AS returns FROM borrows
+        UNION ALL
+        SELECT return_date::date, book_id % 16, 0, 1 FROM borrows WHERE return_date IS NOT NULL
+    ) AS events
+    GROUP BY day, stripe
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS author_utilisation AS
+    SELECT
+        authors.id AS author_id,
+        count(books.id) AS books,
+        coalesce(sum(books.available), 0) AS available,
+        coalesce(sum(book_borrow_counters.active_borrows), 0) AS active_borrows,
+        coalesce(sum(book_borrow_counters.total_borrows), 0) AS total_borrows,
+        coalesce(
+            sum(book_borrow_counters.active_borrows)::float
+            / nullif(coalesce(sum(books.available), 0) + coalesce(sum(book_borrow_counters.active_borrows), 0), 0),
+            0
+        ) AS utilisation
+    FROM authors
+    LEFT JOIN books ON books.author_id = authors.id
+    LEFT JOIN book_borrow_counters ON book_borrow_counters.book_id = books.id
+    GROUP BY authors.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_author_utilisation_author_id ON author_utilisation (author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_author_utilisation_utilisation ON author_utilisation (utilisation, author_id)",
+]
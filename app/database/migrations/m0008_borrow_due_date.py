@@ -0,0 +1,10 @@
+"""
+Срок возврата выдачи и отметка о просрочке. Срок возврата существующих выдач - 14 дней от даты выдачи.
+"""
+
+statements = [
+    "ALTER TABLE borrows ADD COLUMN IF NOT EXISTS due_date TIMESTAMP WITHOUT TIME ZONE",
+    "ALTER TABLE borrows ADD COLUMN IF NOT EXISTS overdue_at TIMESTAMP WITHOUT TIME ZONE",
+    "UPDATE borrows SET due_date = borrow_date + interval '14 days' WHERE due_date IS NULL",
+    "ALTER TABLE borrows ALTER COLUMN due_date SET NOT NULL",
+]
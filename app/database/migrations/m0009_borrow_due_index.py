@@ -0,0 +1,10 @@
+"""
+Частичный индекс открытых выдач по сроку возврата: ix_borrows_due (due_date, id) WHERE return_date IS NULL.
+Используется проверкой просроченных выдач и списком /borrows/overdue.
+"""
+
+transactional = False
+
+statements = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_borrows_due ON borrows (due_date, id) WHERE return_date IS NULL",
+]
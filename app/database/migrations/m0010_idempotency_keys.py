@@ -0,0 +1,18 @@
+"""
+Ключи идемпотентности запросов создания: idempotency_keys с ответом на запрос и сроком хранения.
+"""
+
+statements = [
+    """
+    CREATE TABLE IF NOT EXISTS idempotency_keys (
+        scope VARCHAR(50) NOT NULL,
+        key VARCHAR(255) NOT NULL,
+        request_hash VARCHAR(64) NOT NULL,
+        status_code SMALLINT,
+        response BYTEA,
+        expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (scope, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_idempotency_keys_expires_at ON idempotency_keys (expires_at)",
+]
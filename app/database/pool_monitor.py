@@ -0,0 +1,116 @@
+import time
+from bisect import bisect_left
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+WAIT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMonitor:
+    """
+    Статистика пула соединений, собираемая по событиям SQLAlchemy.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Верхние границы корзин гистограммы ожидания соединения, в секундах.
+        wait_counts (List[int]): Количество ожиданий в каждой корзине, последняя корзина - выше всех границ.
+        wait_sum (float): Суммарное время ожидания соединения.
+        checkouts (int): Количество выдач соединений из пула.
+        connects (int): Количество открытых соединений с базой данных.
+        invalidations (int): Количество соединений, признанных недействительными.
+        timeouts (int): Количество запросов, не дождавшихся соединения за pool_timeout.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.wait_counts = [0] * (len(buckets) + 1)
+        self.wait_sum = 0.0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+
+    def attach(self, pool: Pool) -> None:
+        """
+        Подписывается на события пула. Подписки переносятся SQLAlchemy на пул, пересозданный после dispose.
+
+        Args:
+            pool (Pool): Пул соединений движка.
+        """
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        if isinstance(pool, MonitoredQueuePool):
+            pool.monitor = self
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_counts[bisect_left(self.buckets, seconds)] += 1
+        self.wait_sum += seconds
+
+    def observe_timeout(self) -> None:
+        self.timeouts += 1
+
+    def stats(self, pool: Pool) -> dict:
+        """
+        Возвращает текущее состояние пула и накопленную статистику.
+
+        Args:
+            pool (Pool): Пул соединений движка.
+
+        Returns:
+            dict: Статистика пула.
+        """
+        is_queue_pool = isinstance(pool, AsyncAdaptedQueuePool)
+        cumulative, buckets = 0, []
+        for upper_bound, count in zip(self.buckets, self.wait_counts):
+            cumulative += count
+            buckets.append({"le": upper_bound, "count": cumulative})
+        return {
+            "size": pool.size() if is_queue_pool else 0,
+            "checked_in": pool.checkedin() if is_queue_pool else 0,
+            "checked_out": pool.checkedout() if is_queue_pool else 0,
+            "overflow": max(pool.overflow(), 0) if is_queue_pool else 0,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait": {"count": sum(self.wait_counts), "sum": self.wait_sum, "buckets": buckets},
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.invalidations += 1
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, измеряющий время ожидания свободного соединения.
+    У SQLAlchemy нет события начала ожидания, поэтому время снимается вокруг получения записи из очереди пула,
+    а результат передается в PoolMonitor.
+    """
+
+    monitor: PoolMonitor | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.monitor is not None:
+                self.monitor.observe_timeout()
+            raise
+        finally:
+            if self.monitor is not None:
+                self.monitor.observe_wait(time.perf_counter() - start)
+
+    def recreate(self) -> "MonitoredQueuePool":
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
@@ -0,0 +1,133 @@
+import asyncio
+from itertools import count
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.log_config import logger
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    """
+    Реплика базы данных для запросов на чтение.
+
+    Attributes:
+        engine (AsyncEngine): Движок реплики.
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий реплики.
+        healthy (bool): Участвует ли реплика в ротации.
+        lag (float | None): Отставание реплики по последней проверке, в секундах.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            info={"replica": True, "read_only": True},
+        )
+        self.healthy = False
+        self.lag: float | None = None
+
+    async def check(self, max_lag: float, timeout: float) -> None:
+        """
+        Проверяет доступность и отставание реплики, по результату включает или исключает ее из ротации.
+
+        Args:
+            max_lag (float): Допустимое отставание, в секундах.
+            timeout (float): Время ожидания ответа реплики, в секундах.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    self.lag = float(await conn.scalar(REPLICA_LAG_QUERY))
+        except Exception as exc:
+            if self.healthy:
+                logger.error("Replica %s is unavailable: %s", self.engine.url, exc)
+            self.healthy, self.lag = False, None
+            return
+
+        healthy = self.lag <= max_lag
+        if self.healthy and not healthy:
+            logger.error("Replica %s lags behind by %.1f s", self.engine.url, self.lag)
+        self.healthy = healthy
+
+
+class ReplicaSet:
+    """
+    Набор реплик с проверкой состояния в фоне и циклическим выбором реплики для чтения.
+    Реплики, которые недоступны или отстают больше max_lag, исключаются из ротации до следующей успешной проверки.
+
+    Attributes:
+        replicas (List[Replica]): Реплики базы данных.
+        max_lag (float): Допустимое отставание реплики, в секундах.
+        check_interval (float): Интервал проверки реплик, в секундах.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], max_lag: float, check_interval: float) -> None:
+        self.replicas = [Replica(engine=engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = count()
+        self._task: asyncio.Task | None = None
+
+    def choose(self) -> Replica | None:
+        """
+        Выбирает следующую исправную реплику.
+
+        Returns:
+            Replica | None: Реплика или None, если исправных реплик нет.
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def check(self) -> None:
+        await asyncio.gather(
+            *(replica.check(max_lag=self.max_lag, timeout=self.check_interval) for replica in self.replicas)
+        )
+
+    async def start(self) -> None:
+        """
+        Проверяет реплики и запускает их периодическую проверку.
+        """
+        if not self.replicas or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def dispose(self) -> None:
+        await self.stop()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag": replica.lag,
+            }
+            for replica in self.replicas
+        ]
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
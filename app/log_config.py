@@ -10,3 +10,7 @@ formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 
 logger.addHandler(handler)
+
+sql_logger = logging.getLogger(f"{__name__}.sql")
+
+sql_logger.setLevel(logging.WARNING)
@@ -3,21 +3,47 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 
+from app.api.admission import AdmissionMiddleware, admission_controller
 from app.api.authors.routes import router as authors_router
 from app.api.books.routes import router as books_router
 from app.api.borrows.routes import router as borrows_router
+from app.api.metrics.routes import router as metrics_router
+from app.api.stats.routes import router as stats_router
+from app.api.system.routes import router as system_router
+from app.config import settings
 from app.database.db import db
+from app.monitoring.middleware import MetricsMiddleware
+from app.tasks.idempotency import idempotency_purger
+from app.tasks.overdue import overdue_task
+from app.tasks.stats import stats_refresher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await db.create_tables()
+    await db.start()
+    stats_refresher.start()
+    overdue_task.start()
+    idempotency_purger.start()
     yield
+    await idempotency_purger.stop()
+    await overdue_task.stop()
+    await stats_refresher.stop()
     await db.dispose()
 
 
 main_app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+if settings.admission.enabled:
+    main_app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        retry_after=settings.admission.retry_after,
+        exempt_prefixes=settings.admission.exempt_prefixes,
+    )
+main_app.add_middleware(MetricsMiddleware)
 
 main_app.include_router(router=authors_router, prefix="/authors")
 main_app.include_router(router=books_router, prefix="/books")
 main_app.include_router(router=borrows_router, prefix="/borrows")
+main_app.include_router(router=stats_router, prefix="/stats")
+main_app.include_router(router=system_router, prefix="/system")
+main_app.include_router(router=metrics_router)
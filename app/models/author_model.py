@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, String, UniqueConstraint
+from sqlalchemy import Computed, Date, Index, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -17,16 +18,26 @@ class Author(Base):
         first_name (str): Имя автора.
         last_name (str): Фамилия автора.
         birth_date (Date): Дата рождения автора.
+        search_vector (str | None): Поисковый вектор по имени и фамилии, вычисляется базой данных.
         books (list[Book]): Книги, связанные с автором.
     """
 
     first_name: Mapped[str] = mapped_column(String(50))
     last_name: Mapped[str] = mapped_column(String(50))
     birth_date: Mapped[Date] = mapped_column(Date)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', first_name || ' ' || last_name)", persisted=True),
+        deferred=True,
+        info={"search_config": "simple"},
+    )
 
     books: Mapped[list["Book"]] = relationship("Book", back_populates="author", cascade="all, delete-orphan")
 
-    __table_args__ = (UniqueConstraint("first_name", "last_name", "birth_date"),)
+    __table_args__ = (
+        UniqueConstraint("first_name", "last_name", "birth_date"),
+        Index("ix_authors_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
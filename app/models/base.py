@@ -4,6 +4,11 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 class Base(DeclarativeBase):
     """
     Базовый класс для моделей базы данных.
+
+    Attributes:
+        id (int): Идентификатор записи.
+        version (int): Версия записи, увеличивается при каждом изменении.
+            Используется для оптимистичной блокировки и как валидатор ETag.
     """
 
     __abstract__ = True
@@ -13,3 +18,8 @@ class Base(DeclarativeBase):
         return f"{cls.__name__.lower()}s"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(server_default="1")
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:
+        return {"version_id_col": cls.__table__.c.version}
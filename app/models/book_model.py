@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import DDL, ForeignKey, Index, Integer, String, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -19,19 +20,65 @@ class Book(Base):
         description (str): Описание книги.
         author_id (int): Идентификатор автора.
         available (int): Количество доступных экземпляров книги.
+        search_vector (str | None): Поисковый вектор по названию, имени автора и описанию,
+            заполняется триггером базы данных.
         author (Author): Автор, связанный с книгой.
         borrows (list[Borrow]): Выдачи, связанные с книгой.
     """
 
     title: Mapped[str] = mapped_column(String(50))
     description: Mapped[str] = mapped_column(String(500))
-    author_id: Mapped[int] = mapped_column(Integer, ForeignKey("authors.id"))
+    author_id: Mapped[int] = mapped_column(Integer, ForeignKey("authors.id"), index=True)
     available: Mapped[int]
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, deferred=True, info={"search_config": "russian"})
 
     author: Mapped["Author"] = relationship("Author", back_populates="books")
     borrows: Mapped[list["Borrow"]] = relationship("Borrow", back_populates="book", cascade="all, delete-orphan")
 
-    __table_args__ = (UniqueConstraint("title", "author_id"),)
+    __table_args__ = (
+        UniqueConstraint("title", "author_id"),
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     def __str__(self):
         return self.title
+
+
+BOOKS_SEARCH_VECTOR_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('russian', NEW.title), 'A')
+            || setweight(to_tsvector('russian', coalesce(
+                (SELECT first_name || ' ' || last_name FROM authors WHERE id = NEW.author_id), ''
+            )), 'B')
+            || setweight(to_tsvector('russian', NEW.description), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER books_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, description, author_id ON books
+    FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION authors_books_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE books SET author_id = author_id WHERE author_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER authors_books_search_vector_update
+    AFTER UPDATE OF first_name, last_name ON authors
+    FOR EACH ROW
+    WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+    EXECUTE FUNCTION authors_books_search_vector_update()
+    """,
+]
+
+for statement in BOOKS_SEARCH_VECTOR_TRIGGERS:
+    event.listen(Book.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
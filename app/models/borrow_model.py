@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -19,12 +19,22 @@ class Borrow(Base):
         reader_name (str): Имя читателя.
         borrow_date (datetime): Дата взятия книги.
         return_date (datetime | None): Дата возврата книги.
+        due_date (datetime): Срок возврата книги.
+        overdue_at (datetime | None): Время, когда фоновая проверка отметила выдачу просроченной.
         book (Book): Книга, связанная с выдачей.
     """
 
-    book_id: Mapped[int] = mapped_column(Integer, ForeignKey("books.id"))
-    reader_name: Mapped[str] = mapped_column(String(50))
+    book_id: Mapped[int] = mapped_column(Integer, ForeignKey("books.id"), index=True)
+    reader_name: Mapped[str] = mapped_column(String(50), index=True)
     borrow_date: Mapped[datetime] = mapped_column(DateTime(), server_default=func.now())
     return_date: Mapped[datetime | None]
+    due_date: Mapped[datetime] = mapped_column(DateTime())
+    overdue_at: Mapped[datetime | None]
 
     book: Mapped["Book"] = relationship("Book", back_populates="borrows")
+
+    __table_args__ = (
+        Index("ix_borrows_open", "book_id", postgresql_where=text("return_date IS NULL")),
+        Index("ix_borrows_borrow_date", "borrow_date", "id"),
+        Index("ix_borrows_due", "due_date", "id", postgresql_where=text("return_date IS NULL")),
+    )
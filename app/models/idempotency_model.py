@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Index, LargeBinary, SmallInteger, String, Table
+
+from app.models.base import Base
+
+# Ответы на запросы создания с заголовком Idempotency-Key. Ключ записывается в той же транзакции,
+# что и созданная запись, поэтому повтор запроса получает сохраненный ответ, а не создает запись заново.
+# Ключи с истекшим сроком удаляются периодической задачей.
+idempotency_keys = Table(
+    "idempotency_keys",
+    Base.metadata,
+    Column("scope", String(50), primary_key=True),
+    Column("key", String(255), primary_key=True),
+    Column("request_hash", String(64), nullable=False),
+    Column("status_code", SmallInteger),
+    Column("response", LargeBinary),
+    Column("expires_at", DateTime(), nullable=False),
+    Index("ix_idempotency_keys_expires_at", "expires_at"),
+)
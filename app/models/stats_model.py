@@ -0,0 +1,97 @@
+from sqlalchemy import (
+    DDL,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Table,
+    column,
+    event,
+    table,
+)
+
+from app.models.base import Base
+
+STRIPES = 16
+
+# Счетчики статистики выдач. Обновляются в том же запросе, что и выдача или возврат книги,
+# поэтому чтение статистики не требует агрегации по таблице выдач.
+
+# Выдачи книги: всего и открытые.
+book_borrow_counters = Table(
+    "book_borrow_counters",
+    Base.metadata,
+    Column("book_id", Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True),
+    Column("total_borrows", Integer, nullable=False, server_default="0"),
+    Column("active_borrows", Integer, nullable=False, server_default="0"),
+    Index("ix_book_borrow_counters_total_borrows", "total_borrows", "book_id"),
+)
+
+# Выдачи читателя: всего и открытые.
+reader_borrow_counters = Table(
+    "reader_borrow_counters",
+    Base.metadata,
+    Column("reader_name", String(50), primary_key=True),
+    Column("total_borrows", Integer, nullable=False, server_default="0"),
+    Column("active_borrows", Integer, nullable=False, server_default="0"),
+    Index("ix_reader_borrow_counters_active_borrows", "active_borrows", "reader_name"),
+)
+
+# Выдачи и возвраты по дням. Счетчик дня разбит на STRIPES строк по book_id % STRIPES,
+# иначе все выдачи за день ждали бы блокировку одной строки.
+daily_borrow_counters = Table(
+    "daily_borrow_counters",
+    Base.metadata,
+    Column("day", Date, primary_key=True),
+    Column("stripe", SmallInteger, primary_key=True),
+    Column("borrows", Integer, nullable=False, server_default="0"),
+    Column("returns", Integer, nullable=False, server_default="0"),
+)
+
+# Загруженность фонда авторов: доля выданных экземпляров от всех экземпляров книг автора.
+# Зависит от количества экземпляров, которое меняется не только при выдачах, поэтому считается
+# материализованным представлением, которое периодически обновляется CONCURRENTLY.
+author_utilisation = table(
+    "author_utilisation",
+    column("author_id", Integer),
+    column("books", Integer),
+    column("available", Integer),
+    column("active_borrows", Integer),
+    column("total_borrows", Integer),
+    column("utilisation", Float),
+)
+
+AUTHOR_UTILISATION_VIEW = [
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS author_utilisation AS
+    SELECT
+        authors.id AS author_id,
+        count(books.id) AS books,
+        coalesce(sum(books.available), 0) AS available,
+        coalesce(sum(book_borrow_counters.active_borrows), 0) AS active_borrows,
+        coalesce(sum(book_borrow_counters.total_borrows), 0) AS total_borrows,
+        coalesce(
+            sum(book_borrow_counters.active_borrows)::float
+            / nullif(coalesce(sum(books.available), 0) + coalesce(sum(book_borrow_counters.active_borrows), 0), 0),
+            0
+        ) AS utilisation
+    FROM authors
+    LEFT JOIN books ON books.author_id = authors.id
+    LEFT JOIN book_borrow_counters ON book_borrow_counters.book_id = books.id
+    GROUP BY authors.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_author_utilisation_author_id ON author_utilisation (author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_author_utilisation_utilisation ON author_utilisation (utilisation, author_id)",
+]
+
+for statement in AUTHOR_UTILISATION_VIEW:
+    event.listen(book_borrow_counters, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    book_borrow_counters,
+    "before_drop",
+    DDL("DROP MATERIALIZED VIEW IF EXISTS author_utilisation").execute_if(dialect="postgresql"),
+)
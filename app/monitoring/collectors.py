@@ -0,0 +1,33 @@
+from typing import List
+
+from app.database.db import db
+from app.monitoring.metrics import Counter, Gauge, Histogram, Metric, registry
+
+
+def pool_metrics() -> List[Metric]:
+    """
+    Метрики пула соединений основной базы данных по данным PoolMonitor.
+
+    Returns:
+        List[Metric]: Метрики пула.
+    """
+    stats = db.pool_stats()
+    metrics: List[Metric] = []
+    for name in ("size", "checked_out", "overflow"):
+        gauge = Gauge(f"db_pool_{name}", f"Пул соединений: {name}.")
+        gauge.set(stats[name])
+        metrics.append(gauge)
+    for name in ("checkouts", "connects", "invalidations", "timeouts"):
+        counter = Counter(f"db_pool_{name}_total", f"Пул соединений: {name}.")
+        counter.inc(stats[name])
+        metrics.append(counter)
+
+    wait = Histogram("db_pool_wait_seconds", "Время ожидания соединения из пула, в секундах.")
+    wait.buckets = db.pool_monitor.buckets
+    wait.counts[()] = list(db.pool_monitor.wait_counts)
+    wait.sums[()] = db.pool_monitor.wait_sum
+    metrics.append(wait)
+    return metrics
+
+
+registry.register_collector(pool_metrics)
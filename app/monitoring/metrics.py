@@ -0,0 +1,218 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """
+    Форматирует метки образца в текстовом формате Prometheus.
+
+    Args:
+        names (Iterable[str]): Названия меток.
+        values (Iterable[str]): Значения меток.
+
+    Returns:
+        str: Метки вида {name="value",...} или пустая строка.
+    """
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Метрика с набором меток в текстовом формате Prometheus.
+
+    Attributes:
+        name (str): Название метрики.
+        documentation (str): Описание метрики.
+        labelnames (Tuple[str, ...]): Названия меток.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return lines
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """
+    Гистограмма с накопительными корзинами, как в клиентах Prometheus.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Верхние границы корзин.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Labels = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        self.counts: Dict[Labels, List[int]] = {}
+        self.sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = self.counts[key] = [0] * (len(self.buckets) + 1)
+            self.sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[key] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = format_labels(self.labelnames + ("le",), key + (format_value(upper_bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(self.sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса. Метрики, значения которых хранятся вне реестра (например, статистика пула),
+    добавляются коллекторами, которые вызываются при каждом чтении /metrics.
+
+    Attributes:
+        metrics (List[Metric]): Зарегистрированные метрики.
+        collectors (List[Callable[[], Iterable[Metric]]]): Коллекторы метрик.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Возвращает все метрики в текстовом формате Prometheus 0.0.4.
+
+        Returns:
+            str: Текст для ответа /metrics.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(
+    Counter("http_requests_total", "Количество обработанных запросов.", ("method", "route", "status"))
+)
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram("http_request_duration_seconds", "Время обработки запроса, в секундах.", ("method", "route"))
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "Количество запросов, обрабатываемых в данный момент.")
+)
+HTTP_REQUESTS_IN_FLIGHT.set(0)
+DB_STATEMENTS_PER_REQUEST = registry.register(
+    Histogram(
+        "db_statements_per_request",
+        "Количество SQL-выражений, выполненных за запрос.",
+        ("method", "route"),
+        buckets=STATEMENT_BUCKETS,
+    )
+)
+DB_TIME_PER_REQUEST = registry.register(
+    Histogram(
+        "db_time_per_request_seconds", "Время выполнения SQL-выражений за запрос, в секундах.", ("method", "route")
+    )
+)
+SLOW_STATEMENTS = registry.register(
+    Counter("db_slow_statements_total", "Количество SQL-выражений дольше порога медленного запроса.", ("route",))
+)
+REPEATED_STATEMENTS = registry.register(
+    Counter("db_repeated_statement_requests_total", "Количество запросов с признаками N+1.", ("route",))
+)
+ADMISSION_QUEUE_DEPTH = registry.register(
+    Gauge("admission_queue_depth", "Количество запросов в очереди допуска.", ("priority",))
+)
+ADMISSION_WAIT = registry.register(
+    Histogram("admission_wait_seconds", "Время ожидания допуска запроса, в секундах.", ("priority",))
+)
+ADMISSION_REJECTED = registry.register(
+    Counter("admission_rejected_total", "Количество запросов, отклоненных с 503.", ("priority", "reason"))
+)
+SINGLE_FLIGHT_CALLS = registry.register(
+    Counter(
+        "single_flight_calls_total",
+        "Количество чтений через single-flight: leader - запрос к базе данных, follower - объединенный с ним вызов.",
+        ("key", "role"),
+    )
+)
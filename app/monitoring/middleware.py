@@ -0,0 +1,53 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.monitoring.metrics import (
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+)
+from app.monitoring.request_context import RequestContext, request_context
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware метрик запросов: время обработки и статусы по маршрутам, запросы в обработке,
+    количество и время SQL-выражений за запрос. Маршрут берется из шаблона пути, а не из URL,
+    поэтому количество меток не растет с количеством записей.
+    Запрос считается завершенным после отправки тела ответа, в том числе потокового.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(scope)
+        token = request_context.set(context)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            request_context.reset(token)
+            labels = {"method": context.method, "route": context.route}
+            HTTP_REQUESTS.inc(**labels, status=str(status_code))
+            HTTP_REQUEST_DURATION.observe(elapsed, **labels)
+            DB_STATEMENTS_PER_REQUEST.observe(context.statements, **labels)
+            DB_TIME_PER_REQUEST.observe(context.db_time, **labels)
@@ -0,0 +1,56 @@
+from contextvars import ContextVar
+from typing import Dict
+
+from starlette.types import Scope
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestContext:
+    """
+    Состояние обрабатываемого запроса, доступное из событий SQLAlchemy.
+    Хранится в ContextVar: задачи, созданные при обработке запроса, получают ссылку на тот же объект.
+
+    Attributes:
+        scope (Scope): ASGI scope запроса.
+        statements (int): Количество выполненных SQL-выражений.
+        db_time (float): Время выполнения SQL-выражений, в секундах.
+        statement_counts (Dict[str, int]): Количество выполнений по форме SQL-выражения.
+    """
+
+    def __init__(self, scope: Scope) -> None:
+        self.scope = scope
+        self.statements = 0
+        self.db_time = 0.0
+        self.statement_counts: Dict[str, int] = {}
+
+    @property
+    def method(self) -> str:
+        return self.scope.get("method", "")
+
+    @property
+    def route(self) -> str:
+        """
+        Шаблон пути маршрута, например /books/{book_id}. Известен после выбора маршрута роутером.
+        """
+        route = self.scope.get("route")
+        return getattr(route, "path", UNMATCHED_ROUTE)
+
+    def observe_statement(self, shape: str, seconds: float) -> int:
+        """
+        Учитывает выполненное SQL-выражение.
+
+        Args:
+            shape (str): Форма выражения, см. statement_shape.
+            seconds (float): Время выполнения.
+
+        Returns:
+            int: Сколько раз выражение этой формы выполнено за запрос.
+        """
+        self.statements += 1
+        self.db_time += seconds
+        count = self.statement_counts[shape] = self.statement_counts.get(shape, 0) + 1
+        return count
+
+
+request_context: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
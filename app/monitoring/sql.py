@@ -0,0 +1,72 @@
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.log_config import sql_logger
+from app.monitoring.metrics import REPEATED_STATEMENTS, SLOW_STATEMENTS
+from app.monitoring.request_context import request_context
+
+STATEMENT_STARTS = "statement_starts"
+NO_ROUTE = "-"
+
+PARAMETERS = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?")
+PARAMETER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Форма SQL-выражения: выражения, отличающиеся только параметрами и длиной списков IN, совпадают.
+
+    Args:
+        statement (str): SQL-выражение.
+
+    Returns:
+        str: Форма выражения.
+    """
+    shape = PARAMETERS.sub("?", statement)
+    shape = PARAMETER_LISTS.sub("(?, ...)", shape)
+    return WHITESPACE.sub(" ", shape).strip()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Подписывается на выполнение SQL-выражений движка: учитывает их в контексте текущего запроса,
+    записывает в лог медленные выражения и повторяющиеся в одном запросе выражения (N+1).
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(STATEMENT_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info[STATEMENT_STARTS].pop()
+    current = request_context.get()
+    route = current.route if current is not None else NO_ROUTE
+    shape = statement_shape(statement)
+
+    if elapsed >= settings.monitoring.slow_query_threshold:
+        SLOW_STATEMENTS.inc(route=route)
+        sql_logger.warning("Slow query %.3f s in %s: %s", elapsed, route, shape)
+
+    if current is None:
+        return
+    count = current.observe_statement(shape, elapsed)
+    if count == settings.monitoring.repeated_statement_limit + 1:
+        REPEATED_STATEMENTS.inc(route=route)
+        sql_logger.warning(
+            "Possible N+1 in %s %s: statement executed more than %d times: %s",
+            current.method,
+            route,
+            settings.monitoring.repeated_statement_limit,
+            shape,
+        )
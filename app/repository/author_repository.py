@@ -1,10 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.author_model import Author
-from app.repository.base_repository import BaseRepository, DeleterRepository
+from app.repository.base_repository import BaseRepository, DeleterRepository, SearcherRepository
 
 
-class AuthorRepository(BaseRepository, DeleterRepository):
+class AuthorRepository(BaseRepository, DeleterRepository, SearcherRepository):
     """
     Репозиторий для операций с авторами.
 
@@ -1,14 +1,43 @@
-from typing import List, Type, TypeVar
+import operator
+from typing import Any, Awaitable, Callable, Iterable, List, Sequence, Set, Tuple, Type, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Row,
+    Select,
+    UniqueConstraint,
+    case,
+    cast,
+    func,
+    inspect,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Load, make_transient_to_detached, selectinload
+from sqlalchemy.orm.util import identity_key
 
+from app.cache.entity_cache import column_values, entity_cache
 from app.models.base import Base
+from app.repository.entity_loader import EntityLoader, id_in
 from app.repository.repository_errors import crud_error_handler
+from app.repository.single_flight import identity, single_flight
 
 DB = TypeVar("DB", bound=Base)
 P = TypeVar("P", bound=BaseModel)
+T = TypeVar("T")
+
+FILTER_OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "isnull": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
 
 
 class BaseRepository:
@@ -25,37 +54,302 @@ class BaseRepository:
         self.model = model
 
     @crud_error_handler
-    async def get_one(self, obj_id: int) -> DB | None:
+    async def get_one(self, obj_id: int, use_cache: bool = False) -> DB | None:
         """
         Получение одной записи из базы данных по идентификатору.
+        Конкурентные вызовы в одной сессии объединяются EntityLoader в один запрос, в сессиях только
+        для чтения одинаковые конкурентные вызовы разных запросов объединяются single_flight.
+        Прочитанная из основной базы данных запись сохраняется в кэш. Записи, прочитанные с реплики,
+        в кэш не попадают: отстающая реплика может вернуть в кэш версию, которую только что инвалидировали.
 
         Args:
             obj_id (int): Идентификатор записи.
+            use_cache (bool): Вернуть запись из кэша, если она там есть.
 
         Returns:
             DB: Объект из базы данных.
         """
-        return await self.session.get(self.model, obj_id)
+        if use_cache and identity_key(self.model, obj_id) not in self.session.identity_map:
+            cached_values = await entity_cache.get(self.model, obj_id)
+            if cached_values is not None:
+                return await self._merge_cached(cached_values)
+
+        obj_db, leader = await self._single_flight(
+            "get_one",
+            (obj_id,),
+            lambda: EntityLoader.for_session(self.session).load(self.model, obj_id),
+            share=lambda obj_db: column_values(obj_db) if obj_db is not None else None,
+        )
+        if not leader:
+            return await self._merge_cached(obj_db) if obj_db is not None else None
+        if obj_db is not None and not self.session.info.get("replica"):
+            await entity_cache.set(obj_db)
+        return obj_db
+
+    async def _single_flight(
+        self, operation: str, params: tuple, call: Callable[[], Awaitable[T]], share: Callable[[T], Any] = identity
+    ) -> Tuple[Any, bool]:
+        """
+        Выполняет чтение через single_flight, если сессия только для чтения. В сессии, которая изменяет
+        данные, чтение должно видеть изменения своей транзакции, поэтому оно выполняется без объединения.
+
+        Args:
+            operation (str): Название операции.
+            params (tuple): Параметры чтения, входят в ключ вместе с движком и моделью.
+            call (Callable[[], Awaitable[T]]): Чтение в сессии репозитория.
+            share (Callable[[T], Any]): Преобразование результата для объединенных вызовов, см. SingleFlight.do.
+
+        Returns:
+            Tuple[Any, bool]: Результат и признак того, что чтение выполнено в сессии репозитория.
+        """
+        if not self.session.info.get("read_only"):
+            return await call(), True
+        name = f"{self.model.__tablename__}.{operation}"
+        return await single_flight.do(name, (self.session.bind, name, *params), call, share=share)
 
     @crud_error_handler
-    async def get_all(self) -> List[DB]:
+    async def load_expansions(self, obj_db: DB, expand: Iterable[str]) -> DB:
         """
-        Получение всех объектов из базы данных.
+        Загрузка связей уже полученной записи, в том числе записи из кэша.
+
+        Args:
+            obj_db (DB): Объект из базы данных.
+            expand (Iterable[str]): Связи для загрузки, см. _load_options.
+
+        Returns:
+            DB: Объект с загруженными связями.
+        """
+        stmt = select(self.model).where(self.model.id == obj_db.id).options(*self._load_options(expand))
+        await self.session.scalars(stmt)
+        return obj_db
+
+    def _load_options(self, expand: Iterable[str]) -> List[Load]:
+        """
+        Преобразует пути связей вида "book" или "book.author" в опции selectinload.
+        Каждый уровень связей загружается одним запросом с IN по ключам всей страницы.
+
+        Args:
+            expand (Iterable[str]): Пути связей.
+
+        Returns:
+            List[Load]: Опции загрузки.
+
+        Raises:
+            ValueError: Если связь не существует.
+        """
+        options = []
+        for path in expand:
+            model, loader = self.model, None
+            for name in path.split("."):
+                relationship = inspect(model).relationships.get(name)
+                if relationship is None:
+                    raise ValueError(f"Unsupported expand {path}")
+                attribute = getattr(model, name)
+                loader = selectinload(attribute) if loader is None else loader.selectinload(attribute)
+                model = relationship.mapper.class_
+            options.append(loader)
+        return options
+
+    async def _merge_cached(self, values: dict) -> DB:
+        """
+        Присоединение записи из кэша к сессии без запроса к базе данных.
+
+        Args:
+            values (dict): Значения колонок записи.
+
+        Returns:
+            DB: Объект, присоединенный к сессии.
+        """
+        obj_db = self.model(**values)
+        make_transient_to_detached(obj_db)
+        return await self.session.merge(obj_db, load=False)
+
+    @crud_error_handler
+    async def get_all(
+        self,
+        limit: int,
+        after: int | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+        expand: Iterable[str] = (),
+    ) -> List[DB]:
+        """
+        Получение страницы объектов из базы данных (keyset пагинация).
+
+        Args:
+            limit (int): Максимальное количество объектов.
+            after (int | None): Идентификатор последнего объекта предыдущей страницы.
+            filters (dict | None): Фильтры вида {"поле__оператор": значение}, см. _filter_clauses.
+            sort (str | None): Поле сортировки, с префиксом "-" для сортировки по убыванию. По умолчанию id.
+            expand (Iterable[str]): Связи для загрузки вместе со страницей, см. _load_options.
 
         Returns:
             List[DB]: Список объектов из базы данных.
         """
-        stmt = select(self.model).order_by(self.model.id)
-        obj_db = await self.session.scalars(stmt)
-        return list(obj_db)
+        stmt = self._page_query(select(self.model), after=after, filters=filters, sort=sort).limit(limit)
+        if expand:
+            return list(await self.session.scalars(stmt.options(*self._load_options(expand))))
+
+        async def load_page() -> List[DB]:
+            return list(await self.session.scalars(stmt))
+
+        objs_db, leader = await self._single_flight(
+            "get_all",
+            (limit, after, self._filters_key(filters), sort),
+            load_page,
+            share=lambda objs_db: [column_values(obj_db) for obj_db in objs_db],
+        )
+        if leader:
+            return objs_db
+        return [await self._merge_cached(values) for values in objs_db]
+
+    @crud_error_handler
+    async def get_all_rows(
+        self,
+        columns: Iterable[str],
+        limit: int,
+        after: int | None = None,
+        filters: dict | None = None,
+        sort: str | None = None,
+    ) -> Sequence[Row]:
+        """
+        Получение страницы кортежей колонок без создания объектов модели (keyset пагинация, как в get_all).
+
+        Args:
+            columns (Iterable[str]): Названия колонок модели.
+            limit (int): Максимальное количество строк.
+            after (int | None): Идентификатор последней записи предыдущей страницы.
+            filters (dict | None): Фильтры, см. _filter_clauses.
+            sort (str | None): Сортировка, см. get_all.
+
+        Returns:
+            Sequence[Row]: Строки со значениями колонок в порядке columns.
+        """
+        columns = tuple(columns)
+        table_columns = self.model.__table__.c
+        stmt = self._page_query(
+            select(*(table_columns[column] for column in columns)), after=after, filters=filters, sort=sort
+        )
+
+        async def load_rows() -> Sequence[Row]:
+            return (await self.session.execute(stmt.limit(limit))).all()
+
+        rows, _ = await self._single_flight(
+            "get_all_rows", (columns, limit, after, self._filters_key(filters), sort), load_rows
+        )
+        return rows
 
     @crud_error_handler
-    async def create(self, obj_in: P) -> DB:
+    async def get_page_version(
+        self, limit: int, after: int | None = None, filters: dict | None = None, sort: str | None = None
+    ) -> Tuple[int, int, int, int | None]:
+        """
+        Получение валидатора страницы без чтения самих записей: количество записей, сумма их версий,
+        сумма их идентификаторов и курсор следующей страницы.
+        Значения совпадают с рассчитанными по странице, которую вернет get_all(limit + 1, ...).
+
+        Args:
+            limit (int): Количество записей на странице.
+            after (int | None): Идентификатор последнего объекта предыдущей страницы.
+            filters (dict | None): Фильтры страницы.
+            sort (str | None): Сортировка страницы.
+
+        Returns:
+            Tuple[int, int, int, int | None]: Количество, сумма версий, сумма ID, курсор следующей страницы.
+        """
+        position = func.row_number().over(order_by=self._order_by(sort)).label("position")
+        window = self._page_query(
+            select(self.model.id, self.model.version, position), after=after, filters=filters, sort=sort
+        )
+        window = window.limit(limit + 1).subquery()
+
+        in_page = window.c.position <= limit
+        stmt = select(
+            func.count().filter(in_page),
+            func.coalesce(func.sum(window.c.version).filter(in_page), 0),
+            func.coalesce(func.sum(window.c.id).filter(in_page), 0),
+            case((func.count() > limit, func.max(window.c.id).filter(window.c.position == limit))),
+        )
+        count, version_sum, id_sum, next_cursor = (await self.session.execute(stmt)).one()
+        return count, version_sum, id_sum, next_cursor
+
+    @staticmethod
+    def _filters_key(filters: dict | None) -> tuple:
+        return tuple(sorted((filters or {}).items()))
+
+    def _page_query(self, stmt: Select, after: int | None, filters: dict | None, sort: str | None) -> Select:
+        """
+        Добавляет к запросу фильтры, сортировку и условие keyset пагинации.
+        При сортировке не по id курсором остается id: страница начинается после строки курсора
+        по паре (поле сортировки, id), поэтому порядок устойчив при одинаковых значениях поля.
+
+        Args:
+            stmt (Select): Запрос к таблице модели.
+            after (int | None): Идентификатор последнего объекта предыдущей страницы.
+            filters (dict | None): Фильтры.
+            sort (str | None): Сортировка.
+
+        Returns:
+            Select: Запрос страницы.
+        """
+        stmt = stmt.where(*self._filter_clauses(filters)).order_by(*self._order_by(sort))
+        if after is None:
+            return stmt
+
+        column, descending = self._sort_column(sort)
+        if column is self.model.__table__.c.id:
+            key, cursor = column, after
+        else:
+            key = tuple_(column, self.model.id)
+            cursor = select(column, self.model.id).where(self.model.id == after).scalar_subquery()
+        return stmt.where(key < cursor if descending else key > cursor)
+
+    def _filter_clauses(self, filters: dict | None) -> List[ColumnElement[bool]]:
+        """
+        Преобразует фильтры вида {"поле__оператор": значение} в условия WHERE.
+        Операторы: eq (по умолчанию), gt, gte, lt, lte, isnull. Поле должно быть колонкой модели,
+        список допустимых фильтров задается схемой фильтра на уровне API.
+
+        Args:
+            filters (dict | None): Фильтры.
+
+        Returns:
+            List[ColumnElement[bool]]: Условия WHERE.
+
+        Raises:
+            ValueError: Если поле или оператор не поддерживаются.
+        """
+        clauses = []
+        for key, value in (filters or {}).items():
+            field, _, operator_name = key.partition("__")
+            column = self.model.__table__.c.get(field)
+            operator_name = operator_name or "eq"
+            if column is None or operator_name not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter {key}")
+            clauses.append(FILTER_OPERATORS[operator_name](column, value))
+        return clauses
+
+    def _sort_column(self, sort: str | None) -> Tuple[Column, bool]:
+        field = (sort or "id").removeprefix("-")
+        column = self.model.__table__.c.get(field)
+        if column is None:
+            raise ValueError(f"Unsupported sort {sort}")
+        return column, bool(sort and sort.startswith("-"))
+
+    def _order_by(self, sort: str | None) -> List[ColumnElement]:
+        column, descending = self._sort_column(sort)
+        columns = [column] if column is self.model.__table__.c.id else [column, self.model.__table__.c.id]
+        return [sort_column.desc() if descending else sort_column.asc() for sort_column in columns]
+
+    @crud_error_handler
+    async def create(self, obj_in: P, commit: bool = True) -> DB:
         """
         Создание новой записи в базе данных.
 
         Args:
             obj_in (P): Данные для создания новой записи.
+            commit (bool): Зафиксировать транзакцию. False - запись фиксируется вызывающим кодом
+                вместе с другими изменениями сессии.
 
         Returns:
             DB: Созданный объект.
@@ -63,9 +357,80 @@ class BaseRepository:
         obj = self.model(**obj_in.model_dump())
         self.session.add(obj)
         await self.session.flush()
-        await self.session.commit()
+        if commit:
+            await entity_cache.commit(self.session)
         return obj
 
+    @crud_error_handler
+    async def bulk_create(self, objs_in: List[P], batch_size: int) -> List[int | None]:
+        """
+        Пакетное создание записей многострочным INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        Все пакеты выполняются в одной транзакции.
+
+        Args:
+            objs_in (List[P]): Данные для создания новых записей.
+            batch_size (int): Количество строк в одном INSERT.
+
+        Returns:
+            List[int | None]: ID созданной записи для каждой входной строки или None, если запись уже существует.
+        """
+        unique_fields = self._unique_fields()
+        created_ids = []
+        for start in range(0, len(objs_in), batch_size):
+            end = start + batch_size
+            rows = [obj_in.model_dump() for obj_in in objs_in[start:end]]
+            stmt = (
+                insert(self.model)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=unique_fields)
+                .returning(self.model.id, *(getattr(self.model, field) for field in unique_fields))
+            )
+            created = {tuple(row[1:]): row[0] for row in await self.session.execute(stmt)}
+            created_ids.extend(created.pop(tuple(row[field] for field in unique_fields), None) for row in rows)
+        await entity_cache.commit(self.session)
+        return created_ids
+
+    @crud_error_handler
+    async def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """
+        Получение идентификаторов, которые есть в базе данных, одним запросом.
+
+        Args:
+            ids (Iterable[int]): Проверяемые идентификаторы.
+
+        Returns:
+            Set[int]: Идентификаторы существующих записей.
+        """
+        stmt = select(self.model.id).where(id_in(self.model, ids))
+        return set(await self.session.scalars(stmt))
+
+    @crud_error_handler
+    async def get_many(self, ids: List[int], expand: Iterable[str] = ()) -> List[DB]:
+        """
+        Получение записей по списку идентификаторов одним запросом WHERE id = ANY(:ids).
+
+        Args:
+            ids (List[int]): Идентификаторы записей.
+            expand (Iterable[str]): Связи для загрузки вместе с записями, см. _load_options.
+
+        Returns:
+            List[DB]: Найденные записи в порядке входных идентификаторов, без повторов.
+                Идентификаторы, которых нет в базе данных, пропускаются.
+        """
+        stmt = select(self.model).where(id_in(self.model, ids)).options(*self._load_options(expand))
+        objs_db = {obj_db.id: obj_db for obj_db in await self.session.scalars(stmt)}
+        return [objs_db[obj_id] for obj_id in dict.fromkeys(ids) if obj_id in objs_db]
+
+    def _unique_fields(self) -> List[str]:
+        """
+        Поля уникального ограничения модели, по которым определяются дубликаты.
+
+        Returns:
+            List[str]: Названия полей.
+        """
+        constraint = next(c for c in self.model.__table__.constraints if isinstance(c, UniqueConstraint))
+        return [column.name for column in constraint.columns]
+
     @crud_error_handler
     async def update(self, obj_db: DB, obj_in: P) -> DB:
         """
@@ -80,7 +445,8 @@ class BaseRepository:
         """
         for key, value in obj_in.model_dump().items():
             setattr(obj_db, key, value)
-        await self.session.commit()
+        entity_cache.mark_stale(self.session, self.model, obj_db.id)
+        await entity_cache.commit(self.session)
         return obj_db
 
 
@@ -106,4 +472,43 @@ class DeleterRepository:
             obj_db (DB): Запись для удаления.
         """
         await self.session.delete(obj_db)
-        await self.session.commit()
+        entity_cache.mark_stale_objects(self.session, self.session.deleted)
+        await entity_cache.commit(self.session)
+
+
+class SearcherRepository:
+    """
+    Репозиторий для полнотекстового поиска записей.
+    Модель должна иметь колонку search_vector с GIN-индексом, конфигурация поиска берется из info колонки.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных.
+        model (Type[DB]): Модель данных.
+    """
+
+    def __init__(self, session: AsyncSession, model: Type[DB]):
+        self.session = session
+        self.model = model
+
+    @crud_error_handler
+    async def search(self, query: str, limit: int) -> List[DB]:
+        """
+        Полнотекстовый поиск записей, упорядоченных по релевантности.
+
+        Args:
+            query (str): Поисковый запрос в синтаксисе websearch_to_tsquery.
+            limit (int): Максимальное количество записей.
+
+        Returns:
+            List[DB]: Найденные записи.
+        """
+        search_vector = self.model.search_vector
+        ts_query = func.websearch_to_tsquery(cast(search_vector.info["search_config"], REGCONFIG), query)
+        stmt = (
+            select(self.model)
+            .where(search_vector.bool_op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(search_vector, ts_query).desc(), self.model.id)
+            .limit(limit)
+        )
+        obj_db = await self.session.scalars(stmt)
+        return list(obj_db)
@@ -1,12 +1,13 @@
 from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.entity_cache import entity_cache
 from app.models.book_model import Book
-from app.repository.base_repository import BaseRepository, DeleterRepository
+from app.repository.base_repository import BaseRepository, DeleterRepository, SearcherRepository
 from app.repository.repository_errors import crud_error_handler
 
 
-class BookRepository(BaseRepository, DeleterRepository):
+class BookRepository(BaseRepository, DeleterRepository, SearcherRepository):
     """
     Репозиторий для операций с книгами.
 
@@ -30,5 +31,6 @@ class BookRepository(BaseRepository, DeleterRepository):
         Returns:
             None
         """
-        stmt = update(Book).where(Book.id == book_id).values(available=Book.available + delta)
+        stmt = update(Book).where(Book.id == book_id).values(available=Book.available + delta, version=Book.version + 1)
         await self.session.execute(stmt)
+        entity_cache.mark_stale(self.session, Book, book_id)
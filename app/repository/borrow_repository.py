@@ -1,10 +1,22 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Sequence, Tuple
 
+from sqlalchemy import Row, func, insert, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.cache.entity_cache import entity_cache
+from app.config import settings
+from app.models.book_model import Book
 from app.models.borrow_model import Borrow
 from app.repository.base_repository import BaseRepository
 from app.repository.repository_errors import crud_error_handler
+from app.repository.stats_repository import borrow_counter_ctes, return_counter_ctes
+from app.schemas.borrow_schema import BorrowCreate
+
+LOAN_PERIOD = timedelta(days=settings.borrow.loan_days)
+
+OVERDUE_FILTERS = {"return_date__isnull": True, "due_date__lt": func.now()}
 
 
 class BorrowRepository(BaseRepository):
@@ -20,17 +32,134 @@ class BorrowRepository(BaseRepository):
         self.session = session
 
     @crud_error_handler
-    async def update(self, borrow_db: Borrow) -> Borrow:
+    async def create_borrow(self, borrow_in: BorrowCreate, commit: bool = True) -> Borrow | None:
         """
-        Закрывает выдачу в базе данных.
+        Создает выдачу одним запросом: условное списание экземпляра книги, вставка выдачи
+        и обновление счетчиков статистики в одном CTE.
+        Условие available > 0 проверяется под блокировкой строки книги, поэтому конкурентные выдачи
+        не могут увести количество экземпляров ниже нуля.
 
         Args:
-            borrow_db (Borrow): Объект выдачи для закрытия.
+            borrow_in (BorrowCreate): Данные для создания выдачи.
+            commit (bool): Зафиксировать транзакцию. False - выдача фиксируется вызывающим кодом
+                вместе с другими изменениями сессии.
 
         Returns:
-            Borrow: Обновленный объект выдачи.
+            Borrow | None: Созданная выдача или None, если книги нет или нет доступных экземпляров.
+        """
+        taken = (
+            update(Book)
+            .where(Book.id == borrow_in.book_id, Book.available > 0)
+            .values(available=Book.available - 1, version=Book.version + 1)
+            .returning(Book.id)
+            .cte("taken")
+        )
+        opened = (
+            insert(Borrow)
+            .from_select(
+                ["book_id", "reader_name", "due_date"],
+                select(taken.c.id, literal(borrow_in.reader_name), func.now() + LOAN_PERIOD),
+            )
+            .returning(*Borrow.__table__.c)
+            .cte("opened")
+        )
+        stmt = select(aliased(Borrow, opened)).add_cte(*borrow_counter_ctes(opened))
+        borrow_db = await self.session.scalar(stmt)
+        entity_cache.mark_stale(self.session, Book, borrow_in.book_id)
+        if commit:
+            await entity_cache.commit(self.session)
+        return borrow_db
+
+    @crud_error_handler
+    async def close_borrow(self, borrow_id: int) -> Borrow | None:
+        """
+        Закрывает выдачу одним запросом: установка даты возврата, возврат экземпляра книги
+        и обновление счетчиков статистики в одном CTE.
+        Экземпляр возвращается только для реально закрытой строки, поэтому повторный
+        или конкурентный возврат не увеличивает количество экземпляров.
+
+        Args:
+            borrow_id (int): Идентификатор выдачи.
 
+        Returns:
+            Borrow | None: Закрытая выдача или None, если выдачи нет или она уже закрыта.
         """
-        borrow_db.return_date = datetime.now()
-        await self.session.commit()
+        closed = (
+            update(Borrow)
+            .where(Borrow.id == borrow_id, Borrow.return_date.is_(None))
+            .values(return_date=func.now(), version=Borrow.version + 1)
+            .returning(*Borrow.__table__.c)
+            .cte("closed")
+        )
+        restocked = (
+            update(Book)
+            .where(Book.id == closed.c.book_id)
+            .values(available=Book.available + 1, version=Book.version + 1)
+            .returning(Book.id)
+            .cte("restocked")
+        )
+        stmt = (
+            select(aliased(Borrow, closed))
+            .add_cte(restocked, *return_counter_ctes(closed))
+            .execution_options(populate_existing=True)
+        )
+        borrow_db = await self.session.scalar(stmt)
+        if borrow_db:
+            entity_cache.mark_stale(self.session, Borrow, borrow_db.id)
+            entity_cache.mark_stale(self.session, Book, borrow_db.book_id)
+        await entity_cache.commit(self.session)
         return borrow_db
+
+    @crud_error_handler
+    async def mark_overdue(self, after: Tuple[datetime, int] | None, limit: int) -> List[Tuple[datetime, int]]:
+        """
+        Отмечает просроченными следующую порцию открытых выдач в порядке (due_date, id) и фиксирует транзакцию.
+        Порция читается по частичному индексу ix_borrows_due, строки, заблокированные другими транзакциями
+        (например, возвратом книги), пропускаются.
+
+        Args:
+            after (Tuple[datetime, int] | None): Ключ (due_date, id), после которого начинается порция.
+            limit (int): Размер порции.
+
+        Returns:
+            List[Tuple[datetime, int]]: Ключи (due_date, id) отмеченных выдач в порядке индекса.
+        """
+        batch = (
+            select(Borrow.id)
+            .where(Borrow.return_date.is_(None), Borrow.due_date < func.now(), Borrow.overdue_at.is_(None))
+            .order_by(Borrow.due_date, Borrow.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            batch = batch.where(tuple_(Borrow.due_date, Borrow.id) > tuple_(*after))
+        stmt = (
+            update(Borrow)
+            .where(Borrow.id.in_(batch))
+            .values(overdue_at=func.now(), version=Borrow.version + 1)
+            .returning(Borrow.due_date, Borrow.id)
+        )
+        marked = sorted(tuple(row) for row in await self.session.execute(stmt))
+        entity_cache.mark_stale(self.session, Borrow, *(borrow_id for _, borrow_id in marked))
+        await entity_cache.commit(self.session)
+        return marked
+
+    async def stream_rows(self, columns: List[str], batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Потоковое чтение всех выдач через серверный курсор, порциями по batch_size строк.
+
+        Args:
+            columns (List[str]): Названия выбираемых колонок.
+            batch_size (int): Количество строк, получаемых из курсора за один раз.
+
+        Yields:
+            Sequence[Row]: Порция строк выдач, упорядоченных по идентификатору.
+        """
+        stmt = (
+            select(*(getattr(Borrow, column) for column in columns))
+            .order_by(Borrow.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Dict, Iterable, Set, Type
+
+from sqlalchemy import ColumnElement, Integer, any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
+
+from app.models.base import Base
+
+ENTITY_LOADER = "entity_loader"
+
+
+def id_in(model: Type[Base], ids: Iterable[int]) -> ColumnElement[bool]:
+    """
+    Условие id = ANY(:ids) с одним параметром-массивом, план запроса не зависит от количества ID.
+
+    Args:
+        model (Type[Base]): Модель записей.
+        ids (Iterable[int]): Идентификаторы.
+
+    Returns:
+        ColumnElement[bool]: Условие WHERE.
+    """
+    return model.id == any_(literal(list(ids), ARRAY(Integer)))
+
+
+class EntityLoader:
+    """
+    Загрузчик записей по ID в рамках сессии запроса.
+    Вызовы load, сделанные конкурентно (например, через asyncio.gather), объединяются
+    в один запрос WHERE id = ANY(:ids) на модель. Записи, уже загруженные в сессию, возвращаются без запроса.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._pending: Dict[Type[Base], Dict[int, asyncio.Future]] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+
+    @classmethod
+    def for_session(cls, session: AsyncSession) -> "EntityLoader":
+        """
+        Возвращает загрузчик сессии, создавая его при первом обращении.
+
+        Args:
+            session (AsyncSession): Сессия базы данных.
+
+        Returns:
+            EntityLoader: Загрузчик сессии.
+        """
+        loader = session.info.get(ENTITY_LOADER)
+        if loader is None:
+            loader = session.info[ENTITY_LOADER] = cls(session=session)
+        return loader
+
+    async def load(self, model: Type[Base], obj_id: int) -> Base | None:
+        """
+        Загружает запись по ID, объединяя конкурентные вызовы в один запрос.
+
+        Args:
+            model (Type[Base]): Модель записи.
+            obj_id (int): Идентификатор записи.
+
+        Returns:
+            Base | None: Запись или None, если ее нет в базе данных.
+        """
+        obj_db = self.session.identity_map.get(identity_key(model, obj_id))
+        if obj_db is not None:
+            return obj_db
+
+        pending = self._pending.get(model)
+        if pending is None:
+            pending = self._pending[model] = {}
+            dispatch = asyncio.get_running_loop().create_task(self._dispatch(model))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+        future = pending.get(obj_id)
+        if future is None:
+            future = pending[obj_id] = asyncio.get_running_loop().create_future()
+        return await future
+
+    async def _dispatch(self, model: Type[Base]) -> None:
+        pending = self._pending.pop(model)
+        try:
+            objs_db = await self.session.scalars(select(model).where(id_in(model, pending)))
+            objs_db_by_id = {obj_db.id: obj_db for obj_db in objs_db}
+        except Exception as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for obj_id, future in pending.items():
+            if not future.done():
+                future.set_result(objs_db_by_id.get(obj_id))
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from sqlalchemy import Row, delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.entity_cache import entity_cache
+from app.models.idempotency_model import idempotency_keys
+from app.repository.repository_errors import crud_error_handler
+
+
+class IdempotencyRepository:
+    """
+    Репозиторий ключей идемпотентности запросов создания.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @crud_error_handler
+    async def claim(self, scope: str, key: str, request_hash: str, ttl: timedelta) -> bool:
+        """
+        Занимает ключ в текущей транзакции, без commit. Ключ с истекшим сроком занимается заново.
+        Если ключ занят незавершенной транзакцией конкурентного запроса, вставка ждет ее завершения,
+        поэтому одновременные повторы одного запроса не выполняются дважды.
+
+        Args:
+            scope (str): Область ключа, например название ресурса.
+            key (str): Значение заголовка Idempotency-Key.
+            request_hash (str): Хэш тела запроса.
+            ttl (timedelta): Срок хранения ключа.
+
+        Returns:
+            bool: True, если ключ занят этим запросом, False, если для ключа уже сохранен ответ.
+        """
+        stmt = insert(idempotency_keys).values(
+            scope=scope, key=key, request_hash=request_hash, expires_at=func.now() + ttl
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[idempotency_keys.c.scope, idempotency_keys.c.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "status_code": None,
+                "response": None,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=idempotency_keys.c.expires_at <= func.now(),
+        )
+        return await self.session.scalar(stmt.returning(idempotency_keys.c.key)) is not None
+
+    @crud_error_handler
+    async def get(self, scope: str, key: str) -> Row | None:
+        """
+        Получение сохраненного ответа по ключу.
+
+        Args:
+            scope (str): Область ключа.
+            key (str): Значение заголовка Idempotency-Key.
+
+        Returns:
+            Row | None: Строка request_hash, status_code, response или None, если ключа нет.
+        """
+        stmt = select(
+            idempotency_keys.c.request_hash, idempotency_keys.c.status_code, idempotency_keys.c.response
+        ).where(idempotency_keys.c.scope == scope, idempotency_keys.c.key == key)
+        return (await self.session.execute(stmt)).first()
+
+    @crud_error_handler
+    async def save_response(self, scope: str, key: str, status_code: int, response: bytes) -> None:
+        """
+        Сохраняет ответ для занятого ключа и фиксирует транзакцию вместе с созданной в ней записью.
+
+        Args:
+            scope (str): Область ключа.
+            key (str): Значение заголовка Idempotency-Key.
+            status_code (int): Код ответа.
+            response (bytes): Тело ответа.
+        """
+        await self.session.execute(
+            update(idempotency_keys)
+            .where(idempotency_keys.c.scope == scope, idempotency_keys.c.key == key)
+            .values(status_code=status_code, response=response)
+        )
+        await entity_cache.commit(self.session)
+
+    @crud_error_handler
+    async def delete_expired(self, limit: int) -> int:
+        """
+        Удаляет порцию ключей с истекшим сроком хранения.
+
+        Args:
+            limit (int): Размер порции.
+
+        Returns:
+            int: Количество удаленных ключей.
+        """
+        expired = (
+            select(idempotency_keys.c.scope, idempotency_keys.c.key)
+            .where(idempotency_keys.c.expires_at <= func.now())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(idempotency_keys).where(tuple_(idempotency_keys.c.scope, idempotency_keys.c.key).in_(expired))
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -2,6 +2,7 @@ from functools import wraps
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.log_config import logger
 
@@ -40,6 +41,16 @@ def crud_error_handler(func):
                         detail=f"The author {author_in.first_name} {author_in.last_name} is already in the database",
                     )
 
+        except StaleDataError:
+            """
+            Обработка конфликта версий: запись изменена или удалена другим запросом.
+            """
+            await args[0].session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The record has been modified by another request, please retry",
+            )
+
         except Exception as exc:
             """
             Обработка общих ошибок.
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from app.monitoring.metrics import SINGLE_FLIGHT_CALLS
+
+T = TypeVar("T")
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых конкурентных запросов на чтение в процессе (single-flight).
+    Первый вызов с ключом (ведущий) выполняет запрос в своей сессии, вызовы с тем же ключом,
+    сделанные до его завершения, ждут и получают его результат без запроса к базе данных.
+    ORM объекты привязаны к сессии ведущего, поэтому ожидающим передается share(результат):
+    значения колонок или неизменяемые строки.
+    Если ведущий запрос отменен (клиент отключился), ожидающие повторяют вызов сами.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        name: str,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        share: Callable[[T], Any] = identity,
+    ) -> Tuple[Any, bool]:
+        """
+        Выполняет call или присоединяется к выполняемому вызову с тем же ключом.
+
+        Args:
+            name (str): Название операции для метрик, например "books.get_one".
+            key (Hashable): Ключ запроса: движок, модель и параметры.
+            call (Callable[[], Awaitable[T]]): Запрос к базе данных.
+            share (Callable[[T], Any]): Преобразование результата для ожидающих вызовов.
+
+        Returns:
+            Tuple[Any, bool]: Результат и признак ведущего вызова: True - результат call,
+            False - результат share ведущего вызова.
+        """
+        try:
+            hash(key)
+        except TypeError:
+            return await call(), True
+
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            SINGLE_FLIGHT_CALLS.inc(key=name, role="follower")
+            try:
+                return await asyncio.shield(future), False
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        SINGLE_FLIGHT_CALLS.inc(key=name, role="leader")
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(share(result))
+            return result, True
+        finally:
+            del self._calls[key]
+
+
+single_flight = SingleFlight()
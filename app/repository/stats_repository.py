@@ -0,0 +1,276 @@
+from typing import List, Sequence
+
+from sqlalchemy import CTE, Date, Row, cast, delete, event, func, literal, select, text, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.book_model import Book
+from app.models.borrow_model import Borrow
+from app.models.stats_model import (
+    STRIPES,
+    author_utilisation,
+    book_borrow_counters,
+    daily_borrow_counters,
+    reader_borrow_counters,
+)
+from app.repository.repository_errors import crud_error_handler
+
+STATS_REFRESH_LOCK_ID = 7213_0002
+
+
+def borrow_counter_ctes(opened: CTE) -> List[CTE]:
+    """
+    CTE увеличения счетчиков статистики для созданных выдач.
+    Выполняются в одном запросе с созданием выдачи, поэтому счетчики всегда согласованы с таблицей выдач.
+
+    Args:
+        opened (CTE): CTE созданных выдач с колонками book_id, reader_name и borrow_date.
+
+    Returns:
+        List[CTE]: CTE обновления счетчиков книги, читателя и дня.
+    """
+    book_counter = insert(book_borrow_counters).from_select(
+        ["book_id", "total_borrows", "active_borrows"], select(opened.c.book_id, literal(1), literal(1))
+    )
+    book_counter = book_counter.on_conflict_do_update(
+        index_elements=[book_borrow_counters.c.book_id],
+        set_={
+            "total_borrows": book_borrow_counters.c.total_borrows + 1,
+            "active_borrows": book_borrow_counters.c.active_borrows + 1,
+        },
+    )
+    reader_counter = insert(reader_borrow_counters).from_select(
+        ["reader_name", "total_borrows", "active_borrows"], select(opened.c.reader_name, literal(1), literal(1))
+    )
+    reader_counter = reader_counter.on_conflict_do_update(
+        index_elements=[reader_borrow_counters.c.reader_name],
+        set_={
+            "total_borrows": reader_borrow_counters.c.total_borrows + 1,
+            "active_borrows": reader_borrow_counters.c.active_borrows + 1,
+        },
+    )
+    day_counter = insert(daily_borrow_counters).from_select(
+        ["day", "stripe", "borrows"],
+        select(cast(opened.c.borrow_date, Date), opened.c.book_id % STRIPES, literal(1)),
+    )
+    day_counter = day_counter.on_conflict_do_update(
+        index_elements=[daily_borrow_counters.c.day, daily_borrow_counters.c.stripe],
+        set_={"borrows": daily_borrow_counters.c.borrows + 1},
+    )
+    return [
+        book_counter.cte("book_counter"),
+        reader_counter.cte("reader_counter"),
+        day_counter.cte("day_counter"),
+    ]
+
+
+def return_counter_ctes(closed: CTE) -> List[CTE]:
+    """
+    CTE обновления счетчиков статистики для закрытых выдач.
+
+    Args:
+        closed (CTE): CTE закрытых выдач с колонками book_id, reader_name и return_date.
+
+    Returns:
+        List[CTE]: CTE обновления счетчиков книги, читателя и дня.
+    """
+    book_counter = (
+        update(book_borrow_counters)
+        .where(book_borrow_counters.c.book_id == closed.c.book_id)
+        .values(active_borrows=book_borrow_counters.c.active_borrows - 1)
+    )
+    reader_counter = (
+        update(reader_borrow_counters)
+        .where(reader_borrow_counters.c.reader_name == closed.c.reader_name)
+        .values(active_borrows=reader_borrow_counters.c.active_borrows - 1)
+    )
+    day_counter = insert(daily_borrow_counters).from_select(
+        ["day", "stripe", "returns"],
+        select(cast(closed.c.return_date, Date), closed.c.book_id % STRIPES, literal(1)),
+    )
+    day_counter = day_counter.on_conflict_do_update(
+        index_elements=[daily_borrow_counters.c.day, daily_borrow_counters.c.stripe],
+        set_={"returns": daily_borrow_counters.c.returns + 1},
+    )
+    return [
+        book_counter.cte("book_counter"),
+        reader_counter.cte("reader_counter"),
+        day_counter.cte("day_counter"),
+    ]
+
+
+@event.listens_for(Borrow, "after_delete")
+def release_reader_counter(mapper, connection, target: Borrow) -> None:
+    """
+    Уменьшает счетчик открытых выдач читателя при удалении открытой выдачи (например, вместе с книгой).
+    Счетчики книги удаляются каскадно по внешнему ключу.
+
+    Args:
+        mapper (Mapper): Маппер модели выдачи.
+        connection (Connection): Соединение транзакции удаления.
+        target (Borrow): Удаленная выдача.
+    """
+    if target.return_date is None:
+        connection.execute(
+            update(reader_borrow_counters)
+            .where(reader_borrow_counters.c.reader_name == target.reader_name)
+            .values(active_borrows=reader_borrow_counters.c.active_borrows - 1)
+        )
+
+
+class StatsRepository:
+    """
+    Репозиторий для чтения статистики выдач из счетчиков и материализованных представлений.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @crud_error_handler
+    async def top_books(self, limit: int) -> Sequence[Row]:
+        """
+        Книги с наибольшим количеством выдач. Читается по индексу (total_borrows, book_id).
+
+        Args:
+            limit (int): Количество книг.
+
+        Returns:
+            Sequence[Row]: Строки book_id, title, total_borrows, active_borrows.
+        """
+        stmt = (
+            select(
+                book_borrow_counters.c.book_id,
+                Book.title,
+                book_borrow_counters.c.total_borrows,
+                book_borrow_counters.c.active_borrows,
+            )
+            .join(Book, Book.id == book_borrow_counters.c.book_id)
+            .order_by(book_borrow_counters.c.total_borrows.desc(), book_borrow_counters.c.book_id.desc())
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    @crud_error_handler
+    async def active_readers(self, limit: int) -> Sequence[Row]:
+        """
+        Читатели с наибольшим количеством открытых выдач. Читается по индексу (active_borrows, reader_name).
+
+        Args:
+            limit (int): Количество читателей.
+
+        Returns:
+            Sequence[Row]: Строки reader_name, active_borrows, total_borrows.
+        """
+        stmt = (
+            select(
+                reader_borrow_counters.c.reader_name,
+                reader_borrow_counters.c.active_borrows,
+                reader_borrow_counters.c.total_borrows,
+            )
+            .where(reader_borrow_counters.c.active_borrows > 0)
+            .order_by(reader_borrow_counters.c.active_borrows.desc(), reader_borrow_counters.c.reader_name.desc())
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    @crud_error_handler
+    async def author_utilisation(self, limit: int) -> Sequence[Row]:
+        """
+        Авторы с наибольшей загруженностью фонда по последнему обновлению материализованного представления.
+
+        Args:
+            limit (int): Количество авторов.
+
+        Returns:
+            Sequence[Row]: Строки представления author_utilisation.
+        """
+        stmt = (
+            select(author_utilisation)
+            .order_by(author_utilisation.c.utilisation.desc(), author_utilisation.c.author_id.desc())
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    @crud_error_handler
+    async def daily_counts(self, days: int) -> Sequence[Row]:
+        """
+        Количество выдач и возвратов по дням за последние days дней, включая текущий.
+        Полосы счетчика дня суммируются, дни без выдач и возвратов не возвращаются.
+
+        Args:
+            days (int): Количество дней.
+
+        Returns:
+            Sequence[Row]: Строки day, borrows, returns, упорядоченные по дню.
+        """
+        stmt = (
+            select(
+                daily_borrow_counters.c.day,
+                func.sum(daily_borrow_counters.c.borrows).label("borrows"),
+                func.sum(daily_borrow_counters.c.returns).label("returns"),
+            )
+            .where(daily_borrow_counters.c.day > func.current_date() - days)
+            .group_by(daily_borrow_counters.c.day)
+            .order_by(daily_borrow_counters.c.day)
+        )
+        return (await self.session.execute(stmt)).all()
+
+    @crud_error_handler
+    async def refresh_author_utilisation(self) -> bool:
+        """
+        Обновляет материализованное представление author_utilisation без блокировки чтения.
+        Экземпляры приложения обновляют его по очереди: если обновление уже идет, вызов пропускается.
+
+        Returns:
+            bool: Было ли выполнено обновление.
+        """
+        locked = await self.session.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:lock_id)").bindparams(lock_id=STATS_REFRESH_LOCK_ID)
+        )
+        if locked:
+            await self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY author_utilisation"))
+        await self.session.commit()
+        return bool(locked)
+
+    @crud_error_handler
+    async def rebuild_counters(self) -> None:
+        """
+        Пересчитывает счетчики статистики по таблице выдач, например после загрузки выдач в обход репозитория.
+        Таблица выдач блокируется от записи до конца транзакции, чтобы счетчики не разошлись с выдачами.
+        """
+        await self.session.execute(text("LOCK TABLE borrows IN SHARE MODE"))
+        for counters in (book_borrow_counters, reader_borrow_counters, daily_borrow_counters):
+            await self.session.execute(delete(counters))
+
+        is_open = Borrow.return_date.is_(None)
+        for counters, key in ((book_borrow_counters, Borrow.book_id), (reader_borrow_counters, Borrow.reader_name)):
+            await self.session.execute(
+                insert(counters).from_select(
+                    [key.key, "total_borrows", "active_borrows"],
+                    select(key, func.count(), func.count().filter(is_open)).group_by(key),
+                )
+            )
+
+        events = union_all(
+            select(
+                cast(Borrow.borrow_date, Date).label("day"),
+                (Borrow.book_id % STRIPES).label("stripe"),
+                literal(1).label("borrows"),
+                literal(0).label("returns"),
+            ),
+            select(cast(Borrow.return_date, Date), Borrow.book_id % STRIPES, literal(0), literal(1)).where(
+                Borrow.return_date.is_not(None)
+            ),
+        ).subquery("events")
+        await self.session.execute(
+            insert(daily_borrow_counters).from_select(
+                ["day", "stripe", "borrows", "returns"],
+                select(events.c.day, events.c.stripe, func.sum(events.c.borrows), func.sum(events.c.returns)).group_by(
+                    events.c.day, events.c.stripe
+                ),
+            )
+        )
+        await self.session.commit()
@@ -1,4 +1,9 @@
-from pydantic import BaseModel, conint
+from enum import Enum
+
+from pydantic import BaseModel, Field, conint
+
+from app.schemas.author_schema import AuthorFull
+from app.schemas.expand_schema import ExpandableSchema
 
 
 class BookCreate(BaseModel):
@@ -14,3 +19,25 @@ class BookUpdate(BookCreate):
 
 class BookFull(BookCreate):
     id: int
+
+
+class BookExpanded(ExpandableSchema, BookFull):
+    author: AuthorFull | None = None
+
+
+class BookExpand(str, Enum):
+    author = "author"
+
+
+class BookFilter(BaseModel):
+    author_id: int | None = Field(default=None, description="ID автора")
+    available__gt: int | None = Field(default=None, description="Доступных экземпляров больше")
+
+
+class BookSort(str, Enum):
+    id = "id"
+    id_desc = "-id"
+    title = "title"
+    title_desc = "-title"
+    available = "available"
+    available_desc = "-available"
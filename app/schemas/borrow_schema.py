@@ -1,6 +1,10 @@
 from datetime import datetime
+from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.book_schema import BookExpanded
+from app.schemas.expand_schema import ExpandableSchema
 
 
 class BorrowCreate(BaseModel):
@@ -16,10 +20,43 @@ class BorrowUpdate(BorrowCreate):
 class BorrowResponse(BorrowCreate):
     id: int
     borrow_date: datetime
+    due_date: datetime
     return_date: datetime | None
+    overdue_at: datetime | None
 
 
 class BorrowFull(BorrowCreate):
     id: int
     borrow_date: datetime
+    due_date: datetime
     return_date: datetime
+    overdue_at: datetime | None
+
+
+class BorrowExpanded(ExpandableSchema, BorrowResponse):
+    book: BookExpanded | None = None
+
+
+class BorrowExpand(str, Enum):
+    book = "book"
+    book_author = "book.author"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class BorrowFilter(BaseModel):
+    book_id: int | None = Field(default=None, description="ID книги")
+    reader_name: str | None = Field(default=None, description="Имя читателя")
+    return_date__isnull: bool | None = Field(default=None, description="true - открытые выдачи, false - закрытые")
+    borrow_date__gte: datetime | None = Field(default=None, description="Дата выдачи не раньше")
+    borrow_date__lt: datetime | None = Field(default=None, description="Дата выдачи раньше")
+
+
+class BorrowSort(str, Enum):
+    id = "id"
+    id_desc = "-id"
+    borrow_date = "borrow_date"
+    borrow_date_desc = "-borrow_date"
@@ -0,0 +1,15 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class BulkStatus(str, Enum):
+    created = "created"
+    duplicate = "duplicate"
+    author_not_found = "author_not_found"
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: BulkStatus
+    id: int | None = None
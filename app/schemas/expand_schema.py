@@ -0,0 +1,22 @@
+from typing import Any
+
+from pydantic import BaseModel, model_validator
+from sqlalchemy import inspect
+
+
+class ExpandableSchema(BaseModel):
+    """
+    Базовая схема ответа с вложенными связями.
+    Связи, не загруженные запросом (не указанные в expand), не читаются из объекта базы данных,
+    иначе обращение к ним запустило бы ленивую загрузку, и остаются не заданными в ответе.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_relationships(cls, data: Any) -> Any:
+        state = inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "unloaded"):
+            return data
+
+        unloaded = state.unloaded
+        return {name: getattr(data, name) for name in cls.model_fields if name not in unloaded}
@@ -0,0 +1,15 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class PageParams(BaseModel):
+    after: int | None = None
+    limit: int
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next: int | None = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class SearchParams(BaseModel):
+    q: str
+    limit: int
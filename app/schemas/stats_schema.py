@@ -0,0 +1,39 @@
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TopBook(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    book_id: int
+    title: str
+    total_borrows: int
+    active_borrows: int
+
+
+class ReaderActivity(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    reader_name: str
+    active_borrows: int
+    total_borrows: int
+
+
+class AuthorUtilisation(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    author_id: int
+    books: int
+    available: int
+    active_borrows: int
+    total_borrows: int
+    utilisation: float
+
+
+class DailyBorrows(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    borrows: int
+    returns: int
@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    backend: str | None
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class HistogramBucket(BaseModel):
+    le: float
+    count: int
+
+
+class WaitHistogram(BaseModel):
+    count: int
+    sum: float
+    buckets: List[HistogramBucket]
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait: WaitHistogram
+
+
+class ReplicaStats(BaseModel):
+    url: str
+    healthy: bool
+    lag: float | None
+
+
+class AdmissionStats(BaseModel):
+    capacity: int
+    active: Dict[str, int]
+    queued: Dict[str, int]
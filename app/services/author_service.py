@@ -1,12 +1,15 @@
+from typing import List
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.author_model import Author
 from app.repository.author_repository import AuthorRepository
 from app.schemas.author_schema import AuthorCreate
-from app.services.base_service import BaseService, DeleterService
+from app.schemas.bulk_schema import BulkItemResult
+from app.services.base_service import BaseService, DeleterService, SearcherService
 
 
-class AuthorService(BaseService, DeleterService):
+class AuthorService(BaseService, DeleterService, SearcherService):
     """
     Сервис для работы с авторами.
 
@@ -34,6 +37,18 @@ class AuthorService(BaseService, DeleterService):
         """
         return await self.repository.create(obj_in=author_in)
 
+    async def bulk_create_authors(self, authors_in: List[AuthorCreate]) -> List[BulkItemResult]:
+        """
+        Пакетное добавление авторов, дубликаты пропускаются.
+
+        Args:
+            authors_in (List[AuthorCreate]): Данные для новых авторов.
+
+        Returns:
+            List[BulkItemResult]: Результат для каждого входного автора.
+        """
+        return await self.bulk_create(authors_in)
+
     async def update_author(self, author_in: AuthorCreate) -> Author:
         """
         Обновление данных автора.
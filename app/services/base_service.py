@@ -1,9 +1,13 @@
-from typing import List, TypeVar
+from typing import Iterable, List, Set, TypeVar
 
 from fastapi import HTTPException, status
+from pydantic import BaseModel
 
+from app.config import settings
 from app.models.base import Base
-from app.repository.base_repository import BaseRepository, DeleterRepository
+from app.repository.base_repository import BaseRepository, DeleterRepository, SearcherRepository
+from app.schemas.bulk_schema import BulkItemResult, BulkStatus
+from app.schemas.page_schema import PageParams
 
 DB = TypeVar("DB", bound=Base)
 
@@ -23,12 +27,14 @@ class BaseService:
         self.obj_message = obj_message
         self.obj_db_by_id = obj_db_by_id
 
-    async def store_obj_db_by_id_or_404(self, obj_id: int):
+    async def store_obj_db_by_id_or_404(self, obj_id: int, use_cache: bool = False):
         """
         Сохраняет объект базы данных полученный по входящему идентификатору или вызывает исключение 404.
 
         Args:
             obj_id (int): Идентификатор объекта.
+            use_cache (bool): Получить объект из кэша, если он там есть. Только для чтения,
+                перед изменением объект должен быть прочитан из базы данных.
 
         Returns:
             DB: Объект базы данных.
@@ -36,7 +42,7 @@ class BaseService:
         Raises:
             HTTPException: Если объект не найден.
         """
-        self.obj_db_by_id = await self.repository.get_one(obj_id=obj_id)
+        self.obj_db_by_id = await self.repository.get_one(obj_id=obj_id, use_cache=use_cache)
         if self.obj_db_by_id:
             return self.obj_db_by_id
 
@@ -54,14 +60,167 @@ class BaseService:
         """
         return await self.repository.get_one(obj_id)
 
-    async def get_all(self) -> List[DB]:
+    async def load_expansions(self, expand: Iterable[str]) -> DB:
         """
-        Получает все объекты базы данных.
+        Загружает связи сохраненного объекта базы данных.
+
+        Args:
+            expand (Iterable[str]): Пути связей вида "book" или "book.author".
+
+        Returns:
+            DB: Объект базы данных с загруженными связями.
+        """
+        if expand:
+            await self.repository.load_expansions(obj_db=self.obj_db_by_id, expand=expand)
+        return self.obj_db_by_id
+
+    async def get_all(
+        self, page: PageParams, filters: dict | None = None, sort: str | None = None, expand: Iterable[str] = ()
+    ) -> dict:
+        """
+        Получает страницу объектов базы данных и курсор следующей страницы.
+
+        Args:
+            page (PageParams): Параметры пагинации.
+            filters (dict | None): Фильтры вида {"поле__оператор": значение}.
+            sort (str | None): Поле сортировки, с префиксом "-" для сортировки по убыванию.
+            expand (Iterable[str]): Связи для загрузки вместе со страницей.
+
+        Returns:
+            dict: Объекты страницы (items) и ID для запроса следующей страницы (next).
+        """
+        obj_db = await self.repository.get_all(
+            limit=page.limit + 1, after=page.after, filters=filters, sort=sort, expand=expand
+        )
+        next_cursor = obj_db[page.limit - 1].id if len(obj_db) > page.limit else None
+        return {"items": obj_db[: page.limit], "next": next_cursor}
+
+    async def get_all_rows(
+        self, page: PageParams, columns: Iterable[str], filters: dict | None = None, sort: str | None = None
+    ) -> dict:
+        """
+        Получает страницу кортежей колонок и курсор следующей страницы, без объектов базы данных.
+        Колонки должны включать id и version: по ним считаются курсор и ETag страницы.
+
+        Args:
+            page (PageParams): Параметры пагинации.
+            columns (Iterable[str]): Названия колонок.
+            filters (dict | None): Фильтры вида {"поле__оператор": значение}.
+            sort (str | None): Поле сортировки, с префиксом "-" для сортировки по убыванию.
+
+        Returns:
+            dict: Строки страницы (items) и ID для запроса следующей страницы (next).
+        """
+        rows = await self.repository.get_all_rows(
+            columns=columns, limit=page.limit + 1, after=page.after, filters=filters, sort=sort
+        )
+        next_cursor = rows[page.limit - 1].id if len(rows) > page.limit else None
+        return {"items": rows[: page.limit], "next": next_cursor}
+
+    async def get_many(self, ids: List[int], expand: Iterable[str] = ()) -> dict:
+        """
+        Получает объекты базы данных по списку ID одним запросом.
+
+        Args:
+            ids (List[int]): Идентификаторы объектов.
+            expand (Iterable[str]): Связи для загрузки вместе с объектами.
+
+        Returns:
+            dict: Найденные объекты в порядке входных ID (items), без курсора следующей страницы (next).
+        """
+        return {"items": await self.repository.get_many(ids=ids, expand=expand), "next": None}
+
+    async def get_page_etag(self, page: PageParams, filters: dict | None = None, sort: str | None = None) -> str:
+        """
+        Получает ETag страницы по версиям записей, не читая сами записи.
+
+        Args:
+            page (PageParams): Параметры пагинации.
+            filters (dict | None): Фильтры страницы.
+            sort (str | None): Сортировка страницы.
+
+        Returns:
+            str: ETag страницы, совпадает с page_etag для страницы из get_all.
+        """
+        count, version_sum, id_sum, next_cursor = await self.repository.get_page_version(
+            limit=page.limit, after=page.after, filters=filters, sort=sort
+        )
+        return self._make_etag(count, version_sum, id_sum, next_cursor or 0)
+
+    @classmethod
+    def page_etag(cls, page_db: dict, expand: Iterable[str] = ()) -> str:
+        """
+        Рассчитывает ETag страницы, полученной из get_all.
+
+        Args:
+            page_db (dict): Страница объектов базы данных.
+            expand (Iterable[str]): Загруженные связи, их версии входят в ETag.
 
         Returns:
-            List[DB]: Список объектов базы данных.
+            str: ETag страницы.
         """
-        return await self.repository.get_all()
+        items = page_db["items"]
+        version_sum = sum(cls._version_with_expansions(obj_db, expand) for obj_db in items)
+        id_sum = sum(obj_db.id for obj_db in items)
+        return cls._make_etag(len(items), version_sum, id_sum, page_db["next"] or 0)
+
+    @classmethod
+    def obj_etag(cls, obj_db: DB, expand: Iterable[str] = ()) -> str:
+        """
+        Рассчитывает ETag объекта базы данных по его версии.
+
+        Args:
+            obj_db (DB): Объект базы данных.
+            expand (Iterable[str]): Загруженные связи, их версии входят в ETag.
+
+        Returns:
+            str: ETag объекта.
+        """
+        return cls._make_etag(obj_db.id, cls._version_with_expansions(obj_db, expand))
+
+    @staticmethod
+    def _version_with_expansions(obj_db: DB, expand: Iterable[str]) -> int:
+        version = obj_db.version
+        for path in expand:
+            related = obj_db
+            for name in path.split("."):
+                related = getattr(related, name)
+                if related is None:
+                    break
+                version += related.version
+        return version
+
+    @staticmethod
+    def _make_etag(*parts: int) -> str:
+        return '"' + "-".join(str(part) for part in parts) + '"'
+
+    async def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """
+        Получает идентификаторы существующих объектов базы данных.
+
+        Args:
+            ids (Iterable[int]): Проверяемые идентификаторы.
+
+        Returns:
+            Set[int]: Идентификаторы существующих объектов.
+        """
+        return await self.repository.get_existing_ids(ids)
+
+    async def bulk_create(self, objs_in: List[BaseModel]) -> List[BulkItemResult]:
+        """
+        Пакетно создает объекты базы данных, дубликаты пропускаются.
+
+        Args:
+            objs_in (List[BaseModel]): Данные для создания объектов.
+
+        Returns:
+            List[BulkItemResult]: Результат для каждой входной строки.
+        """
+        created_ids = await self.repository.bulk_create(objs_in=objs_in, batch_size=settings.api.bulk_batch_size)
+        return [
+            BulkItemResult(index=index, status=BulkStatus.created if obj_id else BulkStatus.duplicate, id=obj_id)
+            for index, obj_id in enumerate(created_ids)
+        ]
 
 
 class DeleterService:
@@ -85,3 +244,28 @@ class DeleterService:
             None
         """
         return await self.repository.delete(obj_db=self.obj_db_by_id)
+
+
+class SearcherService:
+    """
+    Сервисный класс для полнотекстового поиска.
+
+    Attributes:
+        repository (SearcherRepository): Репозиторий для поиска.
+    """
+
+    def __init__(self, repository: SearcherRepository):
+        self.repository: SearcherRepository = repository
+
+    async def search(self, query: str, limit: int) -> List[DB]:
+        """
+        Ищет объекты базы данных по поисковому запросу.
+
+        Args:
+            query (str): Поисковый запрос.
+            limit (int): Максимальное количество объектов.
+
+        Returns:
+            List[DB]: Найденные объекты, наиболее релевантные первыми.
+        """
+        return await self.repository.search(query=query, limit=limit)
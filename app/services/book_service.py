@@ -1,13 +1,16 @@
+from typing import List
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.book_model import Book
 from app.repository.book_repository import BookRepository
 from app.schemas.book_schema import BookCreate
+from app.schemas.bulk_schema import BulkItemResult, BulkStatus
 from app.services.author_service import AuthorService
-from app.services.base_service import BaseService, DeleterService
+from app.services.base_service import BaseService, DeleterService, SearcherService
 
 
-class BookService(BaseService, DeleterService):
+class BookService(BaseService, DeleterService, SearcherService):
     """
     Сервис для работы с книгами.
 
@@ -23,12 +26,13 @@ class BookService(BaseService, DeleterService):
         self.obj_db_by_id: Book | None = None
         super().__init__(repository=self.repository, obj_message="Book", obj_db_by_id=self.obj_db_by_id)
 
-    async def create_book(self, book_in: BookCreate) -> Book:
+    async def create_book(self, book_in: BookCreate, commit: bool = True) -> Book:
         """
         Добвавление новой книги.
 
         Args:
             book_in (BookCreate): Данные для новой книги.
+            commit (bool): Зафиксировать транзакцию, см. BaseRepository.create.
 
         Returns:
             Book: Модель добавленной книги.
@@ -37,7 +41,28 @@ class BookService(BaseService, DeleterService):
             HTTPException: Если автора нет в базе данных.
         """
         await self.author_exist_or_404(author_id=book_in.author_id)
-        return await self.repository.create(obj_in=book_in)
+        return await self.repository.create(obj_in=book_in, commit=commit)
+
+    async def bulk_create_books(self, books_in: List[BookCreate]) -> List[BulkItemResult]:
+        """
+        Пакетное добавление книг. Авторы проверяются одним запросом,
+        книги несуществующих авторов и дубликаты пропускаются.
+
+        Args:
+            books_in (List[BookCreate]): Данные для новых книг.
+
+        Returns:
+            List[BulkItemResult]: Результат для каждой входной книги.
+        """
+        author_service = AuthorService(async_session=self.session)
+        existing_author_ids = await author_service.get_existing_ids({book_in.author_id for book_in in books_in})
+        valid_indexes = [index for index, book_in in enumerate(books_in) if book_in.author_id in existing_author_ids]
+        created = await self.bulk_create([books_in[index] for index in valid_indexes])
+
+        results = [BulkItemResult(index=index, status=BulkStatus.author_not_found) for index in range(len(books_in))]
+        for index, result in zip(valid_indexes, created):
+            results[index] = result.model_copy(update={"index": index})
+        return results
 
     async def update_book(self, book_in: BookCreate) -> Book:
         """
@@ -66,7 +91,7 @@ class BookService(BaseService, DeleterService):
             HTTPException: Если автора нет в базе данных.
         """
         author_service = AuthorService(async_session=self.session)
-        await author_service.store_obj_db_by_id_or_404(author_id)
+        await author_service.store_obj_db_by_id_or_404(author_id, use_cache=True)
 
     async def update_book_available(self, book_id: int, delta: int) -> None:
         """
@@ -1,9 +1,18 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, List, Sequence, Tuple
+
+import orjson
 from fastapi import HTTPException, status
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.borrow_model import Borrow
-from app.repository.borrow_repository import BorrowRepository
-from app.schemas.borrow_schema import BorrowCreate
+from app.repository.borrow_repository import OVERDUE_FILTERS, BorrowRepository
+from app.schemas.borrow_schema import BorrowCreate, BorrowResponse, ExportFormat
+from app.schemas.page_schema import PageParams
 from app.services.base_service import BaseService
 from app.services.book_service import BookService
 
@@ -24,58 +33,110 @@ class BorrowService(BaseService):
         self.obj_db_by_id: Borrow | None = None
         super().__init__(repository=self.repository, obj_message="Borrow", obj_db_by_id=self.obj_db_by_id)
 
-    async def create_borrow(self, borrow_in: BorrowCreate) -> Borrow:
+    async def create_borrow(self, borrow_in: BorrowCreate, commit: bool = True) -> Borrow:
         """
         Создает новую выдачу.
 
         Args:
             borrow_in (BorrowCreate): Данные для создания выдачи.
+            commit (bool): Зафиксировать транзакцию, см. BorrowRepository.create_borrow.
 
         Returns:
             Borrow: Созданный объект выдачи.
 
         Raises:
-            HTTPException: Если нет доступных экземпляров книги.
+            HTTPException: Если книга не найдена или нет доступных экземпляров книги.
         """
-        book_service: BookService = await self.store_book_db_by_id_or_404(book_id=borrow_in.book_id)
-        if book_service.obj_db_by_id and book_service.obj_db_by_id.available <= 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="There are no copies of the book available"
-            )
+        borrow_db = await self.repository.create_borrow(borrow_in=borrow_in, commit=commit)
+        if borrow_db:
+            return borrow_db
 
-        await book_service.update_book_available(book_id=borrow_in.book_id, delta=-1)
-        return await self.repository.create(obj_in=borrow_in)
+        book_service = BookService(async_session=self.session)
+        if not await book_service.get_existing_ids([borrow_in.book_id]):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Book {borrow_in.book_id} not found")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="There are no copies of the book available")
 
-    async def close_borrow(self) -> Borrow:
+    async def close_borrow(self, borrow_id: int) -> Borrow:
         """
         Закрывает выдачу.
 
+        Args:
+            borrow_id (int): Идентификатор выдачи.
+
         Returns:
             Borrow: Обновленный объект выдачи.
 
         Raises:
-            HTTPException: Если книга уже возвращена.
+            HTTPException: Если выдача не найдена или книга уже возвращена.
         """
-        book_service = await self.store_book_db_by_id_or_404(book_id=self.obj_db_by_id.book_id)
-        if self.obj_db_by_id.return_date:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The book has already been returned")
+        borrow_db = await self.repository.close_borrow(borrow_id=borrow_id)
+        if borrow_db:
+            return borrow_db
 
-        await book_service.update_book_available(book_id=self.obj_db_by_id.book_id, delta=1)
-        return await self.repository.update(borrow_db=self.obj_db_by_id)
+        if not await self.get_existing_ids([borrow_id]):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"{self.obj_message} {borrow_id} not found"
+            )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The book has already been returned")
 
-    async def store_book_db_by_id_or_404(self, book_id: int) -> BookService:
+    async def get_overdue(self, page: PageParams) -> dict:
         """
-        Получает книгу по идентификатору или вызывает исключение 404.
+        Получает страницу открытых выдач с истекшим сроком возврата, упорядоченных по сроку возврата.
 
         Args:
-            book_id (int): Идентификатор книги.
+            page (PageParams): Параметры пагинации.
 
         Returns:
-            BookService: Экземпляр сервиса книги.
+            dict: Выдачи страницы (items) и ID для запроса следующей страницы (next).
+        """
+        return await self.get_all(page, filters=OVERDUE_FILTERS, sort="due_date")
 
-        Raises:
-            HTTPException: Если книга не найдена.
+    async def mark_overdue(self, after: Tuple[datetime, int] | None, limit: int) -> List[Tuple[datetime, int]]:
         """
-        book_service = BookService(async_session=self.session)
-        await book_service.store_obj_db_by_id_or_404(obj_id=book_id)
-        return book_service
+        Отмечает просроченными следующую порцию открытых выдач с истекшим сроком возврата.
+
+        Args:
+            after (Tuple[datetime, int] | None): Ключ (due_date, id) последней выдачи предыдущей порции.
+            limit (int): Размер порции.
+
+        Returns:
+            List[Tuple[datetime, int]]: Ключи (due_date, id) отмеченных выдач в порядке срока возврата.
+        """
+        return await self.repository.mark_overdue(after=after, limit=limit)
+
+    async def export(self, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        """
+        Потоковый экспорт всех выдач. Строки читаются из серверного курсора порциями,
+        поэтому потребление памяти не зависит от количества выдач.
+
+        Args:
+            export_format (ExportFormat): Формат выгрузки, NDJSON или CSV.
+
+        Yields:
+            bytes: Очередная порция выгрузки.
+        """
+        columns = list(BorrowResponse.model_fields)
+        if export_format == ExportFormat.csv:
+            yield self._rows_to_csv([columns])
+
+        async for rows in self.repository.stream_rows(columns=columns, batch_size=settings.api.export_batch_size):
+            if export_format == ExportFormat.csv:
+                yield self._rows_to_csv(rows)
+            else:
+                yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+    @staticmethod
+    def _rows_to_csv(rows: Sequence[Row] | list[list[str]]) -> bytes:
+        """
+        Преобразует порцию строк в CSV.
+
+        Args:
+            rows (Sequence[Row] | list[list[str]]): Строки для записи.
+
+        Returns:
+            bytes: Строки в формате CSV.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows)
+        return buffer.getvalue().encode()
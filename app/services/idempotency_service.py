@@ -0,0 +1,99 @@
+import hashlib
+from datetime import timedelta
+from typing import Awaitable, Callable, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.base import Base
+from app.repository.idempotency_repository import IdempotencyRepository
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyService:
+    """
+    Сервис идемпотентного создания записей по заголовку Idempotency-Key.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных, общая с сервисом, который создает запись.
+        repository (IdempotencyRepository): Репозиторий ключей идемпотентности.
+    """
+
+    def __init__(self, async_session: AsyncSession):
+        self.session = async_session
+        self.repository = IdempotencyRepository(session=async_session)
+
+    @staticmethod
+    def request_hash(request_in: BaseModel) -> str:
+        return hashlib.sha256(request_in.model_dump_json().encode()).hexdigest()
+
+    async def create_once(
+        self,
+        scope: str,
+        key: str,
+        request_in: BaseModel,
+        create: Callable[[], Awaitable[Base]],
+        response_model: Type[BaseModel],
+        exclude_none: bool = False,
+    ) -> Response:
+        """
+        Создает запись один раз на ключ. Ключ занимается до создания записи, ответ сохраняется
+        и фиксируется в одной транзакции с записью. Повтор запроса с тем же ключом получает
+        сохраненный ответ без повторного создания, если создание завершилось ошибкой - ключ не сохраняется.
+
+        Args:
+            scope (str): Область ключа, например название ресурса.
+            key (str): Значение заголовка Idempotency-Key.
+            request_in (BaseModel): Данные запроса.
+            create (Callable[[], Awaitable[Base]]): Создание записи в сессии сервиса, без commit.
+            response_model (Type[BaseModel]): Схема ответа.
+            exclude_none (bool): Не выводить поля со значением None.
+
+        Returns:
+            Response: Ответ 201 Created с созданной записью или сохраненный ответ.
+
+        Raises:
+            HTTPException: Если ключ уже использован с другими данными запроса.
+        """
+        request_hash = self.request_hash(request_in)
+        ttl = timedelta(seconds=settings.idempotency.ttl)
+        if not await self.repository.claim(scope=scope, key=key, request_hash=request_hash, ttl=ttl):
+            return await self._replay(scope=scope, key=key, request_hash=request_hash)
+
+        obj_db = await create()
+        content = (
+            response_model.model_validate(obj_db, from_attributes=True)
+            .model_dump_json(exclude_none=exclude_none)
+            .encode()
+        )
+        await self.repository.save_response(scope=scope, key=key, status_code=status.HTTP_201_CREATED, response=content)
+        return Response(content=content, status_code=status.HTTP_201_CREATED, media_type="application/json")
+
+    async def _replay(self, scope: str, key: str, request_hash: str) -> Response:
+        stored = await self.repository.get(scope=scope, key=key)
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key has already been used with a different request",
+            )
+        return Response(
+            content=stored.response,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    async def purge_expired(self, batch_size: int) -> int:
+        """
+        Удаляет порцию ключей с истекшим сроком хранения.
+
+        Args:
+            batch_size (int): Размер порции.
+
+        Returns:
+            int: Количество удаленных ключей.
+        """
+        return await self.repository.delete_expired(limit=batch_size)
@@ -0,0 +1,49 @@
+from typing import Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repository.stats_repository import StatsRepository
+
+
+class StatsService:
+    """
+    Сервис статистики выдач. Данные читаются из счетчиков, которые обновляются вместе с выдачами,
+    поэтому время ответа не зависит от количества выдач.
+
+    Attributes:
+        session (AsyncSession): Сессия базы данных.
+        repository (StatsRepository): Репозиторий статистики.
+    """
+
+    def __init__(self, async_session: AsyncSession):
+        self.session = async_session
+        self.repository = StatsRepository(session=async_session)
+
+    async def top_books(self, limit: int) -> Sequence[Row]:
+        return await self.repository.top_books(limit=limit)
+
+    async def active_readers(self, limit: int) -> Sequence[Row]:
+        return await self.repository.active_readers(limit=limit)
+
+    async def author_utilisation(self, limit: int) -> Sequence[Row]:
+        return await self.repository.author_utilisation(limit=limit)
+
+    async def daily_counts(self, days: int) -> Sequence[Row]:
+        return await self.repository.daily_counts(days=days)
+
+    async def refresh(self) -> bool:
+        """
+        Обновляет материализованные представления статистики.
+
+        Returns:
+            bool: Было ли выполнено обновление в этом процессе.
+        """
+        return await self.repository.refresh_author_utilisation()
+
+    async def rebuild_counters(self) -> None:
+        """
+        Пересчитывает счетчики статистики по таблице выдач и обновляет материализованные представления.
+        """
+        await self.repository.rebuild_counters()
+        await self.repository.refresh_author_utilisation()
@@ -0,0 +1,27 @@
+from app.config import settings
+from app.database.db import db
+from app.services.idempotency_service import IdempotencyService
+from app.tasks.periodic import PeriodicTask
+
+
+async def purge_idempotency_keys() -> int:
+    """
+    Удаляет ключи идемпотентности с истекшим сроком хранения порциями в коротких транзакциях.
+
+    Returns:
+        int: Количество удаленных ключей.
+    """
+    purged = 0
+    while True:
+        async with db.session_factory() as session:
+            deleted = await IdempotencyService(async_session=session).purge_expired(
+                batch_size=settings.idempotency.purge_batch_size
+            )
+        purged += deleted
+        if deleted < settings.idempotency.purge_batch_size:
+            return purged
+
+
+idempotency_purger = PeriodicTask(
+    name="purge_idempotency_keys", interval=settings.idempotency.purge_interval, job=purge_idempotency_keys
+)
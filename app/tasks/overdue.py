@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.db import db
+from app.services.borrow_service import BorrowService
+from app.tasks.periodic import PeriodicTask
+
+
+class OverdueScanner:
+    """
+    Проверка просроченных выдач. Открытые выдачи обходятся порциями по индексу в порядке (due_date, id),
+    каждая порция отмечается в отдельной короткой транзакции.
+    Ключ последней отмеченной выдачи сохраняется между проверками: срок возврата новых выдач всегда в будущем,
+    поэтому следующая проверка продолжает обход с места остановки, а не с начала индекса.
+
+    Attributes:
+        session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий основной базы данных.
+        batch_size (int): Размер порции.
+        cursor (Tuple[datetime, int] | None): Ключ (due_date, id) последней отмеченной выдачи.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], batch_size: int) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.cursor: Tuple[datetime, int] | None = None
+
+    async def scan(self) -> int:
+        """
+        Отмечает просроченными все открытые выдачи с истекшим сроком возврата.
+
+        Returns:
+            int: Количество отмеченных выдач.
+        """
+        marked = 0
+        while True:
+            async with self.session_factory() as session:
+                batch = await BorrowService(async_session=session).mark_overdue(
+                    after=self.cursor, limit=self.batch_size
+                )
+            if not batch:
+                return marked
+            self.cursor = batch[-1]
+            marked += len(batch)
+            if len(batch) < self.batch_size:
+                return marked
+
+
+overdue_scanner = OverdueScanner(session_factory=db.session_factory, batch_size=settings.borrow.overdue_batch_size)
+
+overdue_task = PeriodicTask(
+    name="scan_overdue", interval=settings.borrow.overdue_scan_interval, job=overdue_scanner.scan
+)
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from app.log_config import logger
+
+
+class PeriodicTask:
+    """
+    Фоновая задача, выполняемая с заданным интервалом в течение жизни приложения.
+    Ошибка выполнения записывается в лог и не останавливает задачу.
+
+    Attributes:
+        name (str): Название задачи для лога.
+        interval (float): Интервал между запусками, в секундах.
+        job (Callable[[], Awaitable[object]]): Выполняемая корутина.
+    """
+
+    def __init__(self, name: str, interval: float, job: Callable[[], Awaitable[object]]) -> None:
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.job()
+            except Exception as exc:
+                logger.error("Periodic task %s failed: %s", self.name, exc)
@@ -0,0 +1,15 @@
+from app.config import settings
+from app.database.db import db
+from app.services.stats_service import StatsService
+from app.tasks.periodic import PeriodicTask
+
+
+async def refresh_stats() -> None:
+    """
+    Обновляет материализованные представления статистики на основной базе данных.
+    """
+    async with db.session_factory() as session:
+        await StatsService(async_session=session).refresh()
+
+
+stats_refresher = PeriodicTask(name="refresh_stats", interval=settings.stats.refresh_interval, job=refresh_stats)
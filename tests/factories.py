@@ -1,11 +1,25 @@
-from datetime import timedelta
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from typing import Iterable, Iterator, List, Sequence, Tuple
 
 import factory
+import orjson
 from faker import Faker
-import random
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+
+from app.config import settings
+from app.services.stats_service import StatsService
 
 fake = Faker()
 
+LOAN_PERIOD = timedelta(days=settings.borrow.loan_days)
+
 
 class AuthorFactory(factory.Factory):
     class Meta:
@@ -20,9 +34,12 @@ class BookFactory(factory.Factory):
     class Meta:
         model = dict
 
-    title = factory.LazyAttribute(lambda _: fake.catch_phrase())
+    class Params:
+        author_ids = factory.LazyFunction(list)
+
+    title = factory.LazyAttribute(lambda _: fake.catch_phrase()[:50])
     description = factory.LazyAttribute(lambda _: fake.text(max_nb_chars=50))
-    author_id = factory.LazyAttribute(lambda _: random.choice(authors_id_from_db))
+    author_id = factory.LazyAttribute(lambda book: random.choice(book.author_ids))
     available = factory.LazyAttribute(lambda _: random.randint(0, 10))
 
 
@@ -30,12 +47,222 @@ class BorrowFactory(factory.Factory):
     class Meta:
         model = dict
 
-    book_id = factory.LazyAttribute(lambda _: random.choice(books_id_from_db))
-    reader_name = factory.LazyAttribute(lambda _: fake.name())
+    class Params:
+        book_ids = factory.LazyFunction(list)
+        returned = factory.LazyAttribute(lambda _: random.random() < 0.8)
+
+    book_id = factory.LazyAttribute(lambda borrow: random.choice(borrow.book_ids))
+    reader_name = factory.LazyAttribute(lambda _: fake.name()[:50])
     borrow_date = factory.LazyAttribute(lambda _: fake.date_time_this_year())
-    return_date = factory.LazyAttribute(lambda _: fake.date_time_this_year() + timedelta(days=random.randint(1, 30)))
+    due_date = factory.LazyAttribute(lambda borrow: borrow.borrow_date + LOAN_PERIOD)
+    return_date = factory.LazyAttribute(
+        lambda borrow: borrow.borrow_date + timedelta(days=random.randint(1, 30)) if borrow.returned else None
+    )
+
+
+def zipf_cum_weights(size: int, skew: float) -> List[float]:
+    """
+    Накопительные веса распределения Ципфа: элемент с рангом k выбирается с вероятностью ~ 1 / k^skew.
+    """
+    return list(accumulate(1 / rank**skew for rank in range(1, size + 1)))
+
+
+def batched(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class FakeGenerator:
-    def __init__(self):
-        pass
+    """
+    Генератор данных библиотеки с перекосом, как в реальной нагрузке: у немногих авторов большинство книг,
+    немногие книги и читатели дают большинство выдач. Строки генерируются потоково из заранее
+    подготовленных наборов имен, поэтому миллионы строк не требуют миллионов вызовов Faker.
+
+    Attributes:
+        random (random.Random): Генератор случайных чисел.
+        skew (float): Показатель распределения Ципфа.
+        now (datetime): Момент, относительно которого генерируются даты.
+    """
+
+    def __init__(self, seed: int | None = None, skew: float = 1.1, pool_size: int = 1000) -> None:
+        self.random = random.Random(seed)
+        self.skew = skew
+        self.now = datetime.now().replace(microsecond=0)
+        faker = Faker()
+        faker.seed_instance(seed)
+        self.first_names = [faker.first_name() for _ in range(pool_size)]
+        self.last_names = [faker.last_name() for _ in range(pool_size)]
+        self.phrases = [faker.catch_phrase()[:36] for _ in range(pool_size)]
+        self.texts = [faker.text(max_nb_chars=200) for _ in range(pool_size)]
+
+    def pick(self, cum_weights: Sequence[float]) -> int:
+        """
+        Индекс элемента по накопительным весам.
+        """
+        return bisect_left(cum_weights, self.random.random() * cum_weights[-1])
+
+    def authors(self, count: int) -> Iterator[tuple]:
+        """
+        Строки (first_name, last_name, birth_date). Пары имени и фамилии уникальны.
+        """
+        for number in range(count):
+            yield (
+                self.random.choice(self.first_names),
+                f"{self.random.choice(self.last_names)} {number}",
+                (self.now - timedelta(days=self.random.randint(20 * 365, 90 * 365))).date(),
+            )
+
+    def books(self, count: int, author_ids: Sequence[int]) -> Iterator[tuple]:
+        """
+        Строки (title, description, author_id, available). Авторы выбираются с перекосом Ципфа.
+        """
+        authors = zipf_cum_weights(len(author_ids), self.skew)
+        for number in range(count):
+            yield (
+                f"{self.random.choice(self.phrases)} {number}",
+                self.random.choice(self.texts),
+                author_ids[self.pick(authors)],
+                self.random.randint(1, 10),
+            )
+
+    def borrows(self, count: int, books: Sequence[Tuple[int, int]]) -> Iterator[tuple]:
+        """
+        Строки (book_id, reader_name, borrow_date, due_date, return_date). Книги и читатели выбираются
+        с перекосом Ципфа. Открытой выдача остается, только если у книги есть свободный экземпляр,
+        поэтому количество открытых выдач книги не превышает количества ее экземпляров.
+
+        Args:
+            count (int): Количество выдач.
+            books (Sequence[Tuple[int, int]]): Пары (id, количество экземпляров) книг.
+        """
+        stock = [available for _, available in books]
+        popularity = zipf_cum_weights(len(books), self.skew)
+        readers = [
+            f"{self.random.choice(self.first_names)} {self.random.choice(self.last_names)}"[:40] + f" {number}"
+            for number in range(max(count // 20, 1))
+        ]
+        activity = zipf_cum_weights(len(readers), self.skew)
+        for _ in range(count):
+            position = self.pick(popularity)
+            opened = stock[position] > 0 and self.random.random() < 0.2
+            if opened:
+                stock[position] -= 1
+                borrow_date = self.now - timedelta(seconds=self.random.randint(0, 30 * 24 * 3600))
+                return_date = None
+            else:
+                borrow_date = self.now - timedelta(seconds=self.random.randint(31 * 24 * 3600, 365 * 24 * 3600))
+                return_date = borrow_date + timedelta(seconds=self.random.randint(3600, 30 * 24 * 3600))
+            yield (
+                books[position][0],
+                readers[self.pick(activity)],
+                borrow_date,
+                borrow_date + LOAN_PERIOD,
+                return_date,
+            )
+
+
+async def copy_rows(
+    conn: AsyncConnection, table: str, columns: List[str], rows: Iterable[tuple], batch_size: int
+) -> int:
+    """
+    Загружает строки в таблицу через COPY порциями по batch_size строк.
+
+    Returns:
+        int: Количество загруженных строк.
+    """
+    driver_connection = (await conn.get_raw_connection()).driver_connection
+    copied = 0
+    for batch in batched(rows, batch_size):
+        await driver_connection.copy_records_to_table(table, records=batch, columns=columns)
+        copied += len(batch)
+    return copied
+
+
+async def new_ids(conn: AsyncConnection, table: str, after: int) -> List[int]:
+    return list(await conn.scalars(text(f"SELECT id FROM {table} WHERE id > :after ORDER BY id"), {"after": after}))
+
+
+async def max_id(conn: AsyncConnection, table: str) -> int:
+    return await conn.scalar(text(f"SELECT coalesce(max(id), 0) FROM {table}"))
+
+
+async def seed(
+    engine: AsyncEngine,
+    authors: int,
+    books: int,
+    borrows: int,
+    batch_size: int = 50000,
+    random_seed: int | None = None,
+    skew: float = 1.1,
+) -> dict:
+    """
+    Заполняет базу данных сгенерированными авторами, книгами и выдачами через COPY.
+    После загрузки выдач количество экземпляров книг уменьшается на открытые выдачи,
+    а счетчики статистики пересчитываются.
+
+    Returns:
+        dict: Количество загруженных строк по таблицам и время загрузки.
+    """
+    generator = FakeGenerator(seed=random_seed, skew=skew)
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        after = await max_id(conn, "authors")
+        await copy_rows(
+            conn, "authors", ["first_name", "last_name", "birth_date"], generator.authors(authors), batch_size
+        )
+        author_ids = await new_ids(conn, "authors", after)
+
+        after = await max_id(conn, "books")
+        columns = ["title", "description", "author_id", "available"]
+        await copy_rows(conn, "books", columns, generator.books(books, author_ids), batch_size)
+        book_rows = (
+            await conn.execute(text("SELECT id, available FROM books WHERE id > :after ORDER BY id"), {"after": after})
+        ).all()
+
+        columns = ["book_id", "reader_name", "borrow_date", "due_date", "return_date"]
+        await copy_rows(conn, "borrows", columns, generator.borrows(borrows, book_rows), batch_size)
+        await conn.execute(
+            text(
+                "UPDATE books SET available = books.available - opened.count"
+                " FROM (SELECT book_id, count(*) FROM borrows WHERE return_date IS NULL AND book_id > :after"
+                " GROUP BY book_id) AS opened"
+                " WHERE books.id = opened.book_id"
+            ),
+            {"after": after},
+        )
+
+    async with AsyncSession(engine) as session:
+        await StatsService(async_session=session).rebuild_counters()
+    return {"authors": authors, "books": books, "borrows": borrows, "seconds": round(time.perf_counter() - start, 3)}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Заполнение базы данных сгенерированными данными.")
+    parser.add_argument("--url", default=settings.db.url)
+    parser.add_argument("--authors", type=int, default=10000)
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--borrows", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--skew", type=float, default=1.1)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    try:
+        result = await seed(
+            engine,
+            authors=args.authors,
+            books=args.books,
+            borrows=args.borrows,
+            batch_size=args.batch_size,
+            random_seed=args.seed,
+            skew=args.skew,
+        )
+    finally:
+        await engine.dispose()
+    print(orjson.dumps(result).decode())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
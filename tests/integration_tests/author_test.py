@@ -10,3 +10,54 @@ async def test_create_author_endpoint(test_client) -> None:
     data = response.json()
     data.pop("id")
     assert sorted(data) == sorted(test_data_create)
+
+
+@pytest.mark.asyncio
+async def test_get_authors_keyset_pagination(test_client) -> None:
+    for i in range(5):
+        await test_client.post("/authors/", json={**test_data_create, "first_name": f"author{i}"})
+
+    response = await test_client.get("/authors/", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next"] == first_page["items"][-1]["id"]
+
+    response = await test_client.get("/authors/", params={"limit": 2, "after": first_page["next"]})
+    second_page = response.json()
+    assert [item["id"] for item in second_page["items"]] == [first_page["next"] + 1, first_page["next"] + 2]
+
+    response = await test_client.get("/authors/", params={"limit": 2, "after": second_page["next"]})
+    last_page = response.json()
+    assert len(last_page["items"]) == 1
+    assert last_page["next"] is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_authors_reports_duplicates(test_client) -> None:
+    await test_client.post("/authors/", json=test_data_create)
+    new_author = {**test_data_create, "first_name": "новый"}
+
+    response = await test_client.post("/authors/bulk", json=[test_data_create, new_author, new_author])
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == ["duplicate", "created", "duplicate"]
+    assert results[1]["id"] is not None
+    assert results[0]["id"] is None and results[2]["id"] is None
+
+
+@pytest.mark.asyncio
+async def test_search_authors_by_name(test_client) -> None:
+    authors_in = [
+        {"first_name": "Лев", "last_name": "Толстой", "birth_date": "1828-09-09"},
+        {"first_name": "Алексей", "last_name": "Толстой", "birth_date": "1883-01-10"},
+        {"first_name": "Антон", "last_name": "Чехов", "birth_date": "1860-01-29"},
+    ]
+    ids = [result["id"] for result in (await test_client.post("/authors/bulk", json=authors_in)).json()]
+
+    response = await test_client.get("/authors/search", params={"q": "толстой"})
+    assert response.status_code == 200
+    assert [author["id"] for author in response.json()] == ids[:2]
+
+    response = await test_client.get("/authors/search", params={"q": "лев толстой"})
+    assert [author["id"] for author in response.json()] == [ids[0]]
@@ -0,0 +1,263 @@
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event, func, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.models.idempotency_model import idempotency_keys
+from app.monitoring.metrics import SINGLE_FLIGHT_CALLS
+from app.repository.book_repository import BookRepository
+from app.services.idempotency_service import IdempotencyService
+from tests.conftest import assert_max_queries, test_engine
+
+test_author = {"first_name": "Фёдор", "last_name": "Достоевский", "birth_date": "1821-11-11"}
+test_book = {"title": "Идиот", "description": "Роман", "available": 2}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_books_checks_authors_and_duplicates(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    books_in = [
+        {**test_book, "author_id": author["id"]},
+        {**test_book, "author_id": author["id"] + 100},
+        {**test_book, "author_id": author["id"]},
+        {**test_book, "title": "Бесы", "author_id": author["id"]},
+    ]
+
+    response = await test_client.post("/books/bulk", json=books_in)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == ["created", "author_not_found", "duplicate", "created"]
+
+    books = (await test_client.get("/books/")).json()["items"]
+    assert {book["id"] for book in books} == {results[0]["id"], results[3]["id"]}
+
+
+@pytest.mark.asyncio
+async def test_get_book_is_served_from_cache_and_invalidated_on_write(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    book = (await test_client.post("/books/", json={**test_book, "author_id": author["id"]})).json()
+
+    hits_before = (await test_client.get("/system/cache")).json()["hits"]
+    await test_client.get(f"/books/{book['id']}")
+    assert (await test_client.get(f"/books/{book['id']}")).json() == book
+    assert (await test_client.get("/system/cache")).json()["hits"] == hits_before + 1
+
+    await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "reader"})
+    assert (await test_client.get(f"/books/{book['id']}")).json()["available"] == book["available"] - 1
+
+    await test_client.put(f"/books/{book['id']}", json={**book, "title": "Игрок"})
+    assert (await test_client.get(f"/books/{book['id']}")).json()["title"] == "Игрок"
+
+    await test_client.delete(f"/authors/{author['id']}")
+    assert (await test_client.get(f"/books/{book['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_book_etag_conditional_get(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    book = (await test_client.post("/books/", json={**test_book, "author_id": author["id"]})).json()
+
+    response = await test_client.get(f"/books/{book['id']}")
+    etag = response.headers["etag"]
+    response = await test_client.get(f"/books/{book['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    list_etag = (await test_client.get("/books/")).headers["etag"]
+    response = await test_client.get("/books/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == list_etag
+
+    await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "reader"})
+    response = await test_client.get(f"/books/{book['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    response = await test_client.get("/books/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != list_etag
+
+
+@pytest.mark.asyncio
+async def test_page_etag_matches_validator_for_every_page(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    for i in range(5):
+        await test_client.post("/books/", json={**test_book, "title": f"book{i}", "author_id": author["id"]})
+
+    after = None
+    while True:
+        params = {"limit": 2} | ({"after": after} if after else {})
+        response = await test_client.get("/books/", params=params)
+        conditional = await test_client.get(
+            "/books/", params=params, headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert conditional.status_code == 304
+        after = response.json()["next"]
+        if after is None:
+            break
+
+
+@pytest.mark.asyncio
+async def test_search_books_by_title_description_and_author(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    books_in = [
+        {"title": "Бесы", "description": "Роман о революционерах", "author_id": author["id"], "available": 1},
+        {
+            "title": "Игрок",
+            "description": "Повесть о рулетке и бесах азарта",
+            "author_id": author["id"],
+            "available": 1,
+        },
+        {"title": "Идиот", "description": "Роман о князе Мышкине", "author_id": author["id"], "available": 1},
+    ]
+    ids = [result["id"] for result in (await test_client.post("/books/bulk", json=books_in)).json()]
+
+    response = await test_client.get("/books/search", params={"q": "бесы"})
+    assert response.status_code == 200
+    assert [book["id"] for book in response.json()] == [ids[0], ids[1]]
+
+    response = await test_client.get("/books/search", params={"q": "достоевский роман", "limit": 1})
+    assert [book["id"] for book in response.json()] == [ids[0]]
+
+    await test_client.put(f"/authors/{author['id']}", json={**test_author, "last_name": "Dostoevsky"})
+    response = await test_client.get("/books/search", params={"q": "dostoevsky"})
+    assert {book["id"] for book in response.json()} == set(ids)
+
+    assert (await test_client.get("/books/search", params={"q": "толстой"})).json() == []
+    assert (await test_client.get("/books/search", params={"q": ""})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_books_filters_and_sort(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    other_author = (await test_client.post("/authors/", json={**test_author, "last_name": "Толстой"})).json()
+    books_in = [
+        {**test_book, "title": "Бесы", "author_id": author["id"], "available": 0},
+        {**test_book, "title": "Идиот", "author_id": author["id"], "available": 2},
+        {**test_book, "title": "Бедные люди", "author_id": author["id"], "available": 1},
+        {**test_book, "title": "Война и мир", "author_id": other_author["id"], "available": 5},
+    ]
+    ids = [result["id"] for result in (await test_client.post("/books/bulk", json=books_in)).json()]
+
+    params = {"author_id": author["id"], "available__gt": 0, "sort": "-title", "limit": 1}
+    titles, after = [], None
+    while True:
+        response = await test_client.get("/books/", params=params | ({"after": after} if after else {}))
+        conditional = await test_client.get(
+            "/books/",
+            params=params | ({"after": after} if after else {}),
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert conditional.status_code == 304
+        page = response.json()
+        titles += [book["title"] for book in page["items"]]
+        after = page["next"]
+        if after is None:
+            break
+    assert titles == ["Идиот", "Бедные люди"]
+
+    items = (await test_client.get("/books/", params={"sort": "-available"})).json()["items"]
+    assert [book["id"] for book in items] == [ids[3], ids[1], ids[2], ids[0]]
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_ids(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    books_in = [{**test_book, "title": title, "author_id": author["id"]} for title in ["Бесы", "Идиот", "Игрок"]]
+    ids = [result["id"] for result in (await test_client.post("/books/bulk", json=books_in)).json()]
+
+    params = {"ids": f"{ids[2]},{ids[0]},{ids[2] + 100},{ids[0]}", "expand": "author"}
+    page = (await test_client.get("/books/", params=params)).json()
+    assert [book["id"] for book in page["items"]] == [ids[2], ids[0]]
+    assert page["items"][0]["author"]["id"] == author["id"]
+    assert page["next"] is None
+
+    assert (await test_client.get("/books/", params={"ids": "1,a"})).status_code == 422
+    too_many = ",".join(str(obj_id) for obj_id in range(settings.api.max_page_limit + 1))
+    assert (await test_client.get("/books/", params={"ids": too_many})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_one_calls_share_one_query(test_client, test_db_session) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    books_in = [{**test_book, "title": title, "author_id": author["id"]} for title in ["Бесы", "Идиот", "Игрок"]]
+    ids = [result["id"] for result in (await test_client.post("/books/bulk", json=books_in)).json()]
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    repository = BookRepository(session=test_db_session)
+    event.listen(test_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        books = await asyncio.gather(*(repository.get_one(obj_id) for obj_id in [*ids, ids[0], ids[0] + 100]))
+        await repository.get_one(ids[1])
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert len([statement for statement in statements if statement.startswith("SELECT")]) == 1
+    assert [book.id if book else None for book in books] == [*ids, ids[0], None]
+
+
+@pytest.mark.asyncio
+async def test_fast_list_serialization_matches_response_model(test_client, monkeypatch) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    for i in range(3):
+        await test_client.post("/books/", json={**test_book, "title": f"book{i}", "author_id": author["id"]})
+
+    for params in ({"limit": 2}, {"limit": 2, "sort": "-title"}, {"author_id": author["id"]}):
+        expected = await test_client.get("/books/", params=params)
+        monkeypatch.setattr(settings.api, "fast_list_serialization", True)
+        response = await test_client.get("/books/", params=params)
+        monkeypatch.setattr(settings.api, "fast_list_serialization", False)
+
+        assert response.status_code == 200
+        assert response.json() == expected.json()
+        assert response.headers["etag"] == expected.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_create_book_with_idempotency_key_replays_response(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    book_in = {**test_book, "author_id": author["id"]}
+    headers = {"Idempotency-Key": "book-1"}
+
+    created = await test_client.post("/books/", json=book_in, headers=headers)
+    replayed = await test_client.post("/books/", json=book_in, headers=headers)
+    assert created.status_code == replayed.status_code == 201
+    assert replayed.json() == created.json()
+    assert replayed.headers["idempotent-replayed"] == "true"
+    assert len((await test_client.get("/books/")).json()["items"]) == 1
+
+    async with async_sessionmaker(test_engine)() as session:
+        await session.execute(update(idempotency_keys).values(expires_at=func.now() - timedelta(seconds=1)))
+        await session.commit()
+        assert await IdempotencyService(async_session=session).purge_expired(batch_size=10) == 1
+    assert (await test_client.post("/books/", json=book_in, headers=headers)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_in_different_sessions_share_one_query(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    book = (await test_client.post("/books/", json={**test_book, "author_id": author["id"]})).json()
+    read_session = async_sessionmaker(test_engine, expire_on_commit=False, info={"read_only": True})
+    followers_before = SINGLE_FLIGHT_CALLS.values.get(("books.get_one", "follower"), 0)
+
+    async def read(session) -> tuple:
+        repository = BookRepository(session=session)
+        book_db, page = await asyncio.gather(repository.get_one(book["id"]), repository.get_all(limit=10))
+        assert book_db in session and all(obj_db in session for obj_db in page)
+        return book_db.title, [obj_db.id for obj_db in page]
+
+    async with AsyncExitStack() as stack:
+        sessions = [await stack.enter_async_context(read_session()) for _ in range(20)]
+        async with assert_max_queries(2):
+            results = await asyncio.gather(*(read(session) for session in sessions))
+
+    assert results == [(book["title"], [book["id"]])] * 20
+    assert SINGLE_FLIGHT_CALLS.values[("books.get_one", "follower")] - followers_before == 19
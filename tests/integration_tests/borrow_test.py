@@ -0,0 +1,218 @@
+import asyncio
+import csv
+import io
+from datetime import timedelta
+
+import orjson
+import pytest
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.models.borrow_model import Borrow
+from app.tasks.overdue import OverdueScanner
+from tests.conftest import assert_max_queries, test_engine
+
+test_author = {"first_name": "Лев", "last_name": "Толстой", "birth_date": "1828-09-09"}
+test_book = {"title": "Война и мир", "description": "Роман-эпопея", "available": 3}
+
+
+async def create_book(test_client, **book_fields) -> dict:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    response = await test_client.post("/books/", json={**test_book, "author_id": author["id"], **book_fields})
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_export_borrows_ndjson_and_csv(test_client) -> None:
+    book = await create_book(test_client)
+    for reader_name in ["reader1", "reader2"]:
+        await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": reader_name})
+
+    response = await test_client.get("/borrows/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["reader_name"] for row in rows] == ["reader1", "reader2"]
+    assert rows[0]["return_date"] is None
+
+    response = await test_client.get("/borrows/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["reader_name"] for row in rows] == ["reader1", "reader2"]
+    assert rows[0]["book_id"] == str(book["id"])
+
+
+@pytest.mark.asyncio
+async def test_create_borrow_concurrent_requests_never_oversell(test_client) -> None:
+    book = await create_book(test_client, available=3)
+
+    responses = await asyncio.gather(
+        *(test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": f"r{i}"}) for i in range(10))
+    )
+    assert sorted(response.status_code for response in responses) == [201] * 3 + [400] * 7
+    assert (await test_client.get(f"/books/{book['id']}")).json()["available"] == 0
+
+
+@pytest.mark.asyncio
+async def test_create_borrow_unknown_book(test_client) -> None:
+    response = await test_client.post("/borrows/", json={"book_id": 1, "reader_name": "reader"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_return_borrow_restocks_once(test_client) -> None:
+    book = await create_book(test_client, available=1)
+    borrow = (await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "reader"})).json()
+
+    responses = await asyncio.gather(*(test_client.patch(f"/borrows/{borrow['id']}/return") for _ in range(5)))
+    assert sorted(response.status_code for response in responses) == [200] + [400] * 4
+    returned = next(response.json() for response in responses if response.status_code == 200)
+    assert returned["id"] == borrow["id"] and returned["return_date"] is not None
+    assert (await test_client.get(f"/books/{book['id']}")).json()["available"] == 1
+
+    response = await test_client.patch(f"/borrows/{borrow['id'] + 1}/return")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_borrows_filters_and_sort(test_client) -> None:
+    book = await create_book(test_client)
+    borrows = []
+    for reader_name in ["Анна", "Борис", "Анна"]:
+        response = await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": reader_name})
+        borrows.append(response.json())
+    await test_client.patch(f"/borrows/{borrows[0]['id']}/return")
+
+    params = {"reader_name": "Анна", "return_date__isnull": True}
+    items = (await test_client.get("/borrows/", params=params)).json()["items"]
+    assert [borrow["id"] for borrow in items] == [borrows[2]["id"]]
+
+    params = {"borrow_date__gte": borrows[1]["borrow_date"], "sort": "-borrow_date", "limit": 1}
+    first_page = (await test_client.get("/borrows/", params=params)).json()
+    second_page = (await test_client.get("/borrows/", params={**params, "after": first_page["next"]})).json()
+    assert [first_page["items"][0]["id"], second_page["items"][0]["id"]] == [borrows[2]["id"], borrows[1]["id"]]
+    assert "next" not in second_page
+
+    assert (await test_client.get("/borrows/", params={"sort": "reader_name"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_borrows_expand_book_and_author(test_client) -> None:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    for title in ["Анна Каренина", "Воскресение", "Детство"]:
+        book = (await test_client.post("/books/", json={**test_book, "title": title, "author_id": author["id"]})).json()
+        await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "Анна"})
+
+    async with assert_max_queries(3) as statements:
+        response = await test_client.get("/borrows/", params={"expand": "book,book.author"})
+
+    assert response.status_code == 200
+    assert len(statements) == 3
+    items = response.json()["items"]
+    assert [borrow["book"]["title"] for borrow in items] == ["Анна Каренина", "Воскресение", "Детство"]
+    assert {borrow["book"]["author"]["last_name"] for borrow in items} == {test_author["last_name"]}
+
+    plain = (await test_client.get("/borrows/")).json()["items"]
+    assert all("book" not in borrow for borrow in plain)
+
+    borrow_id = items[0]["id"]
+    response = await test_client.get(f"/borrows/{borrow_id}", params={"expand": "book.author"})
+    etag = response.headers["etag"]
+    assert response.json()["book"]["author"]["first_name"] == test_author["first_name"]
+    assert "book" not in (await test_client.get(f"/borrows/{borrow_id}")).json()
+
+    author_id = response.json()["book"]["author"]["id"]
+    await test_client.put(f"/authors/{author_id}", json={**test_author, "first_name": "Лёва"})
+    response = await test_client.get(
+        f"/borrows/{borrow_id}", params={"expand": "book.author"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["book"]["author"]["first_name"] == "Лёва"
+
+    assert (await test_client.get("/borrows/", params={"expand": "reader"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_overdue_scanner_marks_borrows_in_batches(test_client, test_db_session) -> None:
+    book = await create_book(test_client, available=5)
+    borrows = []
+    for reader_name in ["reader1", "reader2", "reader3", "reader4"]:
+        response = await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": reader_name})
+        borrows.append(response.json())
+    assert borrows[0]["due_date"] > borrows[0]["borrow_date"]
+
+    overdue_ids = [borrow["id"] for borrow in borrows[:3]]
+    await test_db_session.execute(
+        update(Borrow)
+        .where(Borrow.id.in_(overdue_ids))
+        .values(due_date=func.now() - timedelta(days=1) - Borrow.id * timedelta(minutes=1))
+    )
+    await test_db_session.commit()
+    await test_client.patch(f"/borrows/{overdue_ids[0]}/return")
+
+    response = await test_client.get("/borrows/overdue", params={"limit": 1})
+    assert [borrow["id"] for borrow in response.json()["items"]] == [overdue_ids[2]]
+    response = await test_client.get("/borrows/overdue", params={"after": response.json()["next"]})
+    assert [borrow["id"] for borrow in response.json()["items"]] == [overdue_ids[1]]
+
+    scanner = OverdueScanner(session_factory=async_sessionmaker(test_engine), batch_size=1)
+    assert await scanner.scan() == 2
+    assert scanner.cursor[1] == overdue_ids[1]
+    assert await scanner.scan() == 0
+
+    response = await test_client.get("/borrows/overdue")
+    assert all(borrow["overdue_at"] for borrow in response.json()["items"])
+    assert (await test_client.get(f"/borrows/{borrows[3]['id']}")).json().get("overdue_at") is None
+
+
+@pytest.mark.asyncio
+async def test_fast_list_serialization_omits_none_like_response_model(test_client, monkeypatch) -> None:
+    book = await create_book(test_client)
+    borrows = [
+        (await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": f"r{i}"})).json()
+        for i in range(3)
+    ]
+    await test_client.patch(f"/borrows/{borrows[0]['id']}/return")
+
+    for params in ({}, {"limit": 2}):
+        expected = await test_client.get("/borrows/", params=params)
+        monkeypatch.setattr(settings.api, "fast_list_serialization", True)
+        response = await test_client.get("/borrows/", params=params)
+        monkeypatch.setattr(settings.api, "fast_list_serialization", False)
+
+        assert response.status_code == 200
+        assert response.json() == expected.json()
+        assert response.headers["etag"] == expected.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_create_borrow_with_idempotency_key_runs_once(test_client) -> None:
+    book = await create_book(test_client, available=3)
+    borrow_in = {"book_id": book["id"], "reader_name": "reader"}
+    headers = {"Idempotency-Key": "retry-1"}
+
+    responses = await asyncio.gather(
+        *(test_client.post("/borrows/", json=borrow_in, headers=headers) for _ in range(5))
+    )
+    assert [response.status_code for response in responses] == [201] * 5
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum("idempotent-replayed" in response.headers for response in responses) == 4
+    assert (await test_client.get(f"/books/{book['id']}")).json()["available"] == 2
+
+    response = await test_client.post("/borrows/", json={**borrow_in, "reader_name": "other"}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_failed_create_borrow_does_not_store_idempotency_key(test_client) -> None:
+    book = await create_book(test_client, available=1)
+    borrow = (await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "first"})).json()
+    borrow_in = {"book_id": book["id"], "reader_name": "reader"}
+    headers = {"Idempotency-Key": "retry-2"}
+
+    assert (await test_client.post("/borrows/", json=borrow_in, headers=headers)).status_code == 400
+    await test_client.patch(f"/borrows/{borrow['id']}/return")
+    response = await test_client.post("/borrows/", json=borrow_in, headers=headers)
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
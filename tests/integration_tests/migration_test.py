@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import inspect, text
+
+from app.database.migrate import load_migrations, migrate, migration_version
+from app.models.base import Base
+from tests.conftest import test_engine
+
+
+def describe_schema(sync_conn) -> dict:
+    inspector = inspect(sync_conn)
+    return {
+        table: {
+            "columns": {
+                column["name"]: (str(column["type"]), column["nullable"], column["default"])
+                for column in inspector.get_columns(table)
+            },
+            "indexes": {
+                index["name"]: (index["column_names"], index.get("dialect_options", {}).get("postgresql_where"))
+                for index in inspector.get_indexes(table)
+            },
+            "unique": sorted(
+                tuple(constraint["column_names"]) for constraint in inspector.get_unique_constraints(table)
+            ),
+            "foreign_keys": sorted(
+                (tuple(fk["constrained_columns"]), fk["referred_table"]) for fk in inspector.get_foreign_keys(table)
+            ),
+        }
+        for table in Base.metadata.tables
+    }
+
+
+@pytest.mark.asyncio
+async def test_migrations_build_the_model_schema() -> None:
+    async with test_engine.connect() as conn:
+        model_schema = await conn.run_sync(describe_schema)
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    try:
+        applied = await migrate(test_engine)
+        assert applied == [migration_version(migration) for migration in load_migrations()]
+        assert await migrate(test_engine) == []
+
+        async with test_engine.connect() as conn:
+            assert await conn.run_sync(describe_schema) == model_schema
+    finally:
+        async with test_engine.begin() as conn:
+            await conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
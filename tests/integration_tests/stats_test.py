@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.stats_service import StatsService
+
+test_author = {"first_name": "Лев", "last_name": "Толстой", "birth_date": "1828-09-09"}
+
+
+async def create_books(test_client, *availables: int) -> list[dict]:
+    author = (await test_client.post("/authors/", json=test_author)).json()
+    books = []
+    for number, available in enumerate(availables):
+        book_in = {
+            "title": f"Книга {number}",
+            "description": "Роман",
+            "available": available,
+            "author_id": author["id"],
+        }
+        books.append((await test_client.post("/books/", json=book_in)).json())
+    return books
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_borrows_and_returns(test_client) -> None:
+    first, second = await create_books(test_client, 3, 3)
+    borrows = []
+    for book, reader_name in [(first, "reader1"), (first, "reader2"), (second, "reader1")]:
+        response = await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": reader_name})
+        borrows.append(response.json())
+    await test_client.patch(f"/borrows/{borrows[0]['id']}/return")
+    await test_client.patch(f"/borrows/{borrows[0]['id']}/return")
+
+    response = await test_client.get("/stats/books/top")
+    assert response.status_code == 200
+    assert [(book["book_id"], book["total_borrows"], book["active_borrows"]) for book in response.json()] == [
+        (first["id"], 2, 1),
+        (second["id"], 1, 1),
+    ]
+
+    response = await test_client.get("/stats/readers/active")
+    assert [(reader["reader_name"], reader["active_borrows"]) for reader in response.json()] == [
+        ("reader2", 1),
+        ("reader1", 1),
+    ]
+
+    response = await test_client.get("/stats/borrows/daily", params={"days": 7})
+    assert [(day["borrows"], day["returns"]) for day in response.json()] == [(3, 1)]
+
+
+@pytest.mark.asyncio
+async def test_deleting_book_releases_reader_counters(test_client) -> None:
+    (book,) = await create_books(test_client, 2)
+    await test_client.post("/borrows/", json={"book_id": book["id"], "reader_name": "reader1"})
+
+    assert (await test_client.delete(f"/books/{book['id']}")).status_code == 204
+    assert (await test_client.get("/stats/books/top")).json() == []
+    assert (await test_client.get("/stats/readers/active")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_author_utilisation_is_refreshed(test_client, test_db_session) -> None:
+    first, second = await create_books(test_client, 1, 3)
+    await test_client.post("/borrows/", json={"book_id": first["id"], "reader_name": "reader1"})
+
+    assert await StatsService(async_session=test_db_session).refresh()
+
+    response = await test_client.get("/stats/authors/utilisation")
+    assert response.status_code == 200
+    (author,) = response.json()
+    assert (author["books"], author["available"], author["active_borrows"]) == (2, 3, 1)
+    assert author["utilisation"] == pytest.approx(0.25)
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+
+from tests.conftest import test_engine
+from tests.factories import BookFactory, BorrowFactory, seed
+from tests.load_harness import MIXES, percentile, run_load
+
+
+def test_factories_use_given_ids() -> None:
+    book = BookFactory(author_ids=[7])
+    borrow = BorrowFactory(book_ids=[3], returned=False)
+    assert book["author_id"] == 7
+    assert borrow["book_id"] == 3 and borrow["return_date"] is None
+    assert borrow["due_date"] > borrow["borrow_date"]
+
+
+@pytest.mark.asyncio
+async def test_seed_keeps_stock_and_counters_consistent() -> None:
+    result = await seed(test_engine, authors=20, books=200, borrows=3000, batch_size=500, random_seed=1)
+    assert (result["authors"], result["books"], result["borrows"]) == (20, 200, 3000)
+
+    async with test_engine.connect() as conn:
+        assert await conn.scalar(text("SELECT count(*) FROM borrows")) == 3000
+        assert await conn.scalar(text("SELECT min(available) FROM books")) >= 0
+        counters = await conn.scalar(text("SELECT sum(total_borrows) FROM book_borrow_counters"))
+        active = await conn.scalar(text("SELECT sum(active_borrows) FROM reader_borrow_counters"))
+        opened = await conn.scalar(text("SELECT count(*) FROM borrows WHERE return_date IS NULL"))
+        top_share = await conn.scalar(
+            text("SELECT max(total_borrows)::float / sum(total_borrows) FROM book_borrow_counters")
+        )
+    assert counters == 3000
+    assert active == opened
+    assert top_share > 10 / 200
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert (percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.99)) == (50.0, 95.0, 99.0)
+    assert percentile([], 0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_load_harness_reports_percentiles(test_client) -> None:
+    await seed(test_engine, authors=5, books=20, borrows=100, random_seed=2)
+
+    report = await run_load(test_client, mix=MIXES["read_heavy"], duration=0.5, concurrency=4, random_seed=3)
+
+    assert report["total"]["requests"] > 0
+    assert report["total"]["errors"] == 0
+    for stats in report["endpoints"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, NamedTuple
+
+import httpx
+import orjson
+
+SEARCH_WORDS = ["мир", "война", "роман", "история", "love", "time", "world"]
+
+
+class Sample(NamedTuple):
+    endpoint: str
+    status: int
+    seconds: float
+
+
+class TrafficState:
+    """
+    Данные, из которых строятся запросы нагрузки: ID существующих записей и открытых выдач.
+
+    Attributes:
+        author_ids (List[int]): ID авторов.
+        book_ids (List[int]): ID книг.
+        reader_names (List[str]): Имена читателей.
+        open_borrow_ids (Deque[int]): ID выдач, созданных нагрузкой и еще не закрытых.
+    """
+
+    def __init__(self, author_ids: List[int], book_ids: List[int], reader_names: List[str]) -> None:
+        self.author_ids = author_ids or [0]
+        self.book_ids = book_ids or [0]
+        self.reader_names = reader_names or ["reader"]
+        self.open_borrow_ids: Deque[int] = deque()
+
+
+Scenario = Callable[[httpx.AsyncClient, TrafficState, random.Random], Awaitable[httpx.Response]]
+
+
+async def list_books(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get("/books/", params={"limit": 50})
+
+
+async def get_book(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get(f"/books/{rnd.choice(state.book_ids)}")
+
+
+async def search_books(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get("/books/search", params={"q": rnd.choice(SEARCH_WORDS)})
+
+
+async def get_author(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get(f"/authors/{rnd.choice(state.author_ids)}")
+
+
+async def list_reader_borrows(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get("/borrows/", params={"reader_name": rnd.choice(state.reader_names), "expand": "book"})
+
+
+async def top_books(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    return await client.get("/stats/books/top")
+
+
+async def create_borrow(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    borrow_in = {"book_id": rnd.choice(state.book_ids), "reader_name": rnd.choice(state.reader_names)}
+    response = await client.post("/borrows/", json=borrow_in)
+    if response.status_code == 201:
+        state.open_borrow_ids.append(response.json()["id"])
+    return response
+
+
+async def return_borrow(client: httpx.AsyncClient, state: TrafficState, rnd: random.Random) -> httpx.Response:
+    if not state.open_borrow_ids:
+        return await create_borrow(client, state, rnd)
+    return await client.patch(f"/borrows/{state.open_borrow_ids.popleft()}/return")
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_books": list_books,
+    "get_book": get_book,
+    "search_books": search_books,
+    "get_author": get_author,
+    "list_reader_borrows": list_reader_borrows,
+    "top_books": top_books,
+    "create_borrow": create_borrow,
+    "return_borrow": return_borrow,
+}
+
+MIXES: Dict[str, Dict[str, float]] = {
+    "read_heavy": {
+        "list_books": 20,
+        "get_book": 35,
+        "search_books": 10,
+        "get_author": 10,
+        "list_reader_borrows": 10,
+        "top_books": 5,
+        "create_borrow": 5,
+        "return_borrow": 5,
+    },
+    "write_heavy": {"get_book": 20, "list_reader_borrows": 10, "create_borrow": 35, "return_borrow": 35},
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(samples: List[Sample], seconds: float) -> dict:
+    """
+    Сводка по образцам: пропускная способность, доля ошибок и перцентили времени ответа, в миллисекундах.
+    """
+    by_endpoint: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_endpoint.setdefault(sample.endpoint, []).append(sample)
+
+    def describe(group: List[Sample]) -> dict:
+        latencies = sorted(sample.seconds * 1000 for sample in group)
+        statuses: Dict[str, int] = {}
+        for sample in group:
+            statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+        return {
+            "requests": len(group),
+            "throughput": round(len(group) / seconds, 2) if seconds else 0.0,
+            "errors": sum(1 for sample in group if sample.status >= 500),
+            "statuses": statuses,
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    return {
+        "total": describe(samples),
+        "endpoints": {endpoint: describe(group) for endpoint, group in sorted(by_endpoint.items())},
+    }
+
+
+async def load_state(client: httpx.AsyncClient) -> TrafficState:
+    """
+    Читает ID записей, по которым будет идти нагрузка, через API.
+    """
+    authors = (await client.get("/authors/", params={"limit": 500})).json()
+    books = (await client.get("/books/", params={"limit": 500})).json()
+    borrows = (await client.get("/borrows/", params={"limit": 500})).json()
+    return TrafficState(
+        author_ids=[author["id"] for author in authors["items"]],
+        book_ids=[book["id"] for book in books["items"]],
+        reader_names=sorted({borrow["reader_name"] for borrow in borrows["items"]}),
+    )
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    duration: float,
+    concurrency: int,
+    random_seed: int | None = None,
+) -> dict:
+    """
+    Отправляет запросы сценариев из mix с весами сценариев от concurrency конкурентных клиентов в течение duration
+    секунд и возвращает отчет о нагрузке.
+
+    Args:
+        client (httpx.AsyncClient): Клиент приложения.
+        mix (Dict[str, float]): Веса сценариев из SCENARIOS.
+        duration (float): Длительность нагрузки, в секундах.
+        concurrency (int): Количество конкурентных клиентов.
+        random_seed (int | None): Зерно генератора случайных чисел.
+
+    Returns:
+        dict: Отчет: параметры запуска, сводка по всем запросам и по каждому сценарию.
+    """
+    state = await load_state(client)
+    names, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker(number: int) -> None:
+        rnd = random.Random(None if random_seed is None else random_seed + number)
+        while time.perf_counter() < deadline:
+            name = rnd.choices(names, weights=weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](client, state, rnd)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 599
+            samples.append(Sample(name, status, time.perf_counter() - start))
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "started_at": started_at,
+        "duration": round(elapsed, 3),
+        "concurrency": concurrency,
+        "mix": mix,
+        **summarize(samples, elapsed),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон API с взвешенной смесью запросов.")
+    parser.add_argument("--base-url", help="Адрес запущенного приложения. По умолчанию app.main:main_app в процессе")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read_heavy")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Файл для отчета в JSON. По умолчанию stdout")
+    args = parser.parse_args()
+
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=30.0)
+        else:
+            from app.main import main_app
+
+            await stack.enter_async_context(main_app.router.lifespan_context(main_app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=main_app), base_url="http://load", timeout=30.0
+            )
+        await stack.enter_async_context(client)
+        report = await run_load(
+            client, mix=MIXES[args.mix], duration=args.duration, concurrency=args.concurrency, random_seed=args.seed
+        )
+
+    output = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+    if args.output:
+        with open(args.output, "wb") as file:
+            file.write(output)
+    else:
+        print(output.decode())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
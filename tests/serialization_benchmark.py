@@ -0,0 +1,108 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.api.serialization import PageEncoder
+from app.models.author_model import Author  # noqa: F401 - регистрирует модель для связи Book.author
+from app.models.book_model import Book
+from app.models.borrow_model import Borrow
+from app.schemas.book_schema import BookExpanded, BookFull
+from app.schemas.borrow_schema import BorrowExpanded, BorrowResponse
+from app.schemas.page_schema import Page
+
+ROW_COUNTS = [10, 100, 1000, 10000]
+
+
+def book_values(row_count: int) -> List[dict]:
+    return [
+        {
+            "id": number,
+            "title": f"Книга {number}",
+            "description": "Роман-эпопея" * 5,
+            "author_id": number % 100 + 1,
+            "available": number % 10,
+            "version": 1,
+        }
+        for number in range(1, row_count + 1)
+    ]
+
+
+def borrow_values(row_count: int) -> List[dict]:
+    now = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    return [
+        {
+            "id": number,
+            "book_id": number % 1000 + 1,
+            "reader_name": f"Читатель {number}",
+            "borrow_date": now,
+            "due_date": now + timedelta(days=14),
+            "return_date": now + timedelta(days=3) if number % 2 else None,
+            "overdue_at": None,
+            "version": 1,
+        }
+        for number in range(1, row_count + 1)
+    ]
+
+
+def timed(function: Callable[[], bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(name, model, values, schema, page_schema, exclude_none: bool, repeat: int) -> dict:
+    """
+    Сравнивает путь response_model (объекты ORM, валидация и сериализация Pydantic, orjson)
+    с PageEncoder (кортежи колонок, orjson) на одной странице.
+    """
+    adapter = TypeAdapter(Page[page_schema])
+    encoder = PageEncoder(schema, exclude_none=exclude_none)
+
+    def response_model_path() -> bytes:
+        page = {"items": [model(**row) for row in values], "next": None}
+        content = adapter.dump_python(
+            adapter.validate_python(page), mode="json", exclude_unset=True, exclude_none=exclude_none
+        )
+        return orjson.dumps(content)
+
+    def fast_path() -> bytes:
+        rows = [tuple(row[column] for column in encoder.columns) for row in values]
+        return encoder.encode({"items": rows, "next": None})
+
+    assert orjson.loads(response_model_path()) == orjson.loads(fast_path())
+    slow, fast = timed(response_model_path, repeat), timed(fast_path, repeat)
+    return {
+        "schema": name,
+        "rows": len(values),
+        "response_model_ms": round(slow * 1000, 3),
+        "fast_path_ms": round(fast * 1000, 3),
+        "speedup": round(slow / fast, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сравнение сериализации страниц через response_model и PageEncoder.")
+    parser.add_argument("--rows", type=int, nargs="+", default=ROW_COUNTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for row_count in args.rows:
+        results.append(benchmark("BookFull", Book, book_values(row_count), BookFull, BookExpanded, False, args.repeat))
+        results.append(
+            benchmark(
+                "BorrowResponse", Borrow, borrow_values(row_count), BorrowResponse, BorrowExpanded, True, args.repeat
+            )
+        )
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,14 @@ class BaseMokService:
         self._dependency = dependency
         self._dependency.some_method.return_value = test_data
 
-        async def method():
-            return await self._dependency.some_method()
+        async def method(*args, **kwargs):
+            return await self._dependency.some_method(*args, **kwargs)
 
         setattr(self, test_method_name, method)
 
 
 class AuthorService(BaseMokService):
-    pass
+    @staticmethod
+    def page_etag(page_db: Any) -> str:
+        return '"etag"'
+
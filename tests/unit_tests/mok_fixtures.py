@@ -21,9 +21,8 @@ async def override_services_dependencies(mock_dependency, test_app, request):
     service_class: Type[BaseMokService] = request.param["service_class"]
     dependency_function: Callable[..., Any] = request.param["dependency_function"]
     test_method_name: str = request.param["test_method_name"]
-    service_instance = service_class(
-        dependency=mock_dependency, test_method_name=test_method_name, test_data=test_data_full
-    )
+    test_data: Any = request.param.get("test_data", test_data_full)
+    service_instance = service_class(dependency=mock_dependency, test_method_name=test_method_name, test_data=test_data)
 
     def override_dependency(q: str | None = None):
         return service_instance